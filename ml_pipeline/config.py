@@ -21,6 +21,7 @@ class ModelConfig:
     """LSTM Seq2Seq model configuration"""
     
     # Architecture
+    ARCHITECTURE = "lstm"
     EMBED_DIM = 256
     HIDDEN_DIM = 512
     NUM_LAYERS = 2
@@ -31,13 +32,25 @@ class ModelConfig:
     LEARNING_RATE = 0.001
     NUM_EPOCHS = 50
     GRAD_CLIP = 5.0
+    TEACHER_FORCING_RATIO = 0.5
+    SCHEDULED_SAMPLING_CHUNK = 0  # Target positions per teacher-forcing decision (0 = whole sequence)
+    GRAD_ACCUM_STEPS = 1  # Batches per optimizer step
+    MIXED_PRECISION = None  # "bf16" for autocast (falls back to fp32 if unsupported)
+    COMPILE_MODEL = False  # torch.compile the model (falls back to eager mode)
+    ASYNC_CHECKPOINTS = True  # Serialize checkpoints on a background thread
+    LOG_STEP_TIMINGS = True  # Per-step timing JSON lines log next to the checkpoint
     
     # Data
     MAX_LENGTH = 100
     MIN_FREQ = 2
+    BUCKET_BATCHES = True  # Length-bucketed batches padded to the batch's longest pair
+    USE_TOKEN_CACHE = True  # Pre-tokenized, memory-mapped datasets (see datasets/token_cache.py)
+    TOKEN_CACHE_DIR = str(DATA_DIR / "token_cache")
+    STREAM_SHUFFLE_BUFFER = 10000  # Pairs held for shuffling when streaming JSONL shards
     
     # Paths
     MODEL_SAVE_PATH = str(MODELS_DIR / "lstm_translator.pth")
+    INFERENCE_MODEL_PATH = str(MODELS_DIR / "lstm_translator.inference.pt")
     VOCAB_SAVE_PATH = str(MODELS_DIR / "vocab.json")
     TRAIN_DATA_PATH = str(DATA_DIR / "train_pairs.json")
     VAL_DATA_PATH = str(DATA_DIR / "val_pairs.json")
@@ -49,6 +62,46 @@ class ModelConfig:
     # Device
     DEVICE = "cuda" if os.getenv("CUDA_VISIBLE_DEVICES") else "cpu"
 
+class StudentConfig(ModelConfig):
+    """Distilled single-layer GRU student configuration"""
+    
+    # Architecture
+    ARCHITECTURE = "gru"
+    EMBED_DIM = 64
+    HIDDEN_DIM = 128
+    NUM_LAYERS = 1
+    DROPOUT = 0.1
+    
+    # Training
+    LEARNING_RATE = 0.003
+    NUM_EPOCHS = 30
+    
+    # Distillation
+    DISTILL_TEMPERATURE = 2.0
+    DISTILL_ALPHA = 0.5  # Weight of the soft-target (teacher) loss vs. hard-target loss
+    
+    # Paths
+    MODEL_SAVE_PATH = str(MODELS_DIR / "gru_student.pth")
+    INFERENCE_MODEL_PATH = str(MODELS_DIR / "gru_student.inference.pt")
+
+class FineTuneConfig(ModelConfig):
+    """Incremental fine-tuning of the deployed translator on newly collected data"""
+
+    # Training (warm start, so few epochs at a lower learning rate)
+    LEARNING_RATE = 0.0003
+    NUM_EPOCHS = 3
+    MIN_FREQ = 1  # New words are added to the vocabularies the first time they appear
+
+    # Data
+    MIN_NEW_EXAMPLES = 1  # Skip the run when fewer new pairs/corrections were collected
+    REPLAY_RATIO = 4.0  # Old training pairs replayed per new example
+    MIN_REPLAY = 256
+    MAX_REPLAY = 5000
+    MAX_VAL_REGRESSION = 0.05  # Reject the version if validation loss rises by more than this fraction
+
+    # Paths
+    VERSIONS_DIR = str(MODELS_DIR / "versions")
+
 # Training configuration
 TRAINING_CONFIG = {
     "early_stopping_patience": 5,
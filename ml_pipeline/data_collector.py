@@ -5,28 +5,203 @@ Collects user audio/text pairs, feedback, and annotations for training
 
 import sqlite3
 import os
+import atexit
 import json
+import hashlib
+import unicodedata
 import logging
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from ml_pipeline.datasets.jsonl_shards import JsonlShardWriter, SHARD_MANIFEST, SPLITS, split_for
+from ml_pipeline.utils.blob_store import AudioBlobStore
+from ml_pipeline.utils.db import get_connection_manager
+from ml_pipeline.utils.write_behind import WriteBehindQueue
+
 logger = logging.getLogger(__name__)
 
 
+def normalize_text(text: str) -> str:
+    """Unicode-normalized, case-folded text with whitespace runs collapsed"""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def content_hash(english_text: str, isl_text: str) -> str:
+    """Identity of a translation pair: SHA-1 of its normalized English and ISL text"""
+    key = f"{normalize_text(english_text)}\x1f{normalize_text(isl_text)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _deduplicate_translation_pairs(cursor) -> str:
+    """
+    Add content_hash, merge pairs with equal hashes into the oldest one and
+    make the hash unique
+
+    The kept pair becomes verified if any duplicate was, takes a gloss or
+    SiGML file it lacks from the duplicates, and inherits their feedback
+    and annotations.
+    """
+    cursor.execute('ALTER TABLE translation_pairs ADD COLUMN content_hash TEXT')
+    cursor.connection.create_function('pair_content_hash', 2, content_hash, deterministic=True)
+    cursor.execute('UPDATE translation_pairs SET content_hash = pair_content_hash(english_text, isl_text)')
+
+    cursor.execute('''
+        CREATE TEMP TABLE pair_merge AS
+        SELECT d.id AS dup_id, k.keep_id
+        FROM translation_pairs d
+        JOIN (SELECT content_hash, MIN(id) AS keep_id FROM translation_pairs
+              GROUP BY content_hash HAVING COUNT(*) > 1) k
+          ON d.content_hash = k.content_hash
+        WHERE d.id != k.keep_id
+    ''')
+    cursor.execute('CREATE UNIQUE INDEX temp.idx_pair_merge_dup ON pair_merge (dup_id)')
+    merged = cursor.execute('SELECT COUNT(*) FROM pair_merge').fetchone()[0]
+
+    if merged:
+        # First non-null gloss / SiGML file in id order, and any verified flag, per kept pair
+        merges: Dict[int, Tuple[int, Optional[str], Optional[str]]] = {}
+        for keep_id, verified, isl_gloss, sigml_file in cursor.execute('''
+            SELECT m.keep_id, d.verified, d.isl_gloss, d.sigml_file
+            FROM pair_merge m JOIN translation_pairs d ON d.id = m.dup_id
+            ORDER BY m.dup_id
+        ''').fetchall():
+            merged_verified, merged_gloss, merged_sigml = merges.get(keep_id, (0, None, None))
+            merges[keep_id] = (max(merged_verified, verified or 0), merged_gloss or isl_gloss,
+                               merged_sigml or sigml_file)
+        cursor.executemany('''
+            UPDATE translation_pairs SET
+                verified = MAX(verified, ?),
+                isl_gloss = COALESCE(isl_gloss, ?),
+                sigml_file = COALESCE(sigml_file, ?)
+            WHERE id = ?
+        ''', [(verified, isl_gloss, sigml_file, keep_id)
+              for keep_id, (verified, isl_gloss, sigml_file) in merges.items()])
+        for table in ('user_feedback', 'annotations'):
+            cursor.execute(f'''
+                UPDATE {table}
+                SET translation_pair_id = (SELECT keep_id FROM pair_merge WHERE dup_id = translation_pair_id)
+                WHERE translation_pair_id IN (SELECT dup_id FROM pair_merge)
+            ''')
+        cursor.execute('DELETE FROM translation_pairs WHERE id IN (SELECT dup_id FROM pair_merge)')
+
+    cursor.execute('DROP TABLE temp.pair_merge')
+    cursor.execute('CREATE UNIQUE INDEX idx_translation_pairs_content_hash ON translation_pairs (content_hash)')
+    return f"merged {merged} duplicate translation pairs"
+
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+# An entry is a list of SQL statements or a function of the cursor that may
+# return a summary to log. Append new entries; never edit one that has shipped.
+MIGRATIONS = [
+    # 1: indexes for filtered, keyset-paginated browsing and feedback joins
+    [
+        'CREATE INDEX IF NOT EXISTS idx_translation_pairs_verified ON translation_pairs (verified, id)',
+        'CREATE INDEX IF NOT EXISTS idx_translation_pairs_source ON translation_pairs (source, id)',
+        'CREATE INDEX IF NOT EXISTS idx_translation_pairs_created_at ON translation_pairs (created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_user_feedback_pair ON user_feedback (translation_pair_id)',
+        'CREATE INDEX IF NOT EXISTS idx_annotations_pair ON annotations (translation_pair_id)'
+    ],
+    # 2: normalized content hash with a unique index; existing duplicates are merged
+    _deduplicate_translation_pairs,
+    # 3: audio samples reference their audio in the content-addressed blob store
+    [
+        'ALTER TABLE audio_samples ADD COLUMN audio_hash TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_audio_samples_hash ON audio_samples (audio_hash)'
+    ],
+    # 4: IDs handed out for queued pairs that merged into an existing pair on
+    # write; feedback and annotations referencing them are repointed
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS translation_pair_aliases (
+            alias_id INTEGER PRIMARY KEY,
+            target_id INTEGER NOT NULL
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS translation_pair_aliases_repoint
+        AFTER INSERT ON translation_pair_aliases
+        BEGIN
+            UPDATE user_feedback SET translation_pair_id = NEW.target_id WHERE translation_pair_id = NEW.alias_id;
+            UPDATE annotations SET translation_pair_id = NEW.target_id WHERE translation_pair_id = NEW.alias_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS user_feedback_resolve_alias
+        AFTER INSERT ON user_feedback
+        WHEN EXISTS (SELECT 1 FROM translation_pair_aliases WHERE alias_id = NEW.translation_pair_id)
+        BEGIN
+            UPDATE user_feedback SET translation_pair_id =
+                (SELECT target_id FROM translation_pair_aliases WHERE alias_id = NEW.translation_pair_id)
+            WHERE id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS annotations_resolve_alias
+        AFTER INSERT ON annotations
+        WHEN EXISTS (SELECT 1 FROM translation_pair_aliases WHERE alias_id = NEW.translation_pair_id)
+        BEGIN
+            UPDATE annotations SET translation_pair_id =
+                (SELECT target_id FROM translation_pair_aliases WHERE alias_id = NEW.translation_pair_id)
+            WHERE id = NEW.id;
+        END
+        '''
+    ]
+]
+
+# Queued content hashes remembered before the queue is flushed and they are looked up instead
+QUEUED_PAIRS_LIMIT = 10000
+
+# Merge applied when a pair with an existing content hash is added again
+PAIR_UPSERT = '''
+    ON CONFLICT (content_hash) DO UPDATE SET
+        verified = MAX(verified, excluded.verified),
+        isl_gloss = COALESCE(isl_gloss, excluded.isl_gloss),
+        sigml_file = COALESCE(sigml_file, excluded.sigml_file)
+    RETURNING id
+'''
+
+# Page size bounds for query_translation_pairs
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
 class DataCollector:
     """Collect and manage training data"""
     
-    def __init__(self, db_path: str = "data/training_data.db"):
+    def __init__(self, db_path: str = "data/training_data.db", write_behind: bool = False,
+                 batch_size: int = 100, flush_interval_ms: float = 50.0,
+                 audio_dir: Optional[str] = None):
         """
         Initialize data collector
         
         Args:
             db_path: Path to SQLite database file
+            write_behind: Queue translation pairs and feedback and write them
+                          in batches on a background thread
+            batch_size: Records per write-behind transaction
+            flush_interval_ms: Longest time a queued record waits to be written
+            audio_dir: Audio blob store directory (default: audio_blobs next to the database)
         """
         self.db_path = db_path
+        self.audio_dir = audio_dir or os.path.join(os.path.dirname(db_path), "audio_blobs")
+        self._audio_store: Optional[AudioBlobStore] = None
         self._ensure_db_directory()
-        self._init_database()
+        self.db = get_connection_manager(db_path)
+        
+        # Schema checks run once per database per process, not per collector
+        with self.db.schema_lock:
+            if not self.db.schema_ready:
+                self._init_database()
+                self._migrate()
+                self.db.schema_ready = True
+        
+        self.writer = WriteBehindQueue(self.db, batch_size, flush_interval_ms) if write_behind else None
+        # Content hash -> ID of pairs queued by this collector, so queued duplicates are caught too
+        self._queued_pairs: Dict[str, int] = {}
+        self._pair_lock = threading.Lock()
     
     def _ensure_db_directory(self):
         """Ensure database directory exists"""
@@ -36,97 +211,173 @@ class DataCollector:
     
     def _init_database(self):
         """Initialize SQLite database schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Audio samples table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS audio_samples (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                audio_file_path TEXT NOT NULL,
-                transcript TEXT NOT NULL,
-                language TEXT DEFAULT 'en',
-                duration REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                user_id TEXT,
-                metadata TEXT
-            )
-        ''')
-        
-        # Translation pairs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS translation_pairs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                english_text TEXT NOT NULL,
-                isl_text TEXT NOT NULL,
-                isl_gloss TEXT,
-                sigml_file TEXT,
-                source TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                verified BOOLEAN DEFAULT 0,
-                metadata TEXT
-            )
-        ''')
-        
-        # User feedback table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                translation_pair_id INTEGER,
-                feedback_type TEXT,
-                is_correct BOOLEAN,
-                corrected_text TEXT,
-                comments TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (translation_pair_id) REFERENCES translation_pairs(id)
-            )
-        ''')
-        
-        # Annotations table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS annotations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                audio_sample_id INTEGER,
-                translation_pair_id INTEGER,
-                annotation_type TEXT,
-                annotation_data TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (audio_sample_id) REFERENCES audio_samples(id),
-                FOREIGN KEY (translation_pair_id) REFERENCES translation_pairs(id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as cursor:
+            # Audio samples table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS audio_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    audio_file_path TEXT NOT NULL,
+                    transcript TEXT NOT NULL,
+                    language TEXT DEFAULT 'en',
+                    duration REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    user_id TEXT,
+                    metadata TEXT
+                )
+            ''')
+            
+            # Translation pairs table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_pairs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    english_text TEXT NOT NULL,
+                    isl_text TEXT NOT NULL,
+                    isl_gloss TEXT,
+                    sigml_file TEXT,
+                    source TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    verified BOOLEAN DEFAULT 0,
+                    metadata TEXT
+                )
+            ''')
+            
+            # User feedback table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    translation_pair_id INTEGER,
+                    feedback_type TEXT,
+                    is_correct BOOLEAN,
+                    corrected_text TEXT,
+                    comments TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (translation_pair_id) REFERENCES translation_pairs(id)
+                )
+            ''')
+            
+            # Annotations table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS annotations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    audio_sample_id INTEGER,
+                    translation_pair_id INTEGER,
+                    annotation_type TEXT,
+                    annotation_data TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (audio_sample_id) REFERENCES audio_samples(id),
+                    FOREIGN KEY (translation_pair_id) REFERENCES translation_pairs(id)
+                )
+            ''')
         logger.info(f"Database initialized at {self.db_path}")
     
+    def _migrate(self):
+        """Apply schema migrations newer than the database's user_version"""
+        conn = self.db.connection()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            summary = None
+            with self.db.transaction() as cursor:
+                if callable(migration):
+                    summary = migration(cursor)
+                else:
+                    for statement in migration:
+                        cursor.execute(statement)
+                # PRAGMA cannot take parameters; number is an int from this module
+                cursor.execute(f'PRAGMA user_version = {number}')
+            logger.info(f"Applied schema migration {number} to {self.db_path}"
+                        + (f": {summary}" if summary else ""))
+    
+    @staticmethod
+    def _timestamp() -> str:
+        """Current UTC time in the format of SQLite's CURRENT_TIMESTAMP"""
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+    
+    def flush(self):
+        """Wait until queued write-behind records are in the database"""
+        if self.writer is not None:
+            self.writer.flush()
+    
+    def close(self):
+        """Write queued records and stop the write-behind thread"""
+        if self.writer is not None:
+            self.writer.close()
+    
+    @property
+    def audio_store(self) -> AudioBlobStore:
+        """Content-addressed store holding collected audio (created on first use)"""
+        if self._audio_store is None:
+            self._audio_store = AudioBlobStore(self.audio_dir)
+        return self._audio_store
+    
     def add_audio_sample(self, audio_file_path: str, transcript: str, 
                         language: str = "en", duration: Optional[float] = None,
-                        user_id: Optional[str] = None, metadata: Optional[Dict] = None) -> int:
+                        user_id: Optional[str] = None, metadata: Optional[Dict] = None,
+                        audio_data: Optional[bytes] = None, store_audio: bool = True) -> int:
         """
         Add audio sample to database
         
+        The audio is copied into the blob store (once per distinct content),
+        so the sample stays usable after the original file is deleted.
+        
+        Args:
+            audio_file_path: Original audio file (or just its name when audio_data is given)
+            transcript: Transcript of the audio
+            audio_data: Audio bytes to store instead of reading audio_file_path
+            store_audio: Copy the audio into the blob store
+        
         Returns:
             Sample ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         metadata_json = json.dumps(metadata) if metadata else None
         
-        cursor.execute('''
-            INSERT INTO audio_samples 
-            (audio_file_path, transcript, language, duration, user_id, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (audio_file_path, transcript, language, duration, user_id, metadata_json))
+        audio_hash = None
+        if store_audio and audio_data is not None:
+            audio_hash = self.audio_store.put_bytes(audio_data, os.path.splitext(audio_file_path)[1])['hash']
+        elif store_audio and os.path.isfile(audio_file_path):
+            audio_hash = self.audio_store.put_file(audio_file_path)['hash']
         
-        sample_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO audio_samples 
+                (audio_file_path, transcript, language, duration, user_id, metadata, audio_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (audio_file_path, transcript, language, duration, user_id, metadata_json, audio_hash))
+            
+            sample_id = cursor.lastrowid
         
         logger.info(f"Added audio sample {sample_id}: {audio_file_path}")
         return sample_id
     
+    def open_audio(self, sample_id: int):
+        """
+        Open a sample's stored audio for reading (original bytes)
+        
+        Raises:
+            KeyError: Unknown sample, or its audio was not stored
+        """
+        with self.db.transaction() as cursor:
+            cursor.execute('SELECT audio_hash FROM audio_samples WHERE id = ?', (sample_id,))
+            row = cursor.fetchone()
+        if row is None or row[0] is None:
+            raise KeyError(sample_id)
+        return self.audio_store.open(row[0])
+    
+    def gc_audio_blobs(self, min_age_seconds: float = 3600.0, dry_run: bool = False) -> Dict:
+        """
+        Delete stored audio no longer referenced by any audio sample
+        
+        Args:
+            min_age_seconds: Keep blobs written or re-added more recently than this
+            dry_run: Only report what would be deleted
+        
+        Returns:
+            AudioBlobStore.gc() statistics
+        """
+        with self.db.transaction() as cursor:
+            cursor.execute('SELECT DISTINCT audio_hash FROM audio_samples WHERE audio_hash IS NOT NULL')
+            referenced = {row[0] for row in cursor.fetchall()}
+        return self.audio_store.gc(referenced, min_age_seconds=min_age_seconds, dry_run=dry_run)
+    
     def add_translation_pair(self, english_text: str, isl_text: str,
                            isl_gloss: Optional[str] = None,
                            sigml_file: Optional[str] = None,
@@ -136,28 +387,98 @@ class DataCollector:
         """
         Add English-ISL translation pair
         
+        A pair whose normalized text matches an existing pair is merged into
+        it instead: the existing pair becomes verified if this one is, and
+        takes a gloss or SiGML file it lacks.
+        
         Returns:
-            Pair ID
+            Pair ID (of the existing pair for a duplicate)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         metadata_json = json.dumps(metadata) if metadata else None
+        pair_hash = content_hash(english_text, isl_text)
         
-        cursor.execute('''
-            INSERT INTO translation_pairs
-            (english_text, isl_text, isl_gloss, sigml_file, source, verified, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (english_text, isl_text, isl_gloss, sigml_file, source, 
-              int(verified), metadata_json))
+        if self.writer is not None:
+            with self._pair_lock:
+                pair_id = self._queued_pairs.get(pair_hash) or self._find_pair(pair_hash)
+                if pair_id is None:
+                    pair_id = self.writer.submit(
+                        'translation_pairs',
+                        ('english_text', 'isl_text', 'isl_gloss', 'sigml_file', 'source', 'verified',
+                         'metadata', 'created_at', 'content_hash'),
+                        (english_text, isl_text, isl_gloss, sigml_file, source, int(verified),
+                         metadata_json, self._timestamp(), pair_hash),
+                        # Another collector or a bulk import may store the same pair
+                        # first; the queued ID then becomes an alias of that pair
+                        upsert=PAIR_UPSERT, alias_table='translation_pair_aliases'
+                    )
+                    self._queued_pairs[pair_hash] = pair_id
+                    if len(self._queued_pairs) >= QUEUED_PAIRS_LIMIT:
+                        # Everything queued so far becomes visible to _find_pair
+                        self.writer.flush()
+                        self._queued_pairs.clear()
+                    logger.debug(f"Queued translation pair {pair_id}")
+                    return pair_id
+            if not (verified or isl_gloss or sigml_file):
+                return pair_id
+            # A duplicate that carries something to merge is written directly
+            self.flush()
         
-        pair_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO translation_pairs
+                (english_text, isl_text, isl_gloss, sigml_file, source, verified, metadata, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''' + PAIR_UPSERT, (english_text, isl_text, isl_gloss, sigml_file, source, 
+                                 int(verified), metadata_json, pair_hash))
+            
+            pair_id = cursor.fetchone()[0]
         
         logger.info(f"Added translation pair {pair_id}: {english_text[:50]}...")
         return pair_id
     
+    def _find_pair(self, pair_hash: str) -> Optional[int]:
+        """ID of the stored pair with this content hash, if any"""
+        with self.db.transaction() as cursor:
+            cursor.execute('SELECT id FROM translation_pairs WHERE content_hash = ?', (pair_hash,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def add_translation_pairs(self, pairs: List[Dict], source: str = "manual",
+                            verified: bool = False) -> List[int]:
+        """
+        Add a batch of translation pairs in one transaction
+        
+        Batches bypass the write-behind queue; queued records are flushed
+        first so IDs are still committed in order.
+        
+        Args:
+            pairs: Dicts with english_text, isl_text and optionally
+                isl_gloss, sigml_file and metadata
+            source: Source recorded for every pair
+            verified: Verified flag recorded for every pair
+        
+        Returns:
+            Pair IDs, in the order of pairs (duplicates get the existing pair's ID,
+            merged as in add_translation_pair)
+        """
+        self.flush()
+        pair_ids = []
+        with self.db.transaction() as cursor:
+            for pair in pairs:
+                metadata = pair.get('metadata')
+                cursor.execute('''
+                    INSERT INTO translation_pairs
+                    (english_text, isl_text, isl_gloss, sigml_file, source, verified, metadata, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''' + PAIR_UPSERT, (pair['english_text'], pair['isl_text'], pair.get('isl_gloss'),
+                                     pair.get('sigml_file'), source, int(verified),
+                                     json.dumps(metadata) if metadata else None,
+                                     content_hash(pair['english_text'], pair['isl_text'])))
+                pair_ids.append(cursor.fetchone()[0])
+        
+        logger.debug(f"Added {len(pair_ids)} translation pairs from {source}")
+        return pair_ids
+    
     def add_feedback(self, translation_pair_id: int, feedback_type: str,
                     is_correct: bool, corrected_text: Optional[str] = None,
                     comments: Optional[str] = None) -> int:
@@ -167,19 +488,26 @@ class DataCollector:
         Returns:
             Feedback ID
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO user_feedback
-            (translation_pair_id, feedback_type, is_correct, corrected_text, comments)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (translation_pair_id, feedback_type, int(is_correct), 
-              corrected_text, comments))
+        if self.writer is not None:
+            feedback_id = self.writer.submit(
+                'user_feedback',
+                ('translation_pair_id', 'feedback_type', 'is_correct', 'corrected_text',
+                 'comments', 'created_at'),
+                (translation_pair_id, feedback_type, int(is_correct), corrected_text,
+                 comments, self._timestamp())
+            )
+            logger.debug(f"Queued feedback {feedback_id} for pair {translation_pair_id}")
+            return feedback_id
         
-        feedback_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO user_feedback
+                (translation_pair_id, feedback_type, is_correct, corrected_text, comments)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (translation_pair_id, feedback_type, int(is_correct), 
+                  corrected_text, comments))
+            
+            feedback_id = cursor.lastrowid
         
         logger.info(f"Added feedback {feedback_id} for pair {translation_pair_id}")
         return feedback_id
@@ -192,28 +520,282 @@ class DataCollector:
         Returns:
             List of (id, english_text, isl_text, isl_gloss, sigml_file) tuples
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.flush()
+        
+        with self.db.transaction() as cursor:
+            query = '''
+                SELECT id, english_text, isl_text, isl_gloss, sigml_file
+                FROM translation_pairs
+            '''
+            
+            if verified_only:
+                query += ' WHERE verified = 1'
+            
+            query += ' ORDER BY created_at DESC'
+            
+            params = ()
+            if limit:
+                query += ' LIMIT ?'
+                params = (int(limit),)
+            
+            cursor.execute(query, params)
+            results = cursor.fetchall()
+        
+        return results
+    
+    def query_translation_pairs(self, limit: int = DEFAULT_PAGE_SIZE,
+                                cursor_id: Optional[int] = None,
+                                source: Optional[str] = None,
+                                verified: Optional[bool] = None,
+                                created_after: Optional[str] = None,
+                                created_before: Optional[str] = None) -> Dict:
+        """
+        Get one page of translation pairs, newest first
+        
+        Pages are keyset-paginated on id: each page continues below the
+        last id of the previous one, so fetching page 1000 costs the same
+        index seek as page 1 (OFFSET would scan every skipped row).
+        
+        Args:
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            cursor_id: next_cursor from the previous page; None for the first page
+            source: Only pairs from this source (e.g. 'manual_annotation')
+            verified: Only verified (True) or unverified (False) pairs
+            created_after: Only pairs created at or after this time ('YYYY-MM-DD[ HH:MM:SS]', UTC)
+            created_before: Only pairs created before this time
+        
+        Returns:
+            Dictionary with 'items' (list of pair dicts) and 'next_cursor'
+            (None on the last page)
+        """
+        self.flush()
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        
+        conditions = []
+        params: List = []
+        if cursor_id is not None:
+            conditions.append('id < ?')
+            params.append(int(cursor_id))
+        if source is not None:
+            conditions.append('source = ?')
+            params.append(source)
+        if verified is not None:
+            conditions.append('verified = ?')
+            params.append(int(verified))
+        # Date bounds become id bounds found with one created_at index seek
+        # each (rows are created in id order), so the page is still read in
+        # id order; the unary + keeps SQLite from sorting the whole date
+        # range on the created_at index instead
+        if created_after is not None:
+            conditions.append('''id >= (SELECT id FROM translation_pairs WHERE created_at >= ?
+                                  ORDER BY created_at, id LIMIT 1)''')
+            conditions.append('+created_at >= ?')
+            params.extend([created_after, created_after])
+        if created_before is not None:
+            conditions.append('''id <= (SELECT id FROM translation_pairs WHERE created_at < ?
+                                  ORDER BY created_at DESC, id DESC LIMIT 1)''')
+            conditions.append('+created_at < ?')
+            params.extend([created_before, created_before])
         
         query = '''
-            SELECT id, english_text, isl_text, isl_gloss, sigml_file
+            SELECT id, english_text, isl_text, isl_gloss, sigml_file, source, verified, created_at
             FROM translation_pairs
         '''
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit + 1)
         
-        if verified_only:
-            query += ' WHERE verified = 1'
+        with self.db.transaction() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        
+        items = [{
+            'id': pair_id,
+            'english_text': english_text,
+            'isl_text': isl_text,
+            'isl_gloss': isl_gloss,
+            'sigml_file': sigml_file,
+            'source': pair_source,
+            'verified': bool(is_verified),
+            'created_at': created_at
+        } for pair_id, english_text, isl_text, isl_gloss, sigml_file, pair_source, is_verified, created_at
+            in rows[:limit]]
+        
+        return {
+            'items': items,
+            'next_cursor': items[-1]['id'] if len(rows) > limit else None
+        }
+    
+    def get_pairs_since(self, last_pair_id: int = 0,
+                        verified_only: bool = False) -> List[Tuple]:
+        """
+        Get translation pairs added after a given pair ID
+        
+        Returns:
+            List of (id, english_text, isl_text) tuples, oldest first
+        """
+        self.flush()
+        
+        with self.db.transaction() as cursor:
+            query = '''
+                SELECT id, english_text, isl_text
+                FROM translation_pairs
+                WHERE id > ?
+            '''
+            
+            if verified_only:
+                query += ' AND verified = 1'
+            
+            query += ' ORDER BY id'
+            
+            cursor.execute(query, (last_pair_id,))
+            results = cursor.fetchall()
+        
+        return results
+    
+    def get_feedback_pairs_since(self, last_feedback_id: int = 0) -> List[Tuple]:
+        """
+        Get training pairs implied by feedback added after a given feedback ID
         
-        query += ' ORDER BY created_at DESC'
+        Feedback confirming a translation yields the stored pair; feedback
+        rejecting it with a correction yields the English text paired with
+        the corrected ISL. Rejections without a correction are skipped.
         
-        if limit:
-            query += f' LIMIT {limit}'
+        Returns:
+            List of (feedback_id, english_text, isl_text) tuples, oldest first
+        """
+        self.flush()
         
-        cursor.execute(query)
-        results = cursor.fetchall()
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                SELECT f.id, p.english_text,
+                       CASE WHEN f.is_correct = 1 THEN p.isl_text ELSE f.corrected_text END
+                FROM user_feedback f
+                JOIN translation_pairs p ON p.id = f.translation_pair_id
+                WHERE f.id > ?
+                  AND (f.is_correct = 1
+                       OR (f.corrected_text IS NOT NULL AND f.corrected_text != ''))
+                ORDER BY f.id
+            ''', (last_feedback_id,))
+            results = cursor.fetchall()
         
         return results
     
+    def iter_translation_pairs(self, verified_only: bool = False,
+                               chunk_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Iterate over all translation pairs in id order, chunk_size rows at a time
+        
+        Each chunk is a separate keyset query, so no read transaction stays
+        open while the caller processes rows and memory holds one chunk.
+        
+        Yields:
+            (id, english_text, isl_text, isl_gloss, sigml_file) tuples
+        """
+        self.flush()
+        
+        query = '''
+            SELECT id, english_text, isl_text, isl_gloss, sigml_file
+            FROM translation_pairs
+            WHERE id > ?
+        '''
+        if verified_only:
+            query += ' AND verified = 1'
+        query += ' ORDER BY id LIMIT ?'
+        
+        last_id = 0
+        while True:
+            with self.db.transaction() as cursor:
+                cursor.execute(query, (last_id, chunk_size))
+                rows = cursor.fetchall()
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+    
+    @staticmethod
+    def _pair_record(row: Tuple) -> Dict:
+        """Export record for an (id, english, isl, gloss, sigml) row"""
+        pair_id, eng, isl, gloss, sigml = row
+        return {
+            'id': pair_id,
+            'english': eng,
+            'isl': isl,
+            'isl_gloss': gloss,
+            'sigml_file': sigml
+        }
+    
+    def export_to_jsonl(self, output_path: str, verified_only: bool = True,
+                        chunk_size: int = 1000) -> int:
+        """
+        Stream translation pairs to a JSON lines file
+        
+        Returns:
+            Number of pairs written
+        """
+        count = 0
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for row in self.iter_translation_pairs(verified_only, chunk_size):
+                f.write(json.dumps(self._pair_record(row), ensure_ascii=False) + '\n')
+                count += 1
+        
+        logger.info(f"Exported {count} pairs to {output_path}")
+        return count
+    
+    def export_shards(self, output_dir: str, shard_size: int = 10000,
+                      val_fraction: float = 0.1, verified_only: bool = True,
+                      chunk_size: int = 1000) -> Dict:
+        """
+        Stream translation pairs into train/val JSONL shards
+        
+        Each pair goes to train or val by a hash of its English text (see
+        split_for), so the split is stable across exports. Writes
+        train-NNNNN.jsonl / val-NNNNN.jsonl shards of at most shard_size
+        pairs and a manifest.json listing them with their counts.
+        
+        Args:
+            output_dir: Directory for shards (stale shards in it are removed)
+            shard_size: Pairs per shard file
+            val_fraction: Share of distinct English sentences sent to val
+            verified_only: Only export verified pairs
+            chunk_size: Rows fetched per query
+        
+        Returns:
+            Manifest dictionary
+        """
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        for split in SPLITS:
+            for stale in out.glob(f"{split}-*.jsonl"):
+                stale.unlink()
+        
+        writers = {split: JsonlShardWriter(output_dir, split, shard_size) for split in SPLITS}
+        last_id = 0
+        for row in self.iter_translation_pairs(verified_only, chunk_size):
+            writers[split_for(row[1], val_fraction)].write(self._pair_record(row))
+            last_id = row[0]
+        
+        splits = {}
+        for split, writer in writers.items():
+            shards = writer.close()
+            splits[split] = {'count': sum(shard['count'] for shard in shards), 'shards': shards}
+        
+        manifest = {
+            'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            'verified_only': verified_only,
+            'val_fraction': val_fraction,
+            'shard_size': shard_size,
+            'last_pair_id': last_id,
+            'splits': splits
+        }
+        with open(out / SHARD_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        logger.info(f"Exported {splits['train']['count']} train / {splits['val']['count']} val pairs "
+                    f"to {output_dir}")
+        return manifest
+    
     def export_to_json(self, output_path: str, verified_only: bool = True):
         """Export translation pairs to JSON file"""
         pairs = self.get_translation_pairs(verified_only=verified_only)
@@ -233,3 +815,25 @@ class DataCollector:
         
         logger.info(f"Exported {len(data)} pairs to {output_path}")
 
+
+
+# Global instance
+_data_collector = None
+_data_collector_lock = threading.Lock()
+
+def get_data_collector() -> DataCollector:
+    """
+    Get or create the process-wide data collector (default database)
+    
+    Set DATA_WRITE_BEHIND=1 to queue annotation and feedback writes; queued
+    records are written at interpreter exit.
+    """
+    global _data_collector
+    if _data_collector is None:
+        with _data_collector_lock:
+            if _data_collector is None:
+                write_behind = os.getenv("DATA_WRITE_BEHIND", "0") == "1"
+                _data_collector = DataCollector(write_behind=write_behind)
+                if write_behind:
+                    atexit.register(_data_collector.close)
+    return _data_collector
@@ -0,0 +1,149 @@
+"""
+Length-bucketed batching
+Groups similar-length pairs into batches and pads each batch only to its longest sequence
+"""
+
+import random
+from typing import Iterator, List, Sequence, Tuple
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+from torch.utils.data import DataLoader, IterableDataset, Sampler
+from torch.utils.data.distributed import DistributedSampler
+
+
+class BucketBatchSampler(Sampler):
+    """
+    Batch sampler that sorts pairs by length within large shuffled pools
+
+    Indices are shuffled, split into pools of batch_size * bucket_size_multiplier,
+    each pool is sorted by length and cut into batches, and the batch order is
+    shuffled. Batches therefore contain similar lengths while epochs still see
+    a different ordering.
+
+    For data-parallel training every rank builds the same batch list from the
+    shared seed and takes every num_replicas-th batch. The list is padded by
+    repeating batches from its start, so all ranks run the same number of steps.
+    """
+    
+    def __init__(self, lengths: Sequence[int], batch_size: int, shuffle: bool = True,
+                 bucket_size_multiplier: int = 100, drop_last: bool = False, seed: int = 0,
+                 num_replicas: int = 1, rank: int = 0):
+        """
+        Args:
+            lengths: Sequence length for each dataset index
+            batch_size: Number of pairs per batch
+            shuffle: Shuffle pools and batch order every epoch
+            bucket_size_multiplier: Pool size in batches
+            drop_last: Drop the last incomplete batch of each pool
+            seed: Base random seed (combined with the epoch)
+            num_replicas: Number of data-parallel processes
+            rank: This process's rank
+        """
+        self.lengths = list(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.pool_size = batch_size * bucket_size_multiplier
+        self.drop_last = drop_last
+        self.seed = seed
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.epoch = 0
+    
+    def set_epoch(self, epoch: int):
+        """Set epoch so every epoch gets a different but reproducible order"""
+        self.epoch = epoch
+    
+    def _batches(self) -> List[List[int]]:
+        rng = random.Random(self.seed + self.epoch)
+        indices = list(range(len(self.lengths)))
+        if self.shuffle:
+            rng.shuffle(indices)
+        
+        batches = []
+        for start in range(0, len(indices), self.pool_size):
+            pool = sorted(indices[start:start + self.pool_size], key=lambda i: self.lengths[i])
+            for b in range(0, len(pool), self.batch_size):
+                batch = pool[b:b + self.batch_size]
+                if len(batch) < self.batch_size and self.drop_last:
+                    continue
+                batches.append(batch)
+        
+        if self.shuffle:
+            rng.shuffle(batches)
+        
+        if self.num_replicas > 1:
+            total = -(-len(batches) // self.num_replicas) * self.num_replicas
+            batches += batches[:total - len(batches)]
+            batches = batches[self.rank::self.num_replicas]
+        return batches
+    
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self._batches()
+        self.epoch += 1
+        return iter(batches)
+    
+    def __len__(self) -> int:
+        return -(-self._num_batches() // self.num_replicas)
+    
+    def _num_batches(self) -> int:
+        """Batches per epoch across all ranks"""
+        if self.drop_last:
+            full = 0
+            for start in range(0, len(self.lengths), self.pool_size):
+                full += min(self.pool_size, len(self.lengths) - start) // self.batch_size
+            return full
+        return sum(
+            -(-min(self.pool_size, len(self.lengths) - start) // self.batch_size)
+            for start in range(0, len(self.lengths), self.pool_size)
+        )
+
+
+def collate_pad(batch: List[Tuple[torch.Tensor, torch.Tensor]], pad_idx: int = 0):
+    """
+    Pad sources and targets to the longest sequence in the batch
+
+    Args:
+        batch: List of (source, target) 1-D index tensors of varying length
+        pad_idx: Padding index
+
+    Returns:
+        Tuple of (src, tgt) tensors (batch_size, batch_max_len)
+    """
+    sources, targets = zip(*batch)
+    src = pad_sequence(sources, batch_first=True, padding_value=pad_idx)
+    tgt = pad_sequence(targets, batch_first=True, padding_value=pad_idx)
+    return src, tgt
+
+
+def create_data_loader(dataset, batch_size: int, shuffle: bool, num_workers: int = 0,
+                       num_replicas: int = 1, rank: int = 0) -> DataLoader:
+    """
+    DataLoader for an ISLTranslationDataset
+
+    Unpadded datasets (pad=False) get length-bucketed batches with dynamic
+    padding; padded datasets keep plain fixed-length batching. With
+    num_replicas > 1 each rank loads only its shard of every epoch.
+    Streaming datasets shard and shuffle themselves (see streaming.py).
+    """
+    if isinstance(dataset, IterableDataset):
+        dataset.num_replicas, dataset.rank, dataset.num_workers = num_replicas, rank, num_workers
+        collate_fn = None if getattr(dataset, 'pad', True) else collate_pad
+        return DataLoader(dataset, batch_size=batch_size, collate_fn=collate_fn, num_workers=num_workers)
+    
+    if getattr(dataset, 'pad', True):
+        if num_replicas > 1:
+            sampler = DistributedSampler(dataset, num_replicas=num_replicas, rank=rank, shuffle=shuffle)
+            return DataLoader(dataset, batch_size=batch_size, sampler=sampler, num_workers=num_workers)
+        return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, num_workers=num_workers)
+    
+    sampler = BucketBatchSampler(dataset.lengths(), batch_size, shuffle=shuffle,
+                                 num_replicas=num_replicas, rank=rank)
+    return DataLoader(dataset, batch_sampler=sampler, collate_fn=collate_pad, num_workers=num_workers)
+
+
+def loader_num_batches(loader: DataLoader) -> int:
+    """Batches a DataLoader yields per epoch (exact for streaming datasets with workers)"""
+    if isinstance(loader.dataset, IterableDataset) and hasattr(loader.dataset, 'num_batches'):
+        return loader.dataset.num_batches(loader.batch_size)
+    return len(loader)
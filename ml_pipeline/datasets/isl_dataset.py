@@ -15,7 +15,8 @@ logger = logging.getLogger(__name__)
 class ISLTranslationDataset(Dataset):
     """Dataset for English-ISL translation pairs"""
     
-    def __init__(self, data_path: str, src_vocab, tgt_vocab, max_length: int = 100):
+    def __init__(self, data_path: str, src_vocab, tgt_vocab, max_length: int = 100,
+                 pad: bool = True):
         """
         Initialize dataset
         
@@ -24,10 +25,13 @@ class ISLTranslationDataset(Dataset):
             src_vocab: Source vocabulary (English)
             tgt_vocab: Target vocabulary (ISL)
             max_length: Maximum sequence length
+            pad: Pad every item to max_length. Set False when batching with
+                 collate_pad, which pads each batch to its longest sequence
         """
         self.src_vocab = src_vocab
         self.tgt_vocab = tgt_vocab
         self.max_length = max_length
+        self.pad = pad
         
         # Load data
         with open(data_path, 'r', encoding='utf-8') as f:
@@ -48,8 +52,12 @@ class ISLTranslationDataset(Dataset):
         item = self.data[idx]
         
         # Encode source and target
-        src_indices = self.src_vocab.encode(item['english'], max_length=self.max_length)
-        tgt_indices = self.tgt_vocab.encode(item['isl'], max_length=self.max_length)
+        if self.pad:
+            src_indices = self.src_vocab.encode(item['english'], max_length=self.max_length)
+            tgt_indices = self.tgt_vocab.encode(item['isl'], max_length=self.max_length)
+        else:
+            src_indices = self.src_vocab.encode(item['english'])[:self.max_length]
+            tgt_indices = self.tgt_vocab.encode(item['isl'])[:self.max_length]
         
         # Convert to tensors
         src_tensor = torch.tensor(src_indices, dtype=torch.long)
@@ -57,6 +65,16 @@ class ISLTranslationDataset(Dataset):
         
         return src_tensor, tgt_tensor
     
+    def lengths(self) -> List[int]:
+        """
+        Token length of each pair (longer of source and target), used for
+        length-bucketed batching
+        """
+        return [
+            min(max(len(item['english'].split()), len(item['isl'].split())), self.max_length)
+            for item in self.data
+        ]
+    
     @staticmethod
     def create_from_pairs(pairs: List[Tuple[str, str]], output_path: str):
         """
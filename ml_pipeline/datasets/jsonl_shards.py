@@ -0,0 +1,96 @@
+"""
+JSON lines shards
+Hash-based train/val split, sharded JSONL writer and record readers (no torch
+dependency, so exporting from the database stays lightweight)
+"""
+
+import glob
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+SHARD_MANIFEST = "manifest.json"
+SPLITS = ("train", "val")
+
+
+def split_for(text: str, val_fraction: float) -> str:
+    """
+    Deterministic train/val assignment from a hash of the normalized text
+
+    The same sentence always lands in the same split, across exports and
+    as the table grows, so validation pairs never leak into training.
+    """
+    key = ' '.join(text.lower().split()).encode('utf-8')
+    value = int.from_bytes(hashlib.sha1(key).digest()[:8], 'big') / 2 ** 64
+    return "val" if value < val_fraction else "train"
+
+
+class JsonlShardWriter:
+    """Write records to <prefix>-00000.jsonl, <prefix>-00001.jsonl, ... of shard_size lines each"""
+
+    def __init__(self, output_dir: str, prefix: str, shard_size: int = 10000):
+        self.output_dir = Path(output_dir)
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shards: List[Dict] = []
+        self._file = None
+
+    def write(self, record: Dict):
+        """Append one record, starting a new shard when the current one is full"""
+        if self._file is None or self.shards[-1]['count'] >= self.shard_size:
+            self._close_file()
+            name = f"{self.prefix}-{len(self.shards):05d}.jsonl"
+            self._file = open(self.output_dir / name, 'w', encoding='utf-8')
+            self.shards.append({'file': name, 'count': 0})
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.shards[-1]['count'] += 1
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> List[Dict]:
+        """Close the open shard and return [{'file', 'count'}, ...]"""
+        self._close_file()
+        return self.shards
+
+
+def resolve_shards(path: str, split: str = "train") -> List[str]:
+    """
+    JSONL files for a data path
+
+    Args:
+        path: Shard directory (uses its manifest, or <split>-*.jsonl),
+              a glob pattern, or a single .jsonl file
+        split: Split to read from a shard directory
+    """
+    if os.path.isdir(path):
+        manifest_path = os.path.join(path, SHARD_MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return [os.path.join(path, shard['file']) for shard in manifest['splits'][split]['shards']]
+        return sorted(glob.glob(os.path.join(path, f"{split}-*.jsonl")))
+    if any(char in path for char in '*?['):
+        return sorted(glob.glob(path))
+    return [path]
+
+
+def iter_records(path: str, split: str = "train") -> Iterator[Dict]:
+    """
+    Yield pair records from a JSON array file, a JSONL file or a shard directory
+
+    JSONL input is read one line at a time; JSON arrays are loaded whole.
+    """
+    if os.path.isfile(path) and path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+    for shard in resolve_shards(path, split):
+        with open(shard, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,155 @@
+"""
+Streaming JSON lines dataset
+Iterable dataset that reads JSONL shards line by line, so the corpus never
+has to fit in memory
+"""
+
+import json
+import logging
+import math
+import os
+import random
+from typing import Dict, Iterator, List, Optional, Union
+
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from ml_pipeline.datasets.jsonl_shards import SHARD_MANIFEST, resolve_shards
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingTranslationDataset(IterableDataset):
+    """
+    Iterable English-ISL dataset over JSONL shards
+
+    Lines are dealt round-robin across distributed ranks and DataLoader
+    workers, so each pair is read by exactly one of them. Like
+    DistributedSampler, the stream is padded by wrapping around to its first
+    lines until it divides evenly, so every rank and worker reads the same
+    number of pairs (at most num_replicas * num_workers - 1 repeats) and all
+    ranks run the same number of steps. Shuffling uses a fixed-size buffer
+    (reseeded by set_epoch), so memory is bounded by shuffle_buffer rather
+    than the corpus size.
+    """
+
+    def __init__(self, path: Union[str, List[str]], src_vocab, tgt_vocab, max_length: int = 100,
+                 pad: bool = False, split: str = "train", shuffle_buffer: int = 0, seed: int = 0,
+                 num_replicas: int = 1, rank: int = 0, num_workers: int = 0):
+        """
+        Args:
+            path: Shard directory, glob pattern, .jsonl file or list of files
+            src_vocab: Source vocabulary (English)
+            tgt_vocab: Target vocabulary (ISL)
+            max_length: Maximum sequence length
+            pad: Pad every item to max_length (False for collate_pad batching)
+            split: Split to read from a shard directory
+            shuffle_buffer: Shuffle within a buffer of this many pairs (0 = file order)
+            seed: Base seed for buffer shuffling
+            num_replicas: Number of distributed ranks reading the stream
+            rank: This process's rank
+            num_workers: DataLoader workers per rank (0 = load in the main process)
+        """
+        self.files = list(path) if isinstance(path, list) else resolve_shards(path, split)
+        self.src_vocab = src_vocab
+        self.tgt_vocab = tgt_vocab
+        self.max_length = max_length
+        self.pad = pad
+        self.shuffle_buffer = shuffle_buffer
+        self.seed = seed
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.num_workers = num_workers
+        self.epoch = 0
+        self._num_pairs: Optional[int] = self._manifest_count(path, split)
+
+    @staticmethod
+    def _manifest_count(path, split: str) -> Optional[int]:
+        """Pair count from a shard directory manifest, if there is one"""
+        if isinstance(path, str) and os.path.isdir(path):
+            manifest_path = os.path.join(path, SHARD_MANIFEST)
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)['splits'][split]['count']
+        return None
+
+    def set_epoch(self, epoch: int):
+        """Reseed buffer shuffling for a new epoch"""
+        self.epoch = epoch
+
+    def _encode(self, text: str, vocab) -> torch.Tensor:
+        if self.pad:
+            indices = vocab.encode(text, max_length=self.max_length, add_special_tokens=True)
+        else:
+            indices = vocab.encode(text, add_special_tokens=True)[:self.max_length]
+        return torch.tensor(indices, dtype=torch.long)
+
+    def _raw_lines(self) -> Iterator[str]:
+        for shard in self.files:
+            with open(shard, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield line
+
+    def _num_pairs_total(self) -> int:
+        """Pairs in the stream (counted once when there is no manifest)"""
+        if self._num_pairs is None:
+            self._num_pairs = sum(1 for _ in self._raw_lines())
+        return self._num_pairs
+
+    def _per_reader(self, num_workers: int) -> int:
+        """Pairs each (rank, worker) reader yields per epoch, after padding"""
+        return math.ceil(self._num_pairs_total() / (self.num_replicas * num_workers))
+
+    def _lines(self) -> Iterator[Dict]:
+        """Records assigned to this rank and worker"""
+        worker = get_worker_info()
+        num_workers = worker.num_workers if worker is not None else 1
+        worker_id = worker.id if worker is not None else 0
+        stride = self.num_replicas * num_workers
+        offset = self.rank * num_workers + worker_id
+        padded = self._per_reader(num_workers) * stride
+
+        # Wrap around to the first lines until every reader has its full share
+        index = 0
+        while index < padded:
+            for line in self._raw_lines():
+                if index >= padded:
+                    break
+                if index % stride == offset:
+                    yield json.loads(line)
+                index += 1
+
+    def __iter__(self):
+        rng = random.Random(self.seed + self.epoch)
+        buffer: List[Dict] = []
+        for item in self._lines():
+            if self.shuffle_buffer <= 0:
+                yield self._encode(item['english'], self.src_vocab), self._encode(item['isl'], self.tgt_vocab)
+                continue
+            if len(buffer) < self.shuffle_buffer:
+                buffer.append(item)
+                continue
+            # Emit a random buffered item and keep the new one in its place
+            slot = rng.randrange(len(buffer))
+            buffer[slot], item = item, buffer[slot]
+            yield self._encode(item['english'], self.src_vocab), self._encode(item['isl'], self.tgt_vocab)
+        rng.shuffle(buffer)
+        for item in buffer:
+            yield self._encode(item['english'], self.src_vocab), self._encode(item['isl'], self.tgt_vocab)
+
+    def __len__(self) -> int:
+        """Pairs this rank reads per epoch, padding included"""
+        num_workers = max(self.num_workers, 1)
+        return num_workers * self._per_reader(num_workers)
+
+    def num_batches(self, batch_size: int) -> int:
+        """
+        Batches this rank's DataLoader yields per epoch
+
+        Each worker batches its own share, so with several workers every
+        worker ends on its own partial batch; len(DataLoader) does not
+        account for that.
+        """
+        num_workers = max(self.num_workers, 1)
+        return num_workers * math.ceil(self._per_reader(num_workers) / batch_size)
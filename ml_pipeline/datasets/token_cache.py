@@ -0,0 +1,161 @@
+"""
+Pre-tokenized training data cache
+Encodes a pairs file once into contiguous NumPy token arrays + offsets and
+serves them through a memory-mapped dataset
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+CACHE_FILES = ["src_tokens.npy", "src_offsets.npy", "tgt_tokens.npy", "tgt_offsets.npy"]
+
+
+def _iter_pairs(data_path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (english, isl) from a JSON array file or a JSONL file (streamed)"""
+    if str(data_path).endswith('.jsonl'):
+        with open(data_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    yield item['english'], item['isl']
+    else:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                yield item['english'], item['isl']
+
+
+def cache_key(data_path: str, src_vocab, tgt_vocab) -> str:
+    """Content hash of the data file and both vocabularies"""
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode('utf-8'))
+    with open(data_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    for vocab in (src_vocab, tgt_vocab):
+        digest.update(json.dumps(vocab.to_list(), ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+
+def build_token_cache(data_path: str, src_vocab, tgt_vocab, cache_root: str) -> Path:
+    """
+    Encode a pairs file into token arrays (no-op if an up-to-date cache exists)
+
+    Layout of <cache_root>/<content hash>/:
+        src_tokens.npy / tgt_tokens.npy   int32, all sequences concatenated
+        src_offsets.npy / tgt_offsets.npy int64, n + 1 start offsets
+        meta.json                         source file, pair/token counts
+
+    Args:
+        data_path: JSON or JSONL pairs file
+        src_vocab: Source vocabulary
+        tgt_vocab: Target vocabulary
+        cache_root: Directory holding caches
+
+    Returns:
+        Path to the cache directory
+    """
+    cache_dir = Path(cache_root) / cache_key(data_path, src_vocab, tgt_vocab)
+    if (cache_dir / "meta.json").exists():
+        logger.info(f"Using token cache {cache_dir}")
+        return cache_dir
+
+    src_tokens, tgt_tokens = array('i'), array('i')
+    src_offsets, tgt_offsets = array('q', [0]), array('q', [0])
+    for english, isl in _iter_pairs(data_path):
+        src_tokens.extend(src_vocab.encode(english))
+        tgt_tokens.extend(tgt_vocab.encode(isl))
+        src_offsets.append(len(src_tokens))
+        tgt_offsets.append(len(tgt_tokens))
+
+    # Write to a temp dir and rename so readers never see a partial cache
+    tmp_dir = cache_dir.with_name(cache_dir.name + f".tmp{os.getpid()}")
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    np.save(tmp_dir / "src_tokens.npy", np.frombuffer(src_tokens, dtype=np.int32))
+    np.save(tmp_dir / "src_offsets.npy", np.frombuffer(src_offsets, dtype=np.int64))
+    np.save(tmp_dir / "tgt_tokens.npy", np.frombuffer(tgt_tokens, dtype=np.int32))
+    np.save(tmp_dir / "tgt_offsets.npy", np.frombuffer(tgt_offsets, dtype=np.int64))
+    with open(tmp_dir / "meta.json", 'w') as f:
+        json.dump({
+            'version': CACHE_FORMAT_VERSION,
+            'data_path': str(data_path),
+            'num_pairs': len(src_offsets) - 1,
+            'src_tokens': len(src_tokens),
+            'tgt_tokens': len(tgt_tokens)
+        }, f, indent=2)
+
+    try:
+        tmp_dir.rename(cache_dir)
+    except OSError:
+        # Another process finished the same cache first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    logger.info(f"Built token cache for {len(src_offsets) - 1} pairs at {cache_dir}")
+    return cache_dir
+
+
+class MemmapTranslationDataset(Dataset):
+    """
+    Dataset over a token cache; items are slices of memory-mapped arrays,
+    so epochs do no tokenization and the corpus is never fully loaded
+    """
+
+    def __init__(self, cache_dir: str, max_length: int = 100, pad: bool = True):
+        """
+        Args:
+            cache_dir: Directory written by build_token_cache
+            max_length: Maximum sequence length
+            pad: Pad every item to max_length (False for collate_pad batching)
+        """
+        cache_dir = Path(cache_dir)
+        self.cache_dir = cache_dir
+        self.max_length = max_length
+        self.pad = pad
+
+        self.src_tokens = np.load(cache_dir / "src_tokens.npy", mmap_mode='r')
+        self.src_offsets = np.load(cache_dir / "src_offsets.npy", mmap_mode='r')
+        self.tgt_tokens = np.load(cache_dir / "tgt_tokens.npy", mmap_mode='r')
+        self.tgt_offsets = np.load(cache_dir / "tgt_offsets.npy", mmap_mode='r')
+
+        logger.info(f"Loaded token cache with {len(self)} pairs from {cache_dir}")
+
+    def __len__(self):
+        return len(self.src_offsets) - 1
+
+    def _sequence(self, tokens, offsets, idx: int) -> torch.Tensor:
+        start, end = int(offsets[idx]), int(offsets[idx + 1])
+        end = min(end, start + self.max_length)
+        sequence = torch.from_numpy(np.array(tokens[start:end], dtype=np.int64))
+        if self.pad and len(sequence) < self.max_length:
+            sequence = torch.nn.functional.pad(sequence, (0, self.max_length - len(sequence)))
+        return sequence
+
+    def __getitem__(self, idx) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Get item at index
+
+        Returns:
+            Tuple of (source_sequence, target_sequence) as tensors
+        """
+        return (
+            self._sequence(self.src_tokens, self.src_offsets, idx),
+            self._sequence(self.tgt_tokens, self.tgt_offsets, idx)
+        )
+
+    def lengths(self) -> List[int]:
+        """Token length of each pair (longer of source and target)"""
+        src_lengths = np.diff(self.src_offsets)
+        tgt_lengths = np.diff(self.tgt_offsets)
+        return np.minimum(np.maximum(src_lengths, tgt_lengths), self.max_length).tolist()
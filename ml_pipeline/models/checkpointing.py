@@ -0,0 +1,118 @@
+"""
+Training Checkpoints
+Background checkpoint writer with atomic renames, and RNG state capture for exact resume
+"""
+
+import os
+import queue
+import random
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_state(value):
+    """
+    Detached CPU copy of a (nested) state dict
+
+    state_dict() returns references to live parameters and optimizer buffers,
+    which the next training step would modify while a background thread is
+    still serializing them.
+    """
+    if isinstance(value, torch.Tensor):
+        return value.detach().to("cpu", copy=True)
+    if isinstance(value, dict):
+        return {key: snapshot_state(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(snapshot_state(item) for item in value)
+    return value
+
+
+def atomic_save(checkpoint: Dict, filepath: str):
+    """Write a checkpoint to a temp file and rename it over filepath"""
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'wb') as f:
+        torch.save(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def capture_rng_state() -> Dict:
+    """
+    Python, NumPy and torch RNG states in a weights_only-loadable form
+
+    Restoring these with restore_rng_state() makes dropout masks and
+    teacher-forcing decisions after a resume match an uninterrupted run.
+    """
+    np_state = np.random.get_state()
+    state = {
+        'python': random.getstate(),
+        'numpy': [np_state[0], np_state[1].tolist(), int(np_state[2]), int(np_state[3]), float(np_state[4])],
+        'torch': torch.get_rng_state()
+    }
+    if torch.cuda.is_available():
+        state['cuda'] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def restore_rng_state(state: Dict):
+    """Restore RNG states saved by capture_rng_state()"""
+    version, internal, gauss = state['python']
+    random.setstate((version, tuple(internal), gauss))
+    name, keys, pos, has_gauss, cached_gaussian = state['numpy']
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+    torch.set_rng_state(state['torch'])
+    if 'cuda' in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state['cuda'])
+
+
+class AsyncCheckpointWriter:
+    """
+    Serializes checkpoints on a background thread
+
+    Callers pass already-snapshotted state, so training continues while
+    torch.save runs. The queue is bounded so at most max_pending snapshots are
+    held in memory; submit() blocks when the writer falls behind. Every write
+    goes through atomic_save(), so a killed job leaves either the previous or
+    the new checkpoint on disk, never a truncated one.
+    """
+
+    def __init__(self, max_pending: int = 2):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.errors: List[str] = []
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, checkpoint: Dict, filepath: str):
+        """Queue a checkpoint snapshot for writing"""
+        self._queue.put((checkpoint, filepath))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                checkpoint, filepath = item
+                atomic_save(checkpoint, filepath)
+                logger.info(f"Saved checkpoint to {filepath}")
+            except Exception as e:
+                logger.error(f"Failed to write checkpoint: {e}")
+                self.errors.append(str(e))
+            finally:
+                self._queue.task_done()
+
+    def wait(self):
+        """Block until every queued checkpoint has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Write pending checkpoints and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,150 @@
+"""
+Knowledge distillation from the LSTM translator into a small student model
+"""
+
+import json
+import logging
+from typing import List
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.data import DataLoader
+from tqdm import tqdm
+
+from ml_pipeline.models.translation_trainer import TranslationTrainer
+from ml_pipeline.config import TRAINING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def teacher_forced_logits(model: nn.Module, src: torch.Tensor, tgt: torch.Tensor) -> torch.Tensor:
+    """
+    Decoder logits when every step is fed the gold previous token
+
+    Works for both Seq2SeqTranslator (LSTM, hidden+cell) and
+    StudentTranslator (GRU, hidden only).
+
+    Returns:
+        Logits (batch_size, tgt_len, tgt_vocab_size); position 0 is zero
+    """
+    state = model.encoder(src)
+    decoder_input = tgt[:, :-1]
+    if isinstance(state, tuple):
+        logits, _, _ = model.decoder.forward_sequence(decoder_input, *state)
+    else:
+        logits, _ = model.decoder.forward_sequence(decoder_input, state)
+    return F.pad(logits, (0, 0, 1, 0))
+
+
+def generate_teacher_corpus(teacher: nn.Module, src_vocab, tgt_vocab, data_paths: List[str],
+                            output_path: str, max_length: int = 100, device: str = "cpu") -> int:
+    """
+    Translate the English side of training corpora with the teacher
+
+    The student is then trained on the teacher's own outputs (sequence-level
+    distillation) in the same {'english', 'isl'} format as the data files.
+
+    Returns:
+        Number of pairs written
+    """
+    teacher.to(device)
+    teacher.eval()
+    sos_idx = tgt_vocab.word2idx.get('<sos>', 2)
+    eos_idx = tgt_vocab.word2idx.get('<eos>', 3)
+
+    seen = set()
+    corpus = []
+    for data_path in data_paths:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            pairs = json.load(f)
+        for item in tqdm(pairs, desc=f"Teacher outputs ({data_path})"):
+            english = item['english']
+            if english in seen:
+                continue
+            seen.add(english)
+
+            src_indices = src_vocab.encode(english, add_special_tokens=True)
+            src_tensor = torch.tensor([src_indices], dtype=torch.long, device=device)
+            translated = teacher.translate(src_tensor, max_length=max_length,
+                                           sos_idx=sos_idx, eos_idx=eos_idx)
+            isl = tgt_vocab.decode(translated)
+            corpus.append({'english': english, 'isl': f"<sos> {isl} <eos>"})
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"Wrote {len(corpus)} teacher-labelled pairs to {output_path}")
+    return len(corpus)
+
+
+class DistillationTrainer(TranslationTrainer):
+    """
+    Trains a student on a mix of the teacher's softened output distribution
+    (KL divergence at temperature T) and the hard targets
+
+    loss = alpha * T^2 * KL(student_T || teacher_T) + (1 - alpha) * CE(student, target)
+    """
+
+    def __init__(self, student: nn.Module, teacher: nn.Module, config):
+        super(DistillationTrainer, self).__init__(student, config)
+        self.teacher = teacher.to(self.device)
+        self.teacher.eval()
+        for param in self.teacher.parameters():
+            param.requires_grad_(False)
+
+        self.temperature = config.DISTILL_TEMPERATURE
+        self.alpha = config.DISTILL_ALPHA
+
+    def distillation_loss(self, student_logits: torch.Tensor, teacher_logits: torch.Tensor,
+                          tgt: torch.Tensor) -> torch.Tensor:
+        """Combined soft/hard loss over non-padding target positions"""
+        student_logits = student_logits[:, 1:].reshape(-1, student_logits.size(-1))
+        teacher_logits = teacher_logits[:, 1:].reshape(-1, teacher_logits.size(-1))
+        targets = tgt[:, 1:].reshape(-1)
+        mask = targets != 0
+
+        hard_loss = self.criterion(student_logits, targets)
+
+        if not mask.any():
+            return hard_loss
+
+        T = self.temperature
+        soft_loss = F.kl_div(
+            F.log_softmax(student_logits[mask] / T, dim=-1),
+            F.softmax(teacher_logits[mask] / T, dim=-1),
+            reduction='batchmean'
+        ) * (T * T)
+
+        return self.alpha * soft_loss + (1 - self.alpha) * hard_loss
+
+    def train_epoch(self, train_loader: DataLoader, epoch: int):
+        """Train student for one epoch against teacher soft targets"""
+        self.model.train()
+        total_loss = 0
+
+        pbar = tqdm(train_loader, desc=f"Distill epoch {epoch}")
+        for batch_idx, (src, tgt) in enumerate(pbar):
+            src = src.to(self.device)
+            tgt = tgt.to(self.device)
+
+            with torch.no_grad():
+                teacher_logits = teacher_forced_logits(self.teacher, src, tgt)
+
+            self.optimizer.zero_grad()
+            # Soft targets are aligned with gold inputs, so the student is teacher-forced too
+            student_logits = teacher_forced_logits(self.model, src, tgt)
+
+            loss = self.distillation_loss(student_logits, teacher_logits, tgt)
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.config.GRAD_CLIP)
+            self.optimizer.step()
+
+            total_loss += loss.item()
+
+            if batch_idx % TRAINING_CONFIG["log_interval"] == 0:
+                pbar.set_postfix({'loss': loss.item()})
+
+        avg_loss = total_loss / len(train_loader)
+        self.train_losses.append(avg_loss)
+        return avg_loss
@@ -0,0 +1,432 @@
+"""
+Incremental Fine-Tuning
+Warm-starts the deployed translator on pairs and feedback collected since the last version
+"""
+
+import os
+import copy
+import json
+import random
+import shutil
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+
+from ml_pipeline.config import FineTuneConfig
+from ml_pipeline.data_collector import DataCollector
+from ml_pipeline.datasets.isl_dataset import ISLTranslationDataset
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.datasets.jsonl_shards import iter_records, resolve_shards
+from ml_pipeline.models.inference_artifact import export_inference_artifact
+from ml_pipeline.models.translation_trainer import TranslationTrainer
+from ml_pipeline.models.translator import build_translator
+from ml_pipeline.utils.vocab import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(versions_dir: str) -> Dict:
+    """Load the version manifest, or an empty one before the first fine-tune"""
+    path = Path(versions_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {'published': None, 'versions': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(versions_dir: str, manifest: Dict):
+    """Write the version manifest atomically"""
+    path = Path(versions_dir) / MANIFEST_NAME
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def publish_file(source: str, destination: str):
+    """Copy a file over destination atomically, so readers never see a partial file"""
+    tmp_path = f"{destination}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+def format_example(english: str, isl: str) -> Dict:
+    """Training pair in the corpus format (lowercased, wrapped in <sos>/<eos>)"""
+    def wrap(text: str) -> str:
+        words = text.lower().split()
+        if not words or words[0] != '<sos>':
+            words = ['<sos>'] + words
+        if words[-1] != '<eos>':
+            words = words + ['<eos>']
+        return ' '.join(words)
+    return {'english': wrap(english), 'isl': wrap(isl)}
+
+
+def collect_new_examples(collector: DataCollector, last_pair_id: int = 0,
+                         last_feedback_id: int = 0,
+                         verified_only: bool = False) -> Tuple[List[Dict], Dict]:
+    """
+    Training pairs collected after the previous version's watermarks
+
+    Args:
+        collector: Data collector for the training database
+        last_pair_id: Highest translation pair ID already trained on
+        last_feedback_id: Highest feedback ID already trained on
+        verified_only: Only use verified translation pairs
+
+    Returns:
+        Tuple of (examples, watermarks) where watermarks holds the new
+        last_pair_id / last_feedback_id and per-source counts
+    """
+    pairs = collector.get_pairs_since(last_pair_id, verified_only=verified_only)
+    feedback = collector.get_feedback_pairs_since(last_feedback_id)
+
+    examples = [format_example(eng, isl) for _, eng, isl in pairs if eng and isl]
+    examples += [format_example(eng, isl) for _, eng, isl in feedback if eng and isl]
+
+    watermarks = {
+        'last_pair_id': pairs[-1][0] if pairs else last_pair_id,
+        'last_feedback_id': feedback[-1][0] if feedback else last_feedback_id,
+        'new_pairs': len(pairs),
+        'new_feedback': len(feedback)
+    }
+    return examples, watermarks
+
+
+def require_data(data_path: str, setting: str, split: str = "train"):
+    """
+    Raise FileNotFoundError unless data_path resolves to existing files
+
+    Args:
+        data_path: JSON array, JSONL file or shard directory
+        setting: Config field or option that names the path, for the message
+        split: Split to resolve in a shard directory
+    """
+    files = resolve_shards(data_path, split)
+    if not files:
+        raise FileNotFoundError(f"{setting} {data_path} matches no data files")
+    for path in files:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{setting} file not found: {path}")
+
+
+def sample_replay(data_path: str, count: int, seed: int = 0) -> List[Dict]:
+    """
+    Random sample of the original training data
+
+    Mixing old pairs into every fine-tune keeps the model from forgetting
+    what it learned before while it adapts to the new examples. data_path
+    may be a JSON array, a JSONL file or a shard directory; records are
+    streamed through a reservoir, so only count of them are held in memory.
+
+    Raises:
+        FileNotFoundError: data_path does not exist; fine-tuning without
+            replay would overwrite what the model learned before
+    """
+    if count <= 0:
+        return []
+    require_data(data_path, "Replay data")
+    rng = random.Random(seed)
+    sample: List[Dict] = []
+    for seen, record in enumerate(iter_records(data_path)):
+        if len(sample) < count:
+            sample.append(record)
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < count:
+                sample[slot] = record
+    return sample
+
+
+def extend_vocabulary(vocab: Vocabulary, texts: List[str], min_freq: int = 1) -> int:
+    """
+    Append words seen at least min_freq times to a vocabulary
+
+    Existing indices are unchanged, so weights trained against the old
+    vocabulary stay valid for every word it already had.
+
+    Returns:
+        Number of words added
+    """
+    counts: Dict[str, int] = {}
+    for text in texts:
+        for word in text.lower().split():
+            counts[word] = counts.get(word, 0) + 1
+
+    before = vocab.size()
+    for word, count in counts.items():
+        if count >= min_freq:
+            vocab.add_word(word)
+    return vocab.size() - before
+
+
+def _grow_embedding(embedding: nn.Embedding, size: int, unk_idx: int = 1) -> nn.Embedding:
+    """Embedding with extra rows initialized from the <unk> row"""
+    grown = nn.Embedding(size, embedding.embedding_dim, padding_idx=embedding.padding_idx)
+    with torch.no_grad():
+        old_size = embedding.num_embeddings
+        grown.weight[:old_size] = embedding.weight
+        grown.weight[old_size:] = embedding.weight[unk_idx]
+    return grown
+
+
+def _grow_output(linear: nn.Linear, size: int) -> nn.Linear:
+    """
+    Output projection with extra rows for new target words
+
+    New rows get small random weights and the lowest existing bias, so new
+    words start out unlikely instead of competing with well-trained ones.
+    """
+    grown = nn.Linear(linear.in_features, size)
+    with torch.no_grad():
+        old_size = linear.out_features
+        grown.weight[:old_size] = linear.weight
+        grown.weight[old_size:].normal_(0.0, float(linear.weight.std()) * 0.1)
+        grown.bias[:old_size] = linear.bias
+        grown.bias[old_size:] = linear.bias.min()
+    return grown
+
+
+def resize_vocab_layers(model: nn.Module, src_vocab_size: int, tgt_vocab_size: int):
+    """
+    Grow a translator's vocabulary-sized layers in place
+
+    Works for both architectures built by build_translator(), which share
+    the encoder.embedding / decoder.embedding / decoder.fc_out layout.
+    """
+    if src_vocab_size > model.encoder.embedding.num_embeddings:
+        model.encoder.embedding = _grow_embedding(model.encoder.embedding, src_vocab_size)
+    if tgt_vocab_size > model.decoder.embedding.num_embeddings:
+        model.decoder.embedding = _grow_embedding(model.decoder.embedding, tgt_vocab_size)
+        model.decoder.fc_out = _grow_output(model.decoder.fc_out, tgt_vocab_size)
+
+
+def exact_match_rate(model, examples: List[Dict], src_vocab: Vocabulary,
+                     tgt_vocab: Vocabulary, max_length: int) -> float:
+    """Share of examples the model translates exactly (greedy decoding)"""
+    if not examples:
+        return 0.0
+    sos_idx = tgt_vocab.word2idx.get('<sos>', 2)
+    eos_idx = tgt_vocab.word2idx.get('<eos>', 3)
+    model.eval()
+    matches = 0
+    for item in examples:
+        src_tensor = torch.tensor([src_vocab.encode(item['english'], add_special_tokens=True)],
+                                  dtype=torch.long)
+        indices = model.translate(src_tensor, max_length=max_length, sos_idx=sos_idx, eos_idx=eos_idx)
+        reference = tgt_vocab.decode(tgt_vocab.encode(item['isl']))
+        matches += tgt_vocab.decode(indices) == reference
+    return matches / len(examples)
+
+
+class IncrementalFineTuner:
+    """
+    Fine-tune the deployed translator on newly collected data
+
+    Each run trains on pairs and feedback added since the previous version
+    (tracked by row-ID watermarks in the version manifest) mixed with a
+    replay sample of the original training data, starting from the
+    published checkpoint with a fresh optimizer. Accepted runs are written
+    as a numbered version (checkpoint, vocabularies and inference artifact)
+    and, when publishing, copied over the paths the server loads.
+    """
+
+    def __init__(self, config: Optional[FineTuneConfig] = None,
+                 collector: Optional[DataCollector] = None):
+        """
+        Args:
+            config: Fine-tuning configuration
+            collector: Data collector for the training database
+        """
+        self.config = config or FineTuneConfig()
+        self.collector = collector or DataCollector()
+        self.versions_dir = Path(self.config.VERSIONS_DIR)
+        self.src_vocab_path = self.config.VOCAB_SAVE_PATH.replace('.json', '_src.json')
+        self.tgt_vocab_path = self.config.VOCAB_SAVE_PATH.replace('.json', '_tgt.json')
+
+    def _version_paths(self, name: str) -> Dict[str, str]:
+        """Checkpoint, vocabulary and artifact paths of a numbered version"""
+        return {
+            'checkpoint': str(self.versions_dir / f"{name}.pth"),
+            'src_vocab': str(self.versions_dir / f"{name}_vocab_src.json"),
+            'tgt_vocab': str(self.versions_dir / f"{name}_vocab_tgt.json"),
+            'artifact': str(self.versions_dir / f"{name}.inference.pt")
+        }
+
+    def _load_base(self, parent: Optional[Dict]) -> Tuple[nn.Module, Vocabulary, Vocabulary]:
+        """
+        Load the model to warm-start from: the latest version, or the
+        published checkpoint before the first fine-tune
+        """
+        if parent:
+            paths = self._version_paths(parent['name'])
+        else:
+            paths = {
+                'checkpoint': self.config.MODEL_SAVE_PATH,
+                'src_vocab': self.src_vocab_path,
+                'tgt_vocab': self.tgt_vocab_path
+            }
+        src_vocab = Vocabulary()
+        tgt_vocab = Vocabulary()
+        src_vocab.load(paths['src_vocab'])
+        tgt_vocab.load(paths['tgt_vocab'])
+
+        model = build_translator(
+            self.config.ARCHITECTURE,
+            src_vocab_size=src_vocab.size(),
+            tgt_vocab_size=tgt_vocab.size(),
+            embed_dim=self.config.EMBED_DIM,
+            hidden_dim=self.config.HIDDEN_DIM,
+            num_layers=self.config.NUM_LAYERS,
+            dropout=self.config.DROPOUT
+        )
+        checkpoint = torch.load(paths['checkpoint'], map_location="cpu")
+        if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
+            checkpoint = checkpoint['model_state_dict']
+        model.load_state_dict(checkpoint)
+        return model, src_vocab, tgt_vocab
+
+    def _data_loader(self, data_path: str, src_vocab: Vocabulary, tgt_vocab: Vocabulary,
+                     shuffle: bool):
+        """Data loader over a JSON pairs file (token cache skipped for small one-off sets)"""
+        dataset = ISLTranslationDataset(data_path, src_vocab, tgt_vocab, self.config.MAX_LENGTH,
+                                        pad=not self.config.BUCKET_BATCHES)
+        return create_data_loader(dataset, batch_size=self.config.BATCH_SIZE, shuffle=shuffle)
+
+    def run(self, publish: bool = True, verified_only: bool = False) -> Dict:
+        """
+        Run one incremental fine-tune
+
+        Args:
+            publish: Copy an accepted version over the served model paths
+            verified_only: Only use verified translation pairs
+
+        Returns:
+            Report dictionary; 'status' is 'skipped', 'rejected' or 'accepted'
+        """
+        start = time.perf_counter()
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        manifest = load_manifest(str(self.versions_dir))
+        parent = manifest['versions'][-1] if manifest['versions'] else None
+        watermark = parent['watermarks'] if parent else {'last_pair_id': 0, 'last_feedback_id': 0}
+
+        examples, watermarks = collect_new_examples(
+            self.collector, watermark['last_pair_id'], watermark['last_feedback_id'],
+            verified_only=verified_only
+        )
+        report = {'status': 'skipped', 'new_examples': len(examples), 'watermarks': watermarks}
+        if len(examples) < self.config.MIN_NEW_EXAMPLES:
+            logger.info(f"Only {len(examples)} new examples, nothing to fine-tune")
+            return report
+
+        # Fail before the base model is loaded, not after training starts
+        require_data(self.config.TRAIN_DATA_PATH, "TRAIN_DATA_PATH")
+        require_data(self.config.VAL_DATA_PATH, "VAL_DATA_PATH", split="val")
+
+        model, src_vocab, tgt_vocab = self._load_base(parent)
+        base_vocab_sizes = (src_vocab.size(), tgt_vocab.size())
+        added_src = extend_vocabulary(src_vocab, [item['english'] for item in examples], self.config.MIN_FREQ)
+        added_tgt = extend_vocabulary(tgt_vocab, [item['isl'] for item in examples], self.config.MIN_FREQ)
+        resize_vocab_layers(model, src_vocab.size(), tgt_vocab.size())
+        logger.info(f"Added {added_src} source and {added_tgt} target words to the vocabularies")
+
+        replay_count = min(max(int(len(examples) * self.config.REPLAY_RATIO), self.config.MIN_REPLAY),
+                           self.config.MAX_REPLAY)
+        replay = sample_replay(self.config.TRAIN_DATA_PATH, replay_count,
+                               seed=watermarks['last_pair_id'] + watermarks['last_feedback_id'])
+
+        number = (parent['version'] if parent else 0) + 1
+        name = f"translator_v{number:04d}"
+        paths = self._version_paths(name)
+        version_config = copy.copy(self.config)
+        version_config.MODEL_SAVE_PATH = paths['checkpoint']
+
+        with tempfile.TemporaryDirectory(prefix='finetune_') as work_dir:
+            train_path = os.path.join(work_dir, 'train.json')
+            with open(train_path, 'w', encoding='utf-8') as f:
+                json.dump(examples + replay, f, ensure_ascii=False)
+
+            train_loader = self._data_loader(train_path, src_vocab, tgt_vocab, shuffle=True)
+            val_loader = self._data_loader(self.config.VAL_DATA_PATH, src_vocab, tgt_vocab, shuffle=False)
+
+            trainer = TranslationTrainer(model, version_config)
+            val_before = trainer.validate(val_loader)
+            trainer.val_losses = []
+            match_before = exact_match_rate(model, examples, src_vocab, tgt_vocab, self.config.MAX_LENGTH)
+
+            trainer.train(train_loader, val_loader)
+            if os.path.exists(trainer.last_checkpoint_path):
+                os.remove(trainer.last_checkpoint_path)
+
+        val_after = trainer.best_val_loss
+        checkpoint = torch.load(paths['checkpoint'], map_location="cpu")
+        model.load_state_dict(checkpoint['model_state_dict'])
+        match_after = exact_match_rate(model, examples, src_vocab, tgt_vocab, self.config.MAX_LENGTH)
+
+        report.update({
+            'version': number,
+            'parent': parent['version'] if parent else None,
+            'replay_examples': len(replay),
+            'added_src_words': added_src,
+            'added_tgt_words': added_tgt,
+            'base_vocab_sizes': list(base_vocab_sizes),
+            'val_loss_before': val_before,
+            'val_loss_after': val_after,
+            'new_exact_match_before': match_before,
+            'new_exact_match_after': match_after,
+            'epochs': len(trainer.val_losses)
+        })
+
+        if val_after > val_before * (1 + self.config.MAX_VAL_REGRESSION):
+            logger.warning(f"Validation loss regressed from {val_before:.4f} to {val_after:.4f}, "
+                           f"not keeping {name}")
+            os.remove(paths['checkpoint'])
+            report['status'] = 'rejected'
+            report['seconds'] = time.perf_counter() - start
+            return report
+
+        # Versioned files
+        src_vocab.save(paths['src_vocab'])
+        tgt_vocab.save(paths['tgt_vocab'])
+        content_hash = export_inference_artifact(
+            paths['checkpoint'], paths['src_vocab'], paths['tgt_vocab'], paths['artifact'], self.config
+        )
+
+        manifest['versions'].append({
+            'version': number,
+            'name': name,
+            'parent': report['parent'],
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'content_hash': content_hash,
+            'watermarks': {key: watermarks[key] for key in ('last_pair_id', 'last_feedback_id')},
+            'new_examples': len(examples),
+            'replay_examples': len(replay),
+            'val_loss_before': val_before,
+            'val_loss_after': val_after
+        })
+
+        if publish:
+            publish_file(paths['src_vocab'], self.src_vocab_path)
+            publish_file(paths['tgt_vocab'], self.tgt_vocab_path)
+            publish_file(paths['checkpoint'], self.config.MODEL_SAVE_PATH)
+            publish_file(paths['artifact'], self.config.INFERENCE_MODEL_PATH)
+            manifest['published'] = number
+            logger.info(f"Published {name} to {self.config.INFERENCE_MODEL_PATH}")
+
+        save_manifest(str(self.versions_dir), manifest)
+
+        report.update({
+            'status': 'accepted',
+            'name': name,
+            'content_hash': content_hash,
+            'published': publish,
+            'seconds': time.perf_counter() - start
+        })
+        return report
@@ -0,0 +1,179 @@
+"""
+Inference Artifact
+Single-file, weights-only translator export for fast server startup
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+
+from ml_pipeline.utils.vocab import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "isl-translator-inference"
+ARTIFACT_VERSION = 1
+
+STORAGE_DTYPES = {
+    "fp32": torch.float32,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16
+}
+
+# Architecture fields copied from ModelConfig into the artifact
+CONFIG_FIELDS = ["ARCHITECTURE", "EMBED_DIM", "HIDDEN_DIM", "NUM_LAYERS", "DROPOUT", "MAX_LENGTH"]
+
+
+def _extract_state_dict(checkpoint) -> Dict[str, torch.Tensor]:
+    """Get model weights from a training checkpoint or a bare state dict"""
+    if isinstance(checkpoint, dict):
+        if 'model_state_dict' in checkpoint:
+            return checkpoint['model_state_dict']
+        if 'state_dict' in checkpoint:
+            return checkpoint['state_dict']
+    return checkpoint
+
+
+def compute_content_hash(state_dict: Dict[str, torch.Tensor], src_tokens, tgt_tokens,
+                         config: Dict) -> str:
+    """
+    SHA-256 over weights (name, dtype, shape, bytes), vocabularies and config
+    """
+    digest = hashlib.sha256()
+    for name in sorted(state_dict):
+        tensor = state_dict[name].detach().cpu().contiguous()
+        digest.update(name.encode('utf-8'))
+        digest.update(str(tensor.dtype).encode('utf-8'))
+        digest.update(str(tuple(tensor.shape)).encode('utf-8'))
+        digest.update(tensor.reshape(-1).view(torch.uint8).numpy().tobytes() if tensor.numel() else b'')
+    digest.update(json.dumps([src_tokens, tgt_tokens, config], sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def export_inference_artifact(checkpoint_path: str, src_vocab_path: str, tgt_vocab_path: str,
+                              output_path: str, config, dtype: str = "fp32") -> str:
+    """
+    Export a training checkpoint to a single inference artifact
+
+    The artifact holds only model weights (optionally stored as fp16/bf16),
+    both vocabularies as index-ordered token lists, the architecture config
+    and a content hash. Optimizer state and loss histories are dropped. It
+    is written with torch.save's zip format so it can be mmap-loaded.
+
+    Args:
+        checkpoint_path: Training checkpoint (.pth) from TranslationTrainer
+        src_vocab_path: Source vocabulary JSON
+        tgt_vocab_path: Target vocabulary JSON
+        output_path: Where to write the artifact
+        config: ModelConfig (architecture fields are copied)
+        dtype: Storage dtype for floating-point weights: fp32, fp16 or bf16
+
+    Returns:
+        Content hash of the artifact
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}', expected one of {list(STORAGE_DTYPES)}")
+
+    checkpoint = torch.load(checkpoint_path, map_location="cpu")
+    state_dict = _extract_state_dict(checkpoint)
+
+    storage_dtype = STORAGE_DTYPES[dtype]
+    weights = {
+        name: (tensor.to(storage_dtype) if tensor.is_floating_point() else tensor).contiguous()
+        for name, tensor in state_dict.items()
+    }
+
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.load(src_vocab_path)
+    tgt_vocab.load(tgt_vocab_path)
+    src_tokens = src_vocab.to_list()
+    tgt_tokens = tgt_vocab.to_list()
+
+    model_config = {field.lower(): getattr(config, field) for field in CONFIG_FIELDS}
+    model_config['src_vocab_size'] = len(src_tokens)
+    model_config['tgt_vocab_size'] = len(tgt_tokens)
+
+    content_hash = compute_content_hash(weights, src_tokens, tgt_tokens, model_config)
+
+    artifact = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'storage_dtype': dtype,
+        'config': model_config,
+        'src_vocab': src_tokens,
+        'tgt_vocab': tgt_tokens,
+        'content_hash': content_hash,
+        'state_dict': weights
+    }
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+    torch.save(artifact, str(tmp_path))
+    tmp_path.replace(output_path)
+
+    logger.info(f"Exported inference artifact to {output_path} ({dtype}, hash {content_hash[:12]})")
+    return content_hash
+
+
+def stale_artifact_reason(artifact_path: str, source_paths: List[str]) -> Optional[str]:
+    """
+    Why an artifact no longer matches its sources, or None if it is current
+
+    Trainers rewrite the checkpoint and vocabularies without re-exporting,
+    so an artifact older than any of them was exported from a previous
+    model. Only file times are compared, so the check costs a few stat calls.
+
+    Args:
+        artifact_path: Inference artifact
+        source_paths: Checkpoint and vocabulary files it was exported from
+    """
+    artifact_mtime = os.path.getmtime(artifact_path)
+    for source in source_paths:
+        if os.path.exists(source) and os.path.getmtime(source) > artifact_mtime:
+            return f"{os.path.basename(source)} is newer than the artifact"
+    return None
+
+
+def load_inference_artifact(path: str, verify_hash: bool = False) -> Dict:
+    """
+    Load an inference artifact, memory-mapping the weights when supported
+
+    Args:
+        path: Artifact path
+        verify_hash: Recompute the content hash and compare (reads every weight)
+
+    Returns:
+        Artifact dictionary (see export_inference_artifact)
+    """
+    try:
+        artifact = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    except TypeError:
+        # torch < 2.1 has no mmap/weights_only arguments
+        artifact = torch.load(path, map_location="cpu")
+
+    if not isinstance(artifact, dict) or artifact.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a translator inference artifact")
+    if artifact.get('version', 0) > ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported inference artifact version {artifact['version']}")
+
+    if verify_hash:
+        expected = artifact['content_hash']
+        actual = compute_content_hash(
+            artifact['state_dict'], artifact['src_vocab'], artifact['tgt_vocab'], artifact['config']
+        )
+        if actual != expected:
+            raise ValueError(f"Inference artifact hash mismatch: expected {expected}, got {actual}")
+
+    return artifact
+
+
+def artifact_vocabularies(artifact: Dict):
+    """Build (src_vocab, tgt_vocab) from an artifact"""
+    return Vocabulary.from_list(artifact['src_vocab']), Vocabulary.from_list(artifact['tgt_vocab'])
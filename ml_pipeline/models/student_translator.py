@@ -0,0 +1,224 @@
+"""
+GRU Student Translation Model
+Small single-layer GRU Seq2Seq distilled from the LSTM translator
+"""
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.nn.utils.rnn import pack_padded_sequence
+import logging
+
+from ml_pipeline.models.translator import source_lengths, scheduled_sampling_spans
+
+logger = logging.getLogger(__name__)
+
+
+class StudentEncoder(nn.Module):
+    """Unidirectional GRU encoder"""
+    
+    def __init__(self, vocab_size: int, embed_dim: int, hidden_dim: int,
+                 num_layers: int = 1, dropout: float = 0.1):
+        super(StudentEncoder, self).__init__()
+        
+        self.embedding = nn.Embedding(vocab_size, embed_dim, padding_idx=0)
+        self.gru = nn.GRU(
+            embed_dim,
+            hidden_dim,
+            num_layers,
+            batch_first=True,
+            dropout=dropout if num_layers > 1 else 0
+        )
+    
+    def forward(self, x, lengths=None):
+        """
+        Forward pass
+        
+        Args:
+            x: Input tensor (batch_size, seq_len)
+            lengths: Unpadded sequence lengths (derived from padding if omitted)
+            
+        Returns:
+            hidden: Hidden state (num_layers, batch_size, hidden_dim)
+        """
+        embedded = self.embedding(x)
+        packed = pack_padded_sequence(
+            embedded, source_lengths(x, lengths), batch_first=True, enforce_sorted=False
+        )
+        _, hidden = self.gru(packed)
+        return hidden
+
+
+class StudentDecoder(nn.Module):
+    """GRU decoder for ISL generation"""
+    
+    def __init__(self, vocab_size: int, embed_dim: int, hidden_dim: int,
+                 num_layers: int = 1, dropout: float = 0.1):
+        super(StudentDecoder, self).__init__()
+        
+        self.embedding = nn.Embedding(vocab_size, embed_dim, padding_idx=0)
+        self.gru = nn.GRU(
+            embed_dim,
+            hidden_dim,
+            num_layers,
+            batch_first=True,
+            dropout=dropout if num_layers > 1 else 0
+        )
+        self.fc_out = nn.Linear(hidden_dim, vocab_size)
+        self.dropout = nn.Dropout(dropout)
+    
+    def forward(self, x, hidden):
+        """
+        Forward pass
+        
+        Args:
+            x: Input tensor (batch_size, 1)
+            hidden: Hidden state (num_layers, batch_size, hidden_dim)
+            
+        Returns:
+            output: Output logits (batch_size, vocab_size)
+            hidden: Updated hidden state
+        """
+        output, hidden = self.forward_sequence(x, hidden)
+        return output.squeeze(1), hidden
+    
+    def forward_sequence(self, x, hidden):
+        """
+        Decode several known input tokens in one GRU call (teacher forcing)
+        
+        Args:
+            x: Input tensor (batch_size, steps)
+            hidden: Hidden state (num_layers, batch_size, hidden_dim)
+            
+        Returns:
+            output: Output logits (batch_size, steps, vocab_size)
+            hidden: Updated hidden state
+        """
+        embedded = self.dropout(self.embedding(x))
+        gru_out, hidden = self.gru(embedded, hidden)
+        output = self.fc_out(gru_out)
+        return output, hidden
+
+
+class StudentTranslator(nn.Module):
+    """
+    Drop-in replacement for Seq2SeqTranslator with the same forward/translate
+    interface, sized for the short (2-6 token) gloss sequences in our data
+    """
+    
+    def __init__(self, src_vocab_size: int, tgt_vocab_size: int,
+                 embed_dim: int = 64, hidden_dim: int = 128,
+                 num_layers: int = 1, dropout: float = 0.1):
+        super(StudentTranslator, self).__init__()
+        
+        self.encoder = StudentEncoder(src_vocab_size, embed_dim, hidden_dim, num_layers, dropout)
+        self.decoder = StudentDecoder(tgt_vocab_size, embed_dim, hidden_dim, num_layers, dropout)
+        
+        self.hidden_dim = hidden_dim
+        self.num_layers = num_layers
+    
+    def forward(self, src, tgt, teacher_forcing_ratio: float = 0.5, src_lengths=None,
+                sampling_chunk: int = 0):
+        """
+        Forward pass
+        
+        Args:
+            src: Source sequence (batch_size, src_len)
+            tgt: Target sequence (batch_size, tgt_len)
+            teacher_forcing_ratio: Probability of using teacher forcing
+            src_lengths: Unpadded source lengths (derived from padding if omitted)
+            sampling_chunk: Target positions per teacher-forcing decision
+                            (0 = one decision per sequence)
+            
+        Returns:
+            outputs: Output logits (batch_size, tgt_len, tgt_vocab_size); position 0 is zero
+        """
+        hidden = self.encoder(src, src_lengths)
+        
+        chunks = []
+        spans = scheduled_sampling_spans(tgt.size(1), teacher_forcing_ratio, sampling_chunk, self.training)
+        for start, end, teacher_forced in spans:
+            if teacher_forced:
+                output, hidden = self.decoder.forward_sequence(tgt[:, start - 1:end - 1], hidden)
+                chunks.append(output)
+                continue
+            
+            if chunks:
+                decoder_input = chunks[-1][:, -1].argmax(dim=1, keepdim=True)
+            else:
+                decoder_input = tgt[:, :1]
+            for _ in range(start, end):
+                output, hidden = self.decoder(decoder_input, hidden)
+                chunks.append(output.unsqueeze(1))
+                decoder_input = output.argmax(dim=1, keepdim=True)
+        
+        if not chunks:
+            return torch.zeros(tgt.size(0), tgt.size(1), self.decoder.fc_out.out_features, device=src.device)
+        
+        return F.pad(torch.cat(chunks, dim=1), (0, 0, 1, 0))
+    
+    def translate(self, src, max_length: int = 100, sos_idx: int = 2, eos_idx: int = 3,
+                  src_lengths=None):
+        """
+        Translate source sequence to target
+        
+        Args:
+            src: Source sequence (1, src_len)
+            max_length: Maximum output length
+            sos_idx: Start-of-sequence token index
+            eos_idx: End-of-sequence token index
+            src_lengths: Unpadded source length (derived from padding if omitted)
+            
+        Returns:
+            Translated sequence (list of indices)
+        """
+        self.eval()
+        with torch.no_grad():
+            hidden = self.encoder(src, src_lengths)
+            decoder_input = torch.tensor([[sos_idx]], device=src.device)
+            output_seq = []
+            
+            for _ in range(max_length):
+                output, hidden = self.decoder(decoder_input, hidden)
+                predicted_idx = output.argmax(dim=1).item()
+                output_seq.append(predicted_idx)
+                
+                if predicted_idx == eos_idx:
+                    break
+                
+                decoder_input = torch.tensor([[predicted_idx]], device=src.device)
+            
+            return output_seq
+    
+    def translate_batch(self, src, max_length: int = 100, sos_idx: int = 2, eos_idx: int = 3,
+                        src_lengths=None):
+        """
+        Greedy-translate a padded batch of source sequences
+        
+        Returns:
+            List of translated sequences (lists of indices, each ending at <eos> if produced)
+        """
+        self.eval()
+        with torch.no_grad():
+            hidden = self.encoder(src, src_lengths)
+            
+            batch_size = src.size(0)
+            decoder_input = torch.full((batch_size, 1), sos_idx, dtype=torch.long, device=src.device)
+            finished = torch.zeros(batch_size, dtype=torch.bool, device=src.device)
+            steps = []
+            
+            for _ in range(max_length):
+                output, hidden = self.decoder(decoder_input, hidden)
+                predicted = output.argmax(dim=1)
+                steps.append(predicted)
+                finished |= predicted == eos_idx
+                if finished.all():
+                    break
+                decoder_input = predicted.unsqueeze(1)
+            
+            output_seqs = []
+            for row in torch.stack(steps, dim=1).tolist():
+                if eos_idx in row:
+                    row = row[:row.index(eos_idx) + 1]
+                output_seqs.append(row)
+            return output_seqs
@@ -0,0 +1,84 @@
+"""
+Training Log
+Per-step timing breakdown and throughput records written as JSON lines next to the checkpoint
+"""
+
+import sys
+import json
+import time
+import logging
+from typing import Dict, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Not available on Windows
+    RESOURCE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Phases timed for every training step
+STEP_PHASES = ["data", "forward", "backward", "clip", "optimizer"]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class TrainingLog:
+    """
+    Append-only JSON lines log of step and epoch records
+
+    Every record carries the run_id (start time of the training run), so
+    several runs appended to the same file can be told apart and compared.
+    """
+
+    def __init__(self, path: str, run_info: Optional[Dict] = None):
+        """
+        Args:
+            path: JSON lines file, created or appended to
+            run_info: Settings stored in the run's header record
+        """
+        self.path = path
+        now = time.time()
+        self.run_id = time.strftime('%Y%m%dT%H%M%S', time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+        self._file = open(path, 'a', encoding='utf-8')
+        self.write({'type': 'run', **(run_info or {})})
+
+    def write(self, record: Dict):
+        """Append one record"""
+        self._file.write(json.dumps({'run_id': self.run_id, **record}) + '\n')
+
+    def flush(self):
+        """Flush buffered records to disk (called once per epoch)"""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the log file"""
+        if not self._file.closed:
+            self._file.close()
+
+
+def summarize_phases(steps, elapsed: float) -> Dict:
+    """
+    Epoch totals of per-step phase timings
+
+    Args:
+        steps: Step records with seconds for each phase in STEP_PHASES
+        elapsed: Wall time of the epoch in seconds
+
+    Returns:
+        Dictionary with total seconds and share of the epoch for each phase
+    """
+    phase_seconds = {phase: sum(step[phase] for step in steps) for phase in STEP_PHASES}
+    return {
+        'phase_seconds': phase_seconds,
+        'phase_share': {phase: seconds / elapsed if elapsed > 0 else 0.0
+                        for phase, seconds in phase_seconds.items()}
+    }
@@ -5,13 +5,22 @@ Training script for LSTM Seq2Seq translation model
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import torch.distributed as dist
+from torch.nn.parallel import DistributedDataParallel
 from torch.utils.data import DataLoader
 import logging
 from tqdm import tqdm
 import os
+import time
+from contextlib import nullcontext
 from pathlib import Path
 
+from ml_pipeline.datasets.bucketing import loader_num_batches
 from ml_pipeline.models.translator import Seq2SeqTranslator
+from ml_pipeline.models.training_log import TrainingLog, peak_rss_mb, summarize_phases
+from ml_pipeline.models.checkpointing import (
+    AsyncCheckpointWriter, atomic_save, capture_rng_state, restore_rng_state, snapshot_state
+)
 from ml_pipeline.config import ModelConfig, TRAINING_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -26,6 +35,14 @@ class TranslationTrainer:
         self.device = torch.device(config.DEVICE if torch.cuda.is_available() else "cpu")
         self.model.to(self.device)
         
+        # Data-parallel training when a process group is initialized
+        # (see scripts/train_distributed.py); self.model stays unwrapped for saving
+        self.distributed = dist.is_available() and dist.is_initialized()
+        self.rank = dist.get_rank() if self.distributed else 0
+        self.world_size = dist.get_world_size() if self.distributed else 1
+        self.is_main_process = self.rank == 0
+        self.eager_model = DistributedDataParallel(self.model) if self.distributed else self.model
+        
         # Loss and optimizer
         self.criterion = nn.CrossEntropyLoss(ignore_index=0)  # Ignore padding
         self.optimizer = optim.Adam(model.parameters(), lr=config.LEARNING_RATE)
@@ -38,40 +55,215 @@ class TranslationTrainer:
         self.val_losses = []
         self.best_val_loss = float('inf')
         self.patience_counter = 0
+        self.throughput = []
+        
+        # Speed options (each falls back to fp32 / eager / per-batch steps)
+        self.accum_steps = max(1, int(config.GRAD_ACCUM_STEPS))
+        self.autocast_dtype = self._resolve_autocast_dtype(config.MIXED_PRECISION)
+        self.forward_model = self._compile_model() if config.COMPILE_MODEL else self.eager_model
+        
+        # Checkpoints are serialized off the training thread
+        self.checkpoint_writer = AsyncCheckpointWriter() if config.ASYNC_CHECKPOINTS else None
+        self.last_checkpoint_path = config.MODEL_SAVE_PATH.replace('.pth', '_last.pth')
+        
+        # Step timing log next to the checkpoint, opened on the first epoch
+        self.training_log_path = config.MODEL_SAVE_PATH.replace('.pth', '_train_log.jsonl')
+        self.training_log = None
+    
+    def _resolve_autocast_dtype(self, precision):
+        """Return the autocast dtype for the requested precision, or None for fp32"""
+        if precision in (None, "fp32"):
+            return None
+        if precision != "bf16":
+            logger.warning(f"Unknown MIXED_PRECISION '{precision}', training in fp32")
+            return None
+        
+        try:
+            with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16):
+                probe = torch.mm(torch.ones(2, 2, device=self.device), torch.ones(2, 2, device=self.device))
+            if probe.dtype != torch.bfloat16:
+                raise RuntimeError(f"autocast produced {probe.dtype}")
+        except Exception as e:
+            logger.warning(f"bf16 autocast unavailable on {self.device.type} ({e}), training in fp32")
+            return None
+        
+        logger.info(f"Using bf16 autocast on {self.device.type}")
+        return torch.bfloat16
+    
+    def _compile_model(self):
+        """Compile the model with torch.compile, or return the eager model"""
+        if not hasattr(torch, "compile"):
+            logger.warning("torch.compile not available in this PyTorch version, using eager mode")
+            return self.eager_model
+        try:
+            compiled = torch.compile(self.eager_model)
+        except Exception as e:
+            logger.warning(f"torch.compile failed ({e}), using eager mode")
+            return self.eager_model
+        logger.info("Using torch.compile")
+        return compiled
+    
+    def _forward(self, src, tgt):
+        """Training forward pass with autocast and a one-time eager fallback for compile errors"""
+        autocast = (torch.autocast(device_type=self.device.type, dtype=self.autocast_dtype)
+                    if self.autocast_dtype is not None else nullcontext())
+        kwargs = {
+            'teacher_forcing_ratio': self.config.TEACHER_FORCING_RATIO,
+            'sampling_chunk': self.config.SCHEDULED_SAMPLING_CHUNK
+        }
+        with autocast:
+            try:
+                return self.forward_model(src, tgt, **kwargs)
+            except Exception as e:
+                # Compilation errors surface on the first call, not in torch.compile()
+                if self.forward_model is self.eager_model:
+                    raise
+                logger.warning(f"Compiled model failed ({e}), falling back to eager mode")
+                self.forward_model = self.eager_model
+                return self.eager_model(src, tgt, **kwargs)
+    
+    def _lap(self, timings: dict, phase: str, mark: float) -> float:
+        """Record seconds since mark under phase and return the new mark"""
+        if self.device.type == 'cuda':
+            torch.cuda.synchronize()
+        now = time.perf_counter()
+        timings[phase] = now - mark
+        return now
+    
+    def _open_training_log(self):
+        """Start a run in the JSON lines training log (rank 0 only)"""
+        if self.training_log is not None or not self.config.LOG_STEP_TIMINGS or not self.is_main_process:
+            return
+        self.training_log = TrainingLog(self.training_log_path, {
+            'architecture': self.config.ARCHITECTURE,
+            'embed_dim': self.config.EMBED_DIM,
+            'hidden_dim': self.config.HIDDEN_DIM,
+            'num_layers': self.config.NUM_LAYERS,
+            'batch_size': self.config.BATCH_SIZE,
+            'precision': 'bf16' if self.autocast_dtype is not None else 'fp32',
+            'compiled': self.forward_model is not self.eager_model,
+            'accum_steps': self.accum_steps,
+            'world_size': self.world_size,
+            'torch_threads': torch.get_num_threads(),
+            'torch_version': torch.__version__
+        })
+        logger.info(f"Logging step timings to {self.training_log_path}")
     
     def train_epoch(self, train_loader: DataLoader, epoch: int):
-        """Train for one epoch"""
+        """
+        Train for one epoch
+        
+        Each step is timed by phase (data loading, forward + loss, backward,
+        gradient clipping, optimizer step). Step and epoch records go to the
+        JSON lines training log when LOG_STEP_TIMINGS is enabled.
+        """
         self.model.train()
         total_loss = 0
         
-        pbar = tqdm(train_loader, desc=f"Epoch {epoch}")
+        total_tokens = 0
+        num_batches = loader_num_batches(train_loader)
+        # Epoch-seeded shuffling, so a resumed run sees the same batch order
+        for sampler in (train_loader.sampler, train_loader.batch_sampler, train_loader.dataset):
+            if hasattr(sampler, 'set_epoch'):
+                sampler.set_epoch(epoch)
+        self._open_training_log()
+        self.optimizer.zero_grad()
+        steps = []
+        start = time.perf_counter()
+        mark = start
+        
+        pbar = tqdm(train_loader, desc=f"Epoch {epoch}", disable=not self.is_main_process)
         for batch_idx, (src, tgt) in enumerate(pbar):
             src = src.to(self.device)
             tgt = tgt.to(self.device)
+            timings = {}
+            mark = self._lap(timings, 'data', mark)
+            step = (batch_idx + 1) % self.accum_steps == 0 or batch_idx + 1 == num_batches
             
-            # Forward pass
-            self.optimizer.zero_grad()
-            outputs = self.model(src, tgt, teacher_forcing_ratio=0.5)
-            
-            # Reshape for loss calculation
-            outputs = outputs[:, 1:].reshape(-1, outputs.size(-1))
-            tgt = tgt[:, 1:].reshape(-1)
-            
-            # Calculate loss
-            loss = self.criterion(outputs, tgt)
-            
-            # Backward pass
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.config.GRAD_CLIP)
-            self.optimizer.step()
+            # Skip the gradient all-reduce on accumulation-only batches
+            sync = self.eager_model.no_sync() if self.distributed and not step else nullcontext()
+            with sync:
+                # Forward pass
+                outputs = self._forward(src, tgt)
+                
+                # Reshape for loss calculation
+                outputs = outputs[:, 1:].reshape(-1, outputs.size(-1))
+                tgt = tgt[:, 1:].reshape(-1)
+                
+                # Calculate loss (in fp32 when the forward pass ran in bf16)
+                loss = self.criterion(outputs.float(), tgt)
+                mark = self._lap(timings, 'forward', mark)
+                
+                # Backward pass, stepping every accum_steps batches
+                (loss / self.accum_steps).backward()
+                mark = self._lap(timings, 'backward', mark)
+            if step:
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.config.GRAD_CLIP)
+                mark = self._lap(timings, 'clip', mark)
+                self.optimizer.step()
+                self.optimizer.zero_grad()
+                mark = self._lap(timings, 'optimizer', mark)
+            else:
+                timings.update(clip=0.0, optimizer=0.0)
             
-            total_loss += loss.item()
+            loss_value = loss.item()
+            total_loss += loss_value
+            tgt_tokens = int((tgt != 0).sum())
+            total_tokens += tgt_tokens
+            steps.append({
+                'type': 'step',
+                'epoch': epoch,
+                'step': batch_idx,
+                **timings,
+                'src_tokens': int((src != 0).sum()),
+                'tgt_tokens': tgt_tokens,
+                'loss': loss_value
+            })
+            if self.training_log is not None:
+                self.training_log.write(steps[-1])
             
             # Update progress bar
             if batch_idx % TRAINING_CONFIG["log_interval"] == 0:
-                pbar.set_postfix({'loss': loss.item()})
+                pbar.set_postfix({'loss': loss_value})
+            
+            # Data time for the next step starts here
+            mark = time.perf_counter()
+        
+        elapsed = time.perf_counter() - start
+        loss_batches = num_batches
+        if self.distributed:
+            # Global loss and token counts across all ranks
+            totals = torch.tensor([total_loss, num_batches, total_tokens], dtype=torch.float64)
+            dist.all_reduce(totals)
+            total_loss, loss_batches, total_tokens = totals.tolist()
+        
+        stats = {
+            'epoch': epoch,
+            'precision': 'bf16' if self.autocast_dtype is not None else 'fp32',
+            'compiled': self.forward_model is not self.eager_model,
+            'accum_steps': self.accum_steps,
+            'world_size': self.world_size,
+            'seconds': elapsed,
+            'step_seconds': elapsed / max(num_batches, 1),
+            'tokens_per_sec': total_tokens / elapsed if elapsed > 0 else 0.0,
+            **summarize_phases(steps, elapsed),
+            'peak_rss_mb': peak_rss_mb()
+        }
+        self.throughput.append(stats)
+        if self.training_log is not None:
+            self.training_log.write({'type': 'epoch', **stats})
+            self.training_log.flush()
         
-        avg_loss = total_loss / len(train_loader)
+        breakdown = ", ".join(f"{phase} {share:.0%}" for phase, share in stats['phase_share'].items())
+        rss = f", peak RSS {stats['peak_rss_mb']:.0f} MB" if stats['peak_rss_mb'] is not None else ""
+        logger.info(
+            f"Epoch {epoch}: {stats['step_seconds'] * 1000:.1f} ms/batch, "
+            f"{stats['tokens_per_sec']:.0f} tokens/s ({stats['precision']}, "
+            f"{'compiled' if stats['compiled'] else 'eager'}, accum={self.accum_steps}, "
+            f"processes={self.world_size}); {breakdown}{rss}"
+        )
+        
+        avg_loss = total_loss / max(loss_batches, 1)
         self.train_losses.append(avg_loss)
         return avg_loss
     
@@ -94,66 +286,131 @@ class TranslationTrainer:
                 total_loss += loss.item()
         
         avg_loss = total_loss / len(val_loader)
+        if self.distributed:
+            # Use rank 0's value so scheduler and early-stopping decisions agree exactly
+            value = torch.tensor([avg_loss], dtype=torch.float64)
+            dist.broadcast(value, src=0)
+            avg_loss = value.item()
         self.val_losses.append(avg_loss)
         return avg_loss
     
     def save_checkpoint(self, filepath: str, epoch: int, loss: float):
-        """Save model checkpoint"""
-        checkpoint = {
+        """
+        Save a resumable checkpoint
+        
+        State is snapshotted on the calling thread; serialization happens on
+        the background writer when ASYNC_CHECKPOINTS is enabled.
+        """
+        checkpoint = snapshot_state({
             'epoch': epoch,
             'model_state_dict': self.model.state_dict(),
             'optimizer_state_dict': self.optimizer.state_dict(),
+            'scheduler_state_dict': self.scheduler.state_dict(),
             'loss': loss,
             'train_losses': self.train_losses,
-            'val_losses': self.val_losses
-        }
-        torch.save(checkpoint, filepath)
-        logger.info(f"Saved checkpoint to {filepath}")
+            'val_losses': self.val_losses,
+            'best_val_loss': self.best_val_loss,
+            'patience_counter': self.patience_counter,
+            'throughput': self.throughput,
+            'rng_state': capture_rng_state()
+        })
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.submit(checkpoint, filepath)
+        else:
+            atomic_save(checkpoint, filepath)
+            logger.info(f"Saved checkpoint to {filepath}")
+    
+    def wait_for_checkpoints(self):
+        """Block until queued checkpoint writes are on disk"""
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.wait()
     
     def load_checkpoint(self, filepath: str):
-        """Load model checkpoint"""
+        """
+        Load model checkpoint, restoring full training state when present
+        
+        Returns:
+            Epoch the checkpoint was saved at
+        """
         checkpoint = torch.load(filepath, map_location=self.device)
         self.model.load_state_dict(checkpoint['model_state_dict'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
         self.train_losses = checkpoint.get('train_losses', [])
         self.val_losses = checkpoint.get('val_losses', [])
+        
+        # Older checkpoints only carry model/optimizer state
+        if 'scheduler_state_dict' in checkpoint:
+            self.scheduler.load_state_dict(checkpoint['scheduler_state_dict'])
+        self.best_val_loss = checkpoint.get('best_val_loss', min(self.val_losses, default=float('inf')))
+        self.patience_counter = checkpoint.get('patience_counter', 0)
+        self.throughput = checkpoint.get('throughput', [])
+        if 'rng_state' in checkpoint:
+            restore_rng_state(checkpoint['rng_state'])
+        
         logger.info(f"Loaded checkpoint from {filepath}")
         return checkpoint['epoch']
     
-    def train(self, train_loader: DataLoader, val_loader: DataLoader):
-        """Full training loop"""
+    def train(self, train_loader: DataLoader, val_loader: DataLoader, resume_from: str = None):
+        """
+        Full training loop
+        
+        Args:
+            train_loader: Training batches
+            val_loader: Validation batches
+            resume_from: Checkpoint to continue from (e.g. self.last_checkpoint_path)
+        """
+        start_epoch = 1
+        if resume_from:
+            start_epoch = self.load_checkpoint(resume_from) + 1
+            logger.info(f"Resuming training at epoch {start_epoch}")
+            if self.patience_counter >= TRAINING_CONFIG["early_stopping_patience"]:
+                logger.info("Checkpoint had already stopped early, nothing to resume")
+                return
+        
         logger.info("Starting training...")
         
-        for epoch in range(1, self.config.NUM_EPOCHS + 1):
-            # Train
-            train_loss = self.train_epoch(train_loader, epoch)
-            
-            # Validate
-            if epoch % TRAINING_CONFIG["eval_interval"] == 0:
-                val_loss = self.validate(val_loader)
-                logger.info(f"Epoch {epoch}: Train Loss: {train_loss:.4f}, Val Loss: {val_loss:.4f}")
+        try:
+            for epoch in range(start_epoch, self.config.NUM_EPOCHS + 1):
+                # Train
+                train_loss = self.train_epoch(train_loader, epoch)
                 
-                # Learning rate scheduling
-                self.scheduler.step(val_loss)
+                # Validate
+                stop = False
+                if epoch % TRAINING_CONFIG["eval_interval"] == 0:
+                    val_loss = self.validate(val_loader)
+                    logger.info(f"Epoch {epoch}: Train Loss: {train_loss:.4f}, Val Loss: {val_loss:.4f}")
+                    
+                    # Learning rate scheduling
+                    self.scheduler.step(val_loss)
+                    
+                    # Save best model
+                    if val_loss < self.best_val_loss:
+                        self.best_val_loss = val_loss
+                        self.patience_counter = 0
+                        if TRAINING_CONFIG["save_best_model"] and self.is_main_process:
+                            self.save_checkpoint(self.config.MODEL_SAVE_PATH, epoch, val_loss)
+                    else:
+                        self.patience_counter += 1
+                    
+                    stop = self.patience_counter >= TRAINING_CONFIG["early_stopping_patience"]
                 
-                # Save best model
-                if val_loss < self.best_val_loss:
-                    self.best_val_loss = val_loss
-                    self.patience_counter = 0
-                    if TRAINING_CONFIG["save_best_model"]:
-                        self.save_checkpoint(self.config.MODEL_SAVE_PATH, epoch, val_loss)
-                else:
-                    self.patience_counter += 1
+                if self.is_main_process:
+                    # Save checkpoint
+                    if epoch % TRAINING_CONFIG["checkpoint_interval"] == 0:
+                        checkpoint_path = self.config.MODEL_SAVE_PATH.replace('.pth', f'_epoch_{epoch}.pth')
+                        self.save_checkpoint(checkpoint_path, epoch, train_loss)
+                    
+                    # Latest state, for resuming a killed job
+                    self.save_checkpoint(self.last_checkpoint_path, epoch, train_loss)
                 
                 # Early stopping
-                if self.patience_counter >= TRAINING_CONFIG["early_stopping_patience"]:
+                if stop:
                     logger.info(f"Early stopping at epoch {epoch}")
                     break
-            
-            # Save checkpoint
-            if epoch % TRAINING_CONFIG["checkpoint_interval"] == 0:
-                checkpoint_path = self.config.MODEL_SAVE_PATH.replace('.pth', f'_epoch_{epoch}.pth')
-                self.save_checkpoint(checkpoint_path, epoch, train_loss)
+        finally:
+            self.wait_for_checkpoints()
+            if self.training_log is not None:
+                self.training_log.close()
+                self.training_log = None
         
         logger.info("Training completed!")
-
@@ -6,11 +6,55 @@ Lightweight model for English-to-ISL translation
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.nn.utils.rnn import pack_padded_sequence
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def source_lengths(src, lengths=None, pad_idx: int = 0):
+    """
+    Sequence lengths for pack_padded_sequence (CPU int64, at least 1)
+    
+    Args:
+        src: Source tensor (batch_size, seq_len)
+        lengths: Optional explicit lengths; otherwise counts non-padding tokens
+    """
+    if lengths is None:
+        lengths = (src != pad_idx).sum(dim=1)
+    return torch.as_tensor(lengths).to("cpu", torch.int64).clamp(min=1)
+
+
+def scheduled_sampling_spans(tgt_len: int, teacher_forcing_ratio: float,
+                             chunk_size: int = 0, training: bool = True):
+    """
+    Split decoder positions 1..tgt_len-1 into teacher-forced and free-running spans
+    
+    One teacher-forcing decision is drawn per chunk instead of per token, and
+    adjacent chunks with the same decision are merged so each teacher-forced
+    span can be decoded in a single RNN call.
+    
+    Args:
+        tgt_len: Target sequence length including <sos>
+        teacher_forcing_ratio: Probability that a chunk is teacher-forced
+        chunk_size: Positions per decision; 0 decides once for the whole sequence
+        training: Teacher forcing is only used in training mode
+        
+    Returns:
+        List of (start, end, teacher_forced) spans
+    """
+    step = chunk_size if chunk_size > 0 else max(tgt_len - 1, 1)
+    spans = []
+    for start in range(1, tgt_len, step):
+        end = min(start + step, tgt_len)
+        teacher_forced = training and torch.rand(1).item() < teacher_forcing_ratio
+        if spans and spans[-1][2] == teacher_forced:
+            spans[-1] = (spans[-1][0], end, teacher_forced)
+        else:
+            spans.append((start, end, teacher_forced))
+    return spans
+
+
 class Encoder(nn.Module):
     """LSTM Encoder for English sentences"""
     
@@ -37,12 +81,14 @@ class Encoder(nn.Module):
         # Projection layer for bidirectional LSTM
         self.projection = nn.Linear(hidden_dim * 2, hidden_dim)
     
-    def forward(self, x):
+    def forward(self, x, lengths=None):
         """
         Forward pass
         
         Args:
             x: Input tensor (batch_size, seq_len)
+            lengths: Unpadded length of each sequence (batch_size,). Derived
+                     from the padding index when omitted.
             
         Returns:
             hidden: Hidden state (num_layers, batch_size, hidden_dim)
@@ -51,8 +97,12 @@ class Encoder(nn.Module):
         # Embedding
         embedded = self.embedding(x)  # (batch_size, seq_len, embed_dim)
         
-        # LSTM
-        lstm_out, (hidden, cell) = self.lstm(embedded)
+        # Packed LSTM: skips padded positions, so the backward direction's
+        # final state comes from the first real token, not from padding
+        packed = pack_padded_sequence(
+            embedded, source_lengths(x, lengths), batch_first=True, enforce_sorted=False
+        )
+        _, (hidden, cell) = self.lstm(packed)
         
         # Combine bidirectional hidden states
         # hidden: (num_layers * 2, batch_size, hidden_dim)
@@ -109,15 +159,32 @@ class Decoder(nn.Module):
             hidden: Updated hidden state
             cell: Updated cell state
         """
+        output, hidden, cell = self.forward_sequence(x, hidden, cell)
+        return output.squeeze(1), hidden, cell
+    
+    def forward_sequence(self, x, hidden, cell):
+        """
+        Decode several known input tokens in one LSTM call (teacher forcing)
+        
+        Args:
+            x: Input tensor (batch_size, steps)
+            hidden: Hidden state (num_layers, batch_size, hidden_dim)
+            cell: Cell state (num_layers, batch_size, hidden_dim)
+            
+        Returns:
+            output: Output logits (batch_size, steps, vocab_size)
+            hidden: Updated hidden state
+            cell: Updated cell state
+        """
         # Embedding
-        embedded = self.embedding(x)  # (batch_size, 1, embed_dim)
+        embedded = self.embedding(x)  # (batch_size, steps, embed_dim)
         embedded = self.dropout(embedded)
         
         # LSTM
         lstm_out, (hidden, cell) = self.lstm(embedded, (hidden, cell))
         
         # Output projection
-        output = self.fc_out(lstm_out.squeeze(1))  # (batch_size, vocab_size)
+        output = self.fc_out(lstm_out)  # (batch_size, steps, vocab_size)
         
         return output, hidden, cell
 
@@ -136,46 +203,56 @@ class Seq2SeqTranslator(nn.Module):
         self.hidden_dim = hidden_dim
         self.num_layers = num_layers
     
-    def forward(self, src, tgt, teacher_forcing_ratio: float = 0.5):
+    def forward(self, src, tgt, teacher_forcing_ratio: float = 0.5, src_lengths=None,
+                sampling_chunk: int = 0):
         """
         Forward pass
         
+        Teacher-forced spans run the decoder over all their gold inputs in one
+        LSTM call; free-running spans are decoded token by token from the
+        model's own predictions.
+        
         Args:
             src: Source sequence (batch_size, src_len)
             tgt: Target sequence (batch_size, tgt_len)
             teacher_forcing_ratio: Probability of using teacher forcing
+            src_lengths: Unpadded source lengths (derived from padding if omitted)
+            sampling_chunk: Target positions per teacher-forcing decision
+                            (0 = one decision per sequence)
             
         Returns:
-            outputs: Output logits (batch_size, tgt_len, tgt_vocab_size)
+            outputs: Output logits (batch_size, tgt_len, tgt_vocab_size); position 0 is zero
         """
-        batch_size = src.size(0)
-        tgt_len = tgt.size(1)
-        tgt_vocab_size = self.decoder.fc_out.out_features
-        
         # Encoder forward pass
-        hidden, cell = self.encoder(src)
-        
-        # Initialize decoder input with <sos> token
-        decoder_input = tgt[:, 0].unsqueeze(1)  # (batch_size, 1)
-        
-        # Store outputs
-        outputs = torch.zeros(batch_size, tgt_len, tgt_vocab_size).to(src.device)
+        hidden, cell = self.encoder(src, src_lengths)
         
-        # Decoder forward pass
-        for t in range(1, tgt_len):
-            output, hidden, cell = self.decoder(decoder_input, hidden, cell)
-            outputs[:, t, :] = output
+        chunks = []
+        spans = scheduled_sampling_spans(tgt.size(1), teacher_forcing_ratio, sampling_chunk, self.training)
+        for start, end, teacher_forced in spans:
+            if teacher_forced:
+                # Gold previous tokens are known up front
+                output, hidden, cell = self.decoder.forward_sequence(tgt[:, start - 1:end - 1], hidden, cell)
+                chunks.append(output)
+                continue
             
-            # Teacher forcing
-            use_teacher_forcing = torch.rand(1).item() < teacher_forcing_ratio
-            if use_teacher_forcing and self.training:
-                decoder_input = tgt[:, t].unsqueeze(1)
+            # Start from <sos> or the previous span's last prediction
+            if chunks:
+                decoder_input = chunks[-1][:, -1].argmax(dim=1, keepdim=True)
             else:
-                decoder_input = output.argmax(dim=1).unsqueeze(1)
+                decoder_input = tgt[:, :1]
+            for _ in range(start, end):
+                output, hidden, cell = self.decoder(decoder_input, hidden, cell)
+                chunks.append(output.unsqueeze(1))
+                decoder_input = output.argmax(dim=1, keepdim=True)
+        
+        if not chunks:
+            return torch.zeros(tgt.size(0), tgt.size(1), self.decoder.fc_out.out_features, device=src.device)
         
-        return outputs
+        # Prepend the unused <sos> position so outputs line up with tgt
+        return F.pad(torch.cat(chunks, dim=1), (0, 0, 1, 0))
     
-    def translate(self, src, max_length: int = 100, sos_idx: int = 2, eos_idx: int = 3):
+    def translate(self, src, max_length: int = 100, sos_idx: int = 2, eos_idx: int = 3,
+                  src_lengths=None):
         """
         Translate source sequence to target
         
@@ -184,6 +261,7 @@ class Seq2SeqTranslator(nn.Module):
             max_length: Maximum output length
             sos_idx: Start-of-sequence token index
             eos_idx: End-of-sequence token index
+            src_lengths: Unpadded source length (derived from padding if omitted)
             
         Returns:
             Translated sequence (list of indices)
@@ -191,7 +269,7 @@ class Seq2SeqTranslator(nn.Module):
         self.eval()
         with torch.no_grad():
             # Encoder
-            hidden, cell = self.encoder(src)
+            hidden, cell = self.encoder(src, src_lengths)
             
             # Initialize decoder
             decoder_input = torch.tensor([[sos_idx]]).to(src.device)
@@ -209,4 +287,72 @@ class Seq2SeqTranslator(nn.Module):
                 decoder_input = torch.tensor([[predicted_idx]]).to(src.device)
             
             return output_seq
+    
+    def translate_batch(self, src, max_length: int = 100, sos_idx: int = 2, eos_idx: int = 3,
+                        src_lengths=None):
+        """
+        Greedy-translate a padded batch of source sequences
+        
+        Args:
+            src: Source sequences (batch_size, src_len), padded with 0
+            max_length: Maximum output length
+            sos_idx: Start-of-sequence token index
+            eos_idx: End-of-sequence token index
+            src_lengths: Unpadded source lengths (derived from padding if omitted)
+            
+        Returns:
+            List of translated sequences (lists of indices, each ending at <eos> if produced)
+        """
+        self.eval()
+        with torch.no_grad():
+            hidden, cell = self.encoder(src, src_lengths)
+            
+            batch_size = src.size(0)
+            decoder_input = torch.full((batch_size, 1), sos_idx, dtype=torch.long, device=src.device)
+            finished = torch.zeros(batch_size, dtype=torch.bool, device=src.device)
+            steps = []
+            
+            for _ in range(max_length):
+                output, hidden, cell = self.decoder(decoder_input, hidden, cell)
+                predicted = output.argmax(dim=1)
+                steps.append(predicted)
+                finished |= predicted == eos_idx
+                if finished.all():
+                    break
+                decoder_input = predicted.unsqueeze(1)
+            
+            output_seqs = []
+            for row in torch.stack(steps, dim=1).tolist():
+                if eos_idx in row:
+                    row = row[:row.index(eos_idx) + 1]
+                output_seqs.append(row)
+            return output_seqs
+
 
+def build_translator(architecture: str, src_vocab_size: int, tgt_vocab_size: int,
+                     embed_dim: int, hidden_dim: int, num_layers: int, dropout: float) -> nn.Module:
+    """
+    Create a translation model by architecture name
+    
+    Args:
+        architecture: 'lstm' (Seq2SeqTranslator) or 'gru' (distilled StudentTranslator)
+        
+    Returns:
+        Model with the Seq2SeqTranslator forward/translate interface
+    """
+    if architecture == "lstm":
+        model_class = Seq2SeqTranslator
+    elif architecture == "gru":
+        from ml_pipeline.models.student_translator import StudentTranslator
+        model_class = StudentTranslator
+    else:
+        raise ValueError(f"Unknown translator architecture: {architecture}")
+    
+    return model_class(
+        src_vocab_size=src_vocab_size,
+        tgt_vocab_size=tgt_vocab_size,
+        embed_dim=embed_dim,
+        hidden_dim=hidden_dim,
+        num_layers=num_layers,
+        dropout=dropout
+    )
@@ -0,0 +1,251 @@
+"""
+Content-Addressed Audio Store
+Collected audio kept once per distinct content, named by its SHA-256 hash,
+in a two-level sharded directory tree
+"""
+
+import io
+import os
+import gzip
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+from typing import Dict, IO, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1 << 20
+TMP_PREFIX = ".tmp-"
+COMPRESSED_SUFFIX = ".gz"
+
+# Leading bytes of the formats browsers and tools upload -> extension
+MAGIC_EXTENSIONS = [
+    (b"RIFF", ".wav"),
+    (b"FORM", ".aiff"),
+    (b"\x1aE\xdf\xa3", ".webm"),
+    (b"OggS", ".ogg"),
+    (b"fLaC", ".flac"),
+    (b"ID3", ".mp3"),
+    (b"\xff\xfb", ".mp3"),
+    (b"\xff\xf3", ".mp3"),
+]
+# Uncompressed PCM containers; everything else is already compressed and stored as is
+COMPRESSIBLE_EXTENSIONS = {".wav", ".aiff", ".aif", ".pcm", ".raw", ".au"}
+
+
+def sniff_extension(head: bytes, default: str = ".bin") -> str:
+    """Audio file extension from the first bytes of the file"""
+    for magic, extension in MAGIC_EXTENSIONS:
+        if head.startswith(magic):
+            return extension
+    return default
+
+
+class AudioBlobStore:
+    """
+    Content-addressed store for audio files
+
+    A blob lives at <root>/<h[0:2]>/<h[2:4]>/<h><ext>[.gz], where h is the
+    SHA-256 of the original bytes. Adding content that is already stored
+    writes nothing. Uncompressed PCM (WAV/AIFF) is gzipped when that saves
+    at least min_saving of its size; compressed formats are stored as they
+    are. Reads always return the original bytes.
+
+    Blobs are written to a temporary file and renamed into place, so
+    concurrent writers (threads or processes) never expose partial files.
+    """
+
+    def __init__(self, root: str, compress: bool = True, compresslevel: int = 6,
+                 min_saving: float = 0.1):
+        """
+        Args:
+            root: Store directory
+            compress: Gzip uncompressed PCM formats
+            compresslevel: Gzip level (1-9)
+            min_saving: Keep the gzipped copy only if it is at least this
+                fraction smaller than the original
+        """
+        self.root = root
+        self.compress = compress
+        self.compresslevel = compresslevel
+        self.min_saving = min_saving
+        os.makedirs(root, exist_ok=True)
+
+    def _shard_dir(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4])
+
+    def path_for(self, digest: str) -> Optional[str]:
+        """Stored file of a blob, or None if it is not in the store"""
+        shard = self._shard_dir(digest)
+        try:
+            names = os.listdir(shard)
+        except FileNotFoundError:
+            return None
+        for name in names:
+            if name.startswith(digest):
+                return os.path.join(shard, name)
+        return None
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest) is not None
+
+    def put_file(self, path: str) -> Dict:
+        """
+        Add a file to the store
+
+        Args:
+            path: Audio file (left in place)
+
+        Returns:
+            Blob info: hash, extension, size, stored_size, compressed, path,
+            and deduplicated (True if the content was already stored)
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as f:
+            head = f.read(16)
+            f.seek(0)
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                size += len(chunk)
+        digest = hasher.hexdigest()
+
+        extension = sniff_extension(head, os.path.splitext(path)[1].lower() or ".bin")
+        with open(path, 'rb') as f:
+            return self._store(digest, extension, size, f)
+
+    def put_bytes(self, data: bytes, extension: Optional[str] = None) -> Dict:
+        """
+        Add in-memory audio to the store
+
+        Args:
+            data: Audio file bytes
+            extension: Fallback extension when the format is not recognized
+
+        Returns:
+            Blob info, as for put_file()
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        extension = sniff_extension(data[:16], extension or ".bin")
+        return self._store(digest, extension, len(data), io.BytesIO(data))
+
+    def _store(self, digest: str, extension: str, size: int, source: IO[bytes]) -> Dict:
+        """Write source under digest unless it is already stored"""
+        existing = self.path_for(digest)
+        if existing is not None:
+            # Refresh the mtime so gc() treats the blob as recently referenced
+            os.utime(existing)
+            return self._info(digest, extension, size, existing, deduplicated=True)
+
+        shard = self._shard_dir(digest)
+        os.makedirs(shard, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=shard)
+        try:
+            final_name = digest + extension
+            with os.fdopen(fd, 'wb') as out:
+                if self.compress and extension in COMPRESSIBLE_EXTENSIONS:
+                    with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=self.compresslevel, mtime=0) as gz:
+                        shutil.copyfileobj(source, gz, CHUNK_SIZE)
+                    final_name += COMPRESSED_SUFFIX
+                else:
+                    shutil.copyfileobj(source, out, CHUNK_SIZE)
+
+            if final_name.endswith(COMPRESSED_SUFFIX) and os.path.getsize(tmp_path) > size * (1 - self.min_saving):
+                # Not worth decompressing on every read: store the original bytes
+                source.seek(0)
+                with open(tmp_path, 'wb') as out:
+                    shutil.copyfileobj(source, out, CHUNK_SIZE)
+                final_name = digest + extension
+
+            final_path = os.path.join(shard, final_name)
+            os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        logger.debug(f"Stored audio blob {digest[:12]} ({size} -> {os.path.getsize(final_path)} bytes)")
+        return self._info(digest, extension, size, final_path, deduplicated=False)
+
+    @staticmethod
+    def _info(digest: str, extension: str, size: int, path: str, deduplicated: bool) -> Dict:
+        return {
+            'hash': digest,
+            'extension': extension,
+            'size': size,
+            'stored_size': os.path.getsize(path),
+            'compressed': path.endswith(COMPRESSED_SUFFIX),
+            'path': path,
+            'deduplicated': deduplicated
+        }
+
+    def open(self, digest: str) -> IO[bytes]:
+        """
+        Open a blob for reading its original bytes
+
+        Raises:
+            KeyError: The blob is not in the store
+        """
+        path = self.path_for(digest)
+        if path is None:
+            raise KeyError(digest)
+        if path.endswith(COMPRESSED_SUFFIX):
+            return gzip.open(path, 'rb')
+        return open(path, 'rb')
+
+    def read(self, digest: str) -> bytes:
+        """Original bytes of a blob"""
+        with self.open(digest) as f:
+            return f.read()
+
+    def iter_blobs(self) -> Iterator[str]:
+        """Paths of every stored blob"""
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.startswith(TMP_PREFIX):
+                    yield os.path.join(dirpath, name)
+
+    def gc(self, referenced: Set[str], min_age_seconds: float = 3600.0, dry_run: bool = False) -> Dict:
+        """
+        Delete blobs whose hash is not referenced
+
+        Blobs (and abandoned temporary files) modified within min_age_seconds
+        are kept, so a blob stored just before its database row is committed
+        survives a concurrent collection.
+
+        Args:
+            referenced: Hashes still in use
+            min_age_seconds: Grace period for recent files
+            dry_run: Only report what would be deleted
+
+        Returns:
+            Counts and bytes of kept and deleted blobs
+        """
+        cutoff = time.time() - min_age_seconds
+        stats = {'kept': 0, 'deleted': 0, 'freed_bytes': 0, 'kept_bytes': 0, 'recent': 0}
+
+        # Shard directories are left in place, so a concurrent put never loses its directory
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                digest = name[:64]
+                if not name.startswith(TMP_PREFIX) and digest in referenced:
+                    stats['kept'] += 1
+                    stats['kept_bytes'] += stat.st_size
+                    continue
+                if stat.st_mtime > cutoff:
+                    stats['recent'] += 1
+                    continue
+                if not dry_run:
+                    os.unlink(path)
+                stats['deleted'] += 1
+                stats['freed_bytes'] += stat.st_size
+
+        logger.info(f"Audio blob GC{' (dry run)' if dry_run else ''}: {stats}")
+        return stats
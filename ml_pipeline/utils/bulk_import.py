@@ -0,0 +1,170 @@
+"""
+Bulk Annotation Import
+Streams JSONL or CSV translation pairs, validates them row by row and
+inserts the valid ones in chunked transactions
+"""
+
+import io
+import csv
+import json
+import logging
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+REQUIRED_FIELDS = ("english_text", "isl_text")
+OPTIONAL_FIELDS = ("isl_gloss", "sigml_file")
+# Export field names (see DataCollector._pair_record) accepted as aliases
+FIELD_ALIASES = {"english": "english_text", "isl": "isl_text"}
+MAX_TEXT_LENGTH = 1000
+MAX_ROWS = 100000
+DEFAULT_CHUNK_SIZE = 500
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Pick the body format from an explicit ?format= or the Content-Type
+
+    Raises:
+        ValueError: Unknown requested format
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        return requested
+    if content_type and 'csv' in content_type.lower():
+        return "csv"
+    return "jsonl"
+
+
+def validate_pair(record) -> Dict:
+    """
+    Normalize one uploaded row into add_translation_pairs() fields
+
+    Raises:
+        ValueError: The row is not an object or a field is missing or invalid
+    """
+    if not isinstance(record, dict):
+        raise ValueError("row must be an object")
+    record = {FIELD_ALIASES.get(key, key): value for key, value in record.items()}
+
+    pair = {}
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = record.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f"{field} must be a string")
+        value = value.strip()
+        if len(value) > MAX_TEXT_LENGTH:
+            raise ValueError(f"{field} is longer than {MAX_TEXT_LENGTH} characters")
+        if value:
+            pair[field] = value
+
+    missing = [field for field in REQUIRED_FIELDS if field not in pair]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    return pair
+
+
+def iter_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Parse and validate a request body incrementally
+
+    Args:
+        stream: Binary body stream (read line by line, never buffered whole)
+        fmt: "jsonl" or "csv" (with a header row)
+
+    Yields:
+        (line number, validated pair or None, error message or None)
+
+    Raises:
+        ValueError: A CSV header without the required columns
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline='')
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        columns = {FIELD_ALIASES.get(name, name) for name in reader.fieldnames or []}
+        missing = [field for field in REQUIRED_FIELDS if field not in columns]
+        if missing:
+            raise ValueError(f"CSV header is missing {', '.join(missing)}")
+        for record in reader:
+            try:
+                yield reader.line_num, validate_pair(record), None
+            except ValueError as e:
+                yield reader.line_num, None, str(e)
+        return
+
+    for line_number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, validate_pair(json.loads(line)), None
+        except ValueError as e:  # json.JSONDecodeError is a ValueError
+            yield line_number, None, str(e)
+
+
+def import_pairs(collector, rows: Iterator[Tuple[int, Optional[Dict], Optional[str]]],
+                 source: str = "bulk_annotation", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 max_rows: int = MAX_ROWS) -> Dict:
+    """
+    Insert validated rows in transactions of chunk_size pairs
+
+    A chunk whose transaction fails is reported as failed row by row; the
+    rest of the upload still goes in.
+
+    Args:
+        collector: DataCollector to insert into
+        rows: Output of iter_rows()
+        source: Source recorded for the pairs
+        chunk_size: Pairs per transaction
+        max_rows: Stop reading after this many rows
+
+    Returns:
+        Summary with total/inserted/failed counts, truncated flag and a
+        per-row results list of {'line', 'id'} or {'line', 'error'}
+    """
+    results: List[Dict] = []
+    chunk: List[Tuple[Dict, Dict]] = []  # (result entry, pair)
+    inserted = 0
+    truncated = False
+
+    def write_chunk():
+        nonlocal inserted
+        try:
+            pair_ids = collector.add_translation_pairs([pair for _, pair in chunk], source=source)
+        except Exception as e:
+            logger.error(f"Bulk import chunk failed: {e}")
+            for entry, _ in chunk:
+                entry['error'] = f"database error: {e}"
+        else:
+            for (entry, _), pair_id in zip(chunk, pair_ids):
+                entry['id'] = pair_id
+            inserted += len(pair_ids)
+        chunk.clear()
+
+    for line_number, pair, error in rows:
+        if len(results) >= max_rows:
+            truncated = True
+            break
+        entry = {'line': line_number}
+        results.append(entry)
+        if error is not None:
+            entry['error'] = error
+            continue
+        chunk.append((entry, pair))
+        if len(chunk) >= chunk_size:
+            write_chunk()
+    if chunk:
+        write_chunk()
+
+    return {
+        'total': len(results),
+        'inserted': inserted,
+        'failed': len(results) - inserted,
+        'truncated': truncated,
+        'results': results
+    }
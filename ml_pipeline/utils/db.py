@@ -0,0 +1,154 @@
+"""
+SQLite Connection Management
+Per-thread, WAL-mode connections shared by everything that opens the same database file
+"""
+
+import os
+import sqlite3
+import logging
+import weakref
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection. WAL lets readers run alongside the single
+# writer; synchronous=NORMAL in WAL mode only syncs at checkpoints, so a commit
+# is an append to the WAL file rather than an fsync (a crash of the process
+# loses nothing, a power loss can lose the last few transactions).
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # KiB (negative) -> 16 MB page cache per connection
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000  # ms to wait for another writer's lock
+}
+
+
+class ConnectionManager:
+    """
+    One long-lived connection per thread for a database file
+
+    A thread-local connection is reused by every call that thread makes
+    instead of opening the file per call; under a thread pool server that
+    means every request the worker handles. The Flask dev server starts a
+    thread per request, so a connection is closed as soon as its thread
+    finishes (and any missed ones are swept when the next connection is
+    opened) instead of being held until close_all(). Connections are
+    recreated after a fork, since SQLite handles must not cross process
+    boundaries.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[weakref.ref, sqlite3.Connection]] = []
+        self._pid = os.getpid()
+
+        # Set by the owner of the schema (e.g. DataCollector) after its
+        # CREATE TABLE / migration pass, so it runs once per process
+        self.schema_lock = threading.Lock()
+        self.schema_ready = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection"""
+        # check_same_thread=False only so close_all() can close it from another thread
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for name, value in PRAGMAS.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        thread = threading.current_thread()
+        with self._lock:
+            finished = self._reap_finished()
+            self._connections.append((weakref.ref(thread), conn))
+        for stale in finished:
+            self._close(stale)
+        # Close it when the thread object goes away (normally right after the thread exits)
+        weakref.finalize(thread, self._release, conn)
+        return conn
+
+    def _reap_finished(self) -> List[sqlite3.Connection]:
+        """Remove connections whose thread has finished and return them (lock held)"""
+        live, finished = [], []
+        for thread_ref, conn in self._connections:
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                finished.append(conn)
+            else:
+                live.append((thread_ref, conn))
+        self._connections = live
+        return finished
+
+    def _release(self, conn: sqlite3.Connection):
+        """Close a finished thread's connection"""
+        with self._lock:
+            tracked = any(c is conn for _, c in self._connections)
+            self._connections = [(t, c) for t, c in self._connections if c is not conn]
+        if tracked:
+            self._close(conn)
+
+    def _close(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to close connection to {self.db_path}: {e}")
+
+    def open_connections(self) -> int:
+        """Number of connections currently open"""
+        with self._lock:
+            return len(self._connections)
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        if os.getpid() != self._pid:
+            # Forked child: drop the parent's handles without closing them
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Cursor on the thread's connection; commits on success, rolls back on error"""
+        conn = self.connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            self._close(conn)
+        self._local = threading.local()
+
+
+# Global instances, one per database file
+_connection_managers: Dict[str, ConnectionManager] = {}
+_connection_managers_lock = threading.Lock()
+
+def get_connection_manager(db_path: str) -> ConnectionManager:
+    """Get or create the process-wide connection manager for a database file"""
+    key = os.path.abspath(db_path)
+    with _connection_managers_lock:
+        manager = _connection_managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path)
+            _connection_managers[key] = manager
+        return manager
@@ -99,6 +99,23 @@ class Vocabulary:
         words = [w for w in words if w not in ['<pad>', '<sos>', '<eos>']]
         return ' '.join(words)
     
+    def to_list(self) -> List[str]:
+        """
+        Get tokens ordered by index (compact form used in inference artifacts)
+        
+        Returns:
+            List where position i holds the word with index i
+        """
+        return [self.idx2word[idx] for idx in range(len(self.idx2word))]
+    
+    @classmethod
+    def from_list(cls, tokens: List[str]) -> 'Vocabulary':
+        """Create vocabulary from tokens ordered by index"""
+        vocab = cls()
+        vocab.word2idx = {word: idx for idx, word in enumerate(tokens)}
+        vocab.idx2word = dict(enumerate(tokens))
+        return vocab
+    
     def size(self) -> int:
         """Get vocabulary size"""
         return len(self.word2idx)
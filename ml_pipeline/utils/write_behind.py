@@ -0,0 +1,218 @@
+"""
+Write-Behind Inserts
+Bounded in-memory insert queue flushed in batches by a background thread
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ml_pipeline.utils.db import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+class IdAllocator:
+    """
+    Hands out AUTOINCREMENT row IDs before the rows are written
+
+    IDs are reserved in blocks by advancing the table's sqlite_sequence
+    entry, so rows inserted directly (by this or another process) never
+    reuse them. IDs left in a block at shutdown become gaps, which
+    AUTOINCREMENT tables already allow.
+    """
+
+    def __init__(self, manager: ConnectionManager, block_size: int = 100):
+        """
+        Args:
+            manager: Connection manager for the database
+            block_size: IDs reserved per database round trip
+        """
+        self.manager = manager
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # table -> (next id, last id)
+
+    def _reserve_block(self, table: str) -> Tuple[int, int]:
+        """Reserve the next block_size IDs of a table"""
+        conn = self.manager.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+            max_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+            start = max(row[0] if row else 0, max_id) + 1
+            end = start + self.block_size - 1
+            if row:
+                conn.execute('UPDATE sqlite_sequence SET seq = ? WHERE name = ?', (end, table))
+            else:
+                conn.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)', (table, end))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return start, end
+
+    def allocate(self, table: str) -> int:
+        """Get the next reserved ID for a table"""
+        with self._lock:
+            next_id, last_id = self._blocks.get(table, (1, 0))
+            if next_id > last_id:
+                next_id, last_id = self._reserve_block(table)
+            self._blocks[table] = (next_id + 1, last_id)
+            return next_id
+
+
+class WriteBehindQueue:
+    """
+    Queue inserts and write them in batched transactions
+
+    submit() returns as soon as the record is queued. A writer thread
+    commits queued records with executemany() in one transaction when
+    batch_size records are waiting or flush_interval_ms has passed since
+    the first of them, whichever comes first. The queue holds at most
+    max_pending records; submit() blocks when it is full, so a stalled
+    disk slows callers down instead of growing memory without bound.
+    """
+
+    def __init__(self, manager: ConnectionManager, batch_size: int = 100,
+                 flush_interval_ms: float = 50.0, max_pending: int = 10000,
+                 id_block_size: int = 100):
+        """
+        Args:
+            manager: Connection manager for the database
+            batch_size: Records per transaction (N)
+            flush_interval_ms: Longest time a record waits before being written (M)
+            max_pending: Queue bound
+            id_block_size: Row IDs reserved per allocation round trip
+        """
+        self.manager = manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.ids = IdAllocator(manager, id_block_size)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        # Allocating and enqueueing under one lock keeps queue order equal to ID order
+        self._submit_lock = threading.Lock()
+        self.stats = {'written': 0, 'batches': 0, 'failed': 0}
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, table: str, columns: Sequence[str], values: Sequence,
+               upsert: Optional[str] = None, alias_table: Optional[str] = None) -> int:
+        """
+        Queue one insert with a pre-allocated ID
+
+        Args:
+            table: Table name (must have an INTEGER PRIMARY KEY AUTOINCREMENT id)
+            columns: Column names, excluding id
+            values: Values in column order
+            upsert: "ON CONFLICT ... RETURNING id" clause for tables with a
+                unique key other than id. When the row merges into an
+                existing one, (pre-allocated ID, existing ID) is inserted
+                into alias_table (columns alias_id, target_id), so the
+                returned ID can still be resolved.
+            alias_table: Table recording merged IDs (required with upsert)
+
+        Returns:
+            ID the row will have once written (or the alias of the row it merged into)
+        """
+        if upsert is not None and alias_table is None:
+            raise ValueError("alias_table is required with upsert")
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            row_id = self.ids.allocate(table)
+            self._queue.put((table, ('id',) + tuple(columns), (row_id,) + tuple(values), upsert, alias_table))
+        return row_id
+
+    def pending(self) -> int:
+        """Number of records queued but not yet written"""
+        return self._queue.qsize()
+
+    def _collect(self, first) -> Tuple[List, bool]:
+        """Gather a batch starting with first; returns (records, stop requested)"""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _insert(cursor, table: str, columns: Tuple[str, ...], rows: List[Tuple],
+                upsert: Optional[str], alias_table: Optional[str]):
+        placeholders = ', '.join('?' for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        if upsert is None:
+            cursor.executemany(sql, rows)
+            return
+        # RETURNING needs execute(); still one transaction for the whole batch
+        for values in rows:
+            cursor.execute(sql + upsert, values)
+            target_id = cursor.fetchone()[0]
+            if target_id != values[0]:
+                cursor.execute(f'INSERT OR REPLACE INTO {alias_table} (alias_id, target_id) VALUES (?, ?)',
+                               (values[0], target_id))
+
+    def _write(self, batch: List):
+        """Insert a batch in one transaction, isolating failing records on error"""
+        groups: Dict[Tuple, List[Tuple]] = {}
+        for table, columns, values, upsert, alias_table in batch:
+            groups.setdefault((table, columns, upsert, alias_table), []).append(values)
+
+        try:
+            with self.manager.transaction() as cursor:
+                for (table, columns, upsert, alias_table), rows in groups.items():
+                    self._insert(cursor, table, columns, rows, upsert, alias_table)
+            self.stats['written'] += len(batch)
+            self.stats['batches'] += 1
+            return
+        except Exception as e:
+            logger.warning(f"Batch insert of {len(batch)} records failed ({e}), retrying one by one")
+
+        for table, columns, values, upsert, alias_table in batch:
+            try:
+                with self.manager.transaction() as cursor:
+                    self._insert(cursor, table, columns, [values], upsert, alias_table)
+                self.stats['written'] += 1
+            except Exception as e:
+                logger.error(f"Dropped {table} record {values[0]}: {e}")
+                self.stats['failed'] += 1
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                break
+            batch, stop = self._collect(first)
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Write remaining records and stop the writer thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        logger.info(f"Write-behind queue drained: {self.stats}")
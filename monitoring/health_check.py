@@ -1,32 +1,203 @@
 """
 Health check utilities
+System and process statistics sampled on a background thread, with rolling
+window summaries
 """
 
 import time
 import psutil
 import os
-from typing import Dict
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
 
+logger = logging.getLogger(__name__)
 
-def get_system_health() -> Dict:
+MB = 1024 * 1024
+
+# Rolling windows reported by get_system_health(), in seconds
+WINDOWS = {'1s': 1, '1m': 60, '5m': 300}
+PERCENTILES = (50, 90, 99)
+
+# Sampled fields summarized over each window
+WINDOW_FIELDS = ('cpu_percent', 'memory_percent', 'process_memory_mb', 'process_cpu_percent', 'open_files')
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Percentile of sorted values with linear interpolation"""
+    rank = (len(sorted_values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Optional[Dict]:
+    """Average, min, max and percentiles of values (None if there are none)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    summary = {
+        'avg': sum(ordered) / len(ordered),
+        'min': ordered[0],
+        'max': ordered[-1]
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}'] = _percentile(ordered, p)
+    return summary
+
+
+class HealthSampler:
     """
-    Get system health metrics
+    Sample system and process health on a background thread
     
-    Returns:
-        Dictionary with system health information
+    Every interval seconds the thread records system CPU and memory, and the
+    process's CPU, RSS and open file descriptors, keeping enough samples
+    for the longest window. CPU percentages are measured between consecutive
+    samples, so reading a snapshot never sleeps. The snapshot (latest
+    values plus per-window summaries) is rebuilt after each sample, so
+    snapshot() is a dictionary read.
     """
-    try:
-        process = psutil.Process(os.getpid())
+    
+    def __init__(self, interval: float = 0.5):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._process = psutil.Process(os.getpid())
+        self._samples: deque = deque(maxlen=int(max(WINDOWS.values()) / interval) + 1)
+        self._snapshot: Dict = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._primed = False
+    
+    def _open_files(self) -> int:
+        # File descriptors on POSIX (files, sockets, pipes); handles on Windows
+        if hasattr(self._process, 'num_fds'):
+            return self._process.num_fds()
+        return self._process.num_handles()
+    
+    def sample(self) -> Dict:
+        """Take one sample and rebuild the snapshot"""
+        memory = psutil.virtual_memory()
+        with self._process.oneshot():
+            sample = {
+                'timestamp': time.time(),
+                'cpu_percent': psutil.cpu_percent(interval=None),
+                'memory_percent': memory.percent,
+                'memory_used_mb': memory.used / MB,
+                'memory_available_mb': memory.available / MB,
+                'process_memory_mb': self._process.memory_info().rss / MB,
+                'process_cpu_percent': self._process.cpu_percent(interval=None),
+                'open_files': self._open_files(),
+                'threads': self._process.num_threads()
+            }
+        if not self._primed:
+            # The first CPU readings have no previous sample to compare against
+            sample['cpu_percent'] = sample['process_cpu_percent'] = None
+            self._primed = True
+        
+        with self._lock:
+            self._samples.append(sample)
+            samples = list(self._samples)
+        snapshot = self._build_snapshot(samples)
+        with self._lock:
+            self._snapshot = snapshot
+        self._ready.set()
+        return sample
+    
+    def _build_snapshot(self, samples: List[Dict]) -> Dict:
+        latest = samples[-1]
+        windows = {}
+        for label, seconds in WINDOWS.items():
+            cutoff = latest['timestamp'] - seconds
+            recent = [s for s in samples if s['timestamp'] > cutoff]
+            window = {'samples': len(recent)}
+            for field in WINDOW_FIELDS:
+                window[field] = summarize([s[field] for s in recent if s[field] is not None])
+            windows[label] = window
         
         return {
-            'cpu_percent': psutil.cpu_percent(interval=1),
-            'memory_percent': psutil.virtual_memory().percent,
-            'memory_used_mb': psutil.virtual_memory().used / (1024 * 1024),
-            'memory_available_mb': psutil.virtual_memory().available / (1024 * 1024),
-            'process_memory_mb': process.memory_info().rss / (1024 * 1024),
-            'process_cpu_percent': process.cpu_percent(interval=1),
-            'uptime_seconds': time.time() - process.create_time()
+            **{key: value for key, value in latest.items() if key != 'timestamp'},
+            'uptime_seconds': latest['timestamp'] - self._process.create_time(),
+            'sampled_at': latest['timestamp'],
+            'sample_interval': self.interval,
+            'windows': windows
         }
+    
+    def snapshot(self, timeout: float = 0.0) -> Dict:
+        """
+        Latest values and window summaries
+        
+        Args:
+            timeout: Seconds to wait for the first sample if there is none yet
+        
+        Returns:
+            Snapshot dictionary (empty if no sample has been taken)
+        """
+        self._ready.wait(timeout)
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot:
+            snapshot = {**snapshot, 'sample_age_seconds': time.time() - snapshot['sampled_at']}
+        return snapshot
+    
+    def start(self):
+        """Start the sampler thread (again after a fork)"""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+                    self._thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Health sample failed: {e}")
+            if self._stop.wait(self.interval):
+                break
+    
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+# Global sampler instance
+_health_sampler = None
+_health_sampler_lock = threading.Lock()
+
+def get_health_sampler() -> HealthSampler:
+    """Get the process-wide health sampler, starting its thread if needed"""
+    global _health_sampler
+    if _health_sampler is None:
+        with _health_sampler_lock:
+            if _health_sampler is None:
+                _health_sampler = HealthSampler()
+    _health_sampler.start()
+    return _health_sampler
+
+
+def get_system_health() -> Dict:
+    """
+    Get system health metrics from the background sampler (never blocks)
+    
+    The first call starts the sampler and waits for its first sample; CPU
+    fields are None until the second sample and windows fill up over time.
+    
+    Returns:
+        Dictionary with latest system health values and 'windows' with
+        avg/min/max/p50/p90/p99 over the last 1s, 1m and 5m
+    """
+    try:
+        return get_health_sampler().snapshot(timeout=1.0)
     except Exception as e:
         return {
             'error': str(e),
@@ -47,11 +218,10 @@ def check_service_health() -> Dict:
         'services': {}
     }
     
-    # Check Whisper availability
+    # Check Whisper availability (status registry only, never loads the model)
     try:
-        from services.asr_service import get_asr_service
-        asr_service = get_asr_service()
-        health['services']['whisper'] = asr_service.is_available()
+        from services.model_status import get_model_status_registry
+        health['services']['whisper'] = get_model_status_registry().is_model_ready('whisper')
     except:
         health['services']['whisper'] = False
     
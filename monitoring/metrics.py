@@ -1,81 +1,314 @@
 """
 Performance metrics collection
+Metrics are appended to SQLite in batches, compacted into per-minute and
+per-hour rollups and expired after a retention period
 """
 
-import json
 import os
+import json
+import time
+import atexit
+import logging
+import threading
+from collections import deque
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from ml_pipeline.utils.db import get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions in seconds
+MINUTE = 60
+HOUR = 3600
+RESOLUTIONS = {'minute': MINUTE, 'hour': HOUR}
 
 
 class MetricsCollector:
-    """Collect and store performance metrics"""
-    
-    def __init__(self, metrics_file: str = "data/metrics.json"):
-        self.metrics_file = Path(metrics_file)
-        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
-        self.metrics = []
-    
+    """
+    Collect and store performance metrics
+
+    record_metric() only appends to an in-memory buffer; a background thread
+    writes the buffer with executemany() every flush_interval seconds and
+    runs compaction every compact_interval seconds. Compaction folds samples
+    written since the last pass into per-minute and per-hour buckets
+    (count/sum/min/max, merged additively, so partial buckets are completed
+    by later passes) and deletes samples and buckets past their retention.
+    """
+
+    def __init__(self, db_path: str = "data/metrics.db", flush_interval: float = 1.0,
+                 compact_interval: float = 60.0, raw_retention_hours: float = 24.0,
+                 minute_retention_days: float = 7.0, hour_retention_days: float = 90.0,
+                 max_pending: int = 100000):
+        """
+        Args:
+            db_path: Metrics database file
+            flush_interval: Seconds between buffer flushes
+            compact_interval: Seconds between rollup/retention passes
+            raw_retention_hours: How long individual samples are kept
+            minute_retention_days: How long per-minute rollups are kept
+            hour_retention_days: How long per-hour rollups are kept
+            max_pending: Buffer bound; the oldest unwritten samples are dropped beyond it
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db = get_connection_manager(db_path)
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.retention = {
+            'raw': raw_retention_hours * 3600,
+            'minute': minute_retention_days * 86400,
+            'hour': hour_retention_days * 86400
+        }
+
+        self._pending: deque = deque(maxlen=max_pending)
+        self._latest: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'recorded': 0, 'written': 0, 'dropped': 0, 'compactions': 0}
+
+        self._init_database()
+
+    def _init_database(self):
+        """Create the sample, rollup and state tables"""
+        with self.db.transaction() as cursor:
+            # Append-only samples; AUTOINCREMENT keeps ids increasing even
+            # after retention deletes every row, so id order is write order
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metric_samples (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    name TEXT NOT NULL,
+                    value REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metric_samples_name_ts ON metric_samples (name, ts)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metric_samples_ts ON metric_samples (ts)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    resolution INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    sum REAL NOT NULL,
+                    min REAL NOT NULL,
+                    max REAL NOT NULL,
+                    PRIMARY KEY (resolution, name, bucket)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metric_state (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            ''')
+
+    def _ensure_writer(self):
+        """Start the flush/compaction thread (again after a fork)"""
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+                    self._thread.start()
+
     def record_metric(self, name: str, value: float, timestamp: datetime = None):
         """
         Record a metric
-        
+
         Args:
             name: Metric name
             value: Metric value
             timestamp: Optional timestamp (default: now)
         """
-        if timestamp is None:
-            timestamp = datetime.now()
-        
-        metric = {
-            'name': name,
-            'value': value,
-            'timestamp': timestamp.isoformat()
-        }
-        
-        self.metrics.append(metric)
-        self._save_metrics()
-    
+        ts = timestamp.timestamp() if timestamp is not None else time.time()
+        value = float(value)
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self.stats['dropped'] += 1
+            self._pending.append((ts, name, value))
+            self._latest[name] = value
+            self.stats['recorded'] += 1
+        self._ensure_writer()
+
     def record_batch(self, metrics: Dict[str, float]):
         """Record multiple metrics at once"""
         timestamp = datetime.now()
         for name, value in metrics.items():
             self.record_metric(name, value, timestamp)
-    
+
     def get_latest_metrics(self) -> Dict[str, float]:
         """Get latest metric values"""
-        latest = {}
-        for metric in reversed(self.metrics):
-            if metric['name'] not in latest:
-                latest[metric['name']] = metric['value']
-        return latest
-    
-    def get_metric_history(self, name: str) -> List[Dict]:
-        """Get history for a specific metric"""
-        return [m for m in self.metrics if m['name'] == name]
-    
-    def _save_metrics(self):
-        """Save metrics to file"""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
-    
-    def load_metrics(self):
-        """Load metrics from file"""
-        if self.metrics_file.exists():
-            with open(self.metrics_file, 'r') as f:
-                self.metrics = json.load(f)
+        with self._lock:
+            return dict(self._latest)
+
+    def get_metric_history(self, name: str, start: Optional[datetime] = None,
+                           end: Optional[datetime] = None) -> List[Dict]:
+        """Get raw samples of a metric (within the raw retention period)"""
+        return [
+            {'name': name, 'value': row['value'], 'timestamp': datetime.fromtimestamp(row['ts']).isoformat()}
+            for row in self.query(name, start, end, resolution='raw')
+        ]
+
+    def query(self, name: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+              resolution: str = 'auto') -> List[Dict]:
+        """
+        Time-range query over one metric
+
+        Args:
+            name: Metric name
+            start: Inclusive start (default: unbounded)
+            end: Exclusive end (default: unbounded)
+            resolution: 'raw', 'minute', 'hour', or 'auto' for the finest
+                resolution whose retention covers start
+
+        Returns:
+            Raw samples as {'ts', 'value'}, or rollup buckets as
+            {'ts', 'count', 'sum', 'min', 'max', 'avg'} (ts = bucket start),
+            oldest first
+        """
+        self.flush()
+        start_ts = start.timestamp() if start is not None else 0.0
+        end_ts = end.timestamp() if end is not None else float('inf')
+        if resolution == 'auto':
+            age = time.time() - start_ts
+            resolution = next((r for r in ('raw', 'minute') if age <= self.retention[r]), 'hour')
+
+        if resolution == 'raw':
+            with self.db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT ts, value FROM metric_samples
+                    WHERE name = ? AND ts >= ? AND ts < ?
+                    ORDER BY ts
+                ''', (name, start_ts, end_ts))
+                return [{'ts': ts, 'value': value} for ts, value in cursor.fetchall()]
+
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        width = RESOLUTIONS[resolution]
+        # Roll up what is written so far, so buckets include the latest samples
+        with self._write_lock, self.db.transaction() as cursor:
+            self._compact(cursor)
+            cursor.execute('''
+                SELECT bucket, count, sum, min, max FROM metric_rollups
+                WHERE resolution = ? AND name = ? AND bucket >= ? AND bucket < ?
+                ORDER BY bucket
+            ''', (width, name, int(start_ts // width) * width, end_ts))
+            return [
+                {'ts': bucket, 'count': count, 'sum': total, 'min': low, 'max': high, 'avg': total / count}
+                for bucket, count, total, low, high in cursor.fetchall()
+            ]
+
+    def flush(self):
+        """Write buffered samples now"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return
+        with self._write_lock, self.db.transaction() as cursor:
+            cursor.executemany('INSERT INTO metric_samples (ts, name, value) VALUES (?, ?, ?)', batch)
+        self.stats['written'] += len(batch)
+
+    def compact(self):
+        """Roll new samples up and expire old samples and buckets now"""
+        self.flush()
+        with self._write_lock, self.db.transaction() as cursor:
+            self._compact(cursor)
+            now = time.time()
+            cursor.execute('DELETE FROM metric_samples WHERE ts < ?', (now - self.retention['raw'],))
+            for label, width in RESOLUTIONS.items():
+                cursor.execute('DELETE FROM metric_rollups WHERE resolution = ? AND bucket < ?',
+                               (width, now - self.retention[label]))
+        self.stats['compactions'] += 1
+
+    def _compact(self, cursor):
+        """Fold samples written since the last pass into the rollup buckets"""
+        # Writing first takes the write lock before the watermark is read, so
+        # concurrent passes (e.g. from another process) never roll a sample twice
+        cursor.execute("INSERT OR IGNORE INTO metric_state (key, value) VALUES ('rolled_id', 0)")
+        cursor.execute("SELECT value FROM metric_state WHERE key = 'rolled_id'")
+        rolled = cursor.fetchone()[0]
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM metric_samples')
+        newest = cursor.fetchone()[0]
+        if newest <= rolled:
+            return
+        for width in RESOLUTIONS.values():
+            cursor.execute('''
+                INSERT INTO metric_rollups (resolution, name, bucket, count, sum, min, max)
+                SELECT ?, name, CAST(ts / ? AS INTEGER) * ?, COUNT(*), SUM(value), MIN(value), MAX(value)
+                FROM metric_samples WHERE id > ? AND id <= ?
+                GROUP BY name, CAST(ts / ? AS INTEGER)
+                ON CONFLICT (resolution, name, bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    sum = sum + excluded.sum,
+                    min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max)
+            ''', (width, width, width, rolled, newest, width))
+        cursor.execute("UPDATE metric_state SET value = ? WHERE key = 'rolled_id'", (newest,))
+
+    def _run(self):
+        last_compaction = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() - last_compaction >= self.compact_interval:
+                    self.compact()
+                    last_compaction = time.monotonic()
+            except Exception as e:
+                logger.error(f"Metrics write failed: {e}")
+
+    def close(self):
+        """Stop the writer thread and write buffered samples"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def load_metrics(self, legacy_file: Optional[str] = None):
+        """
+        Load latest values from the database, importing a legacy metrics.json once
+
+        Args:
+            legacy_file: JSON array written by earlier versions
+                (default: metrics.json next to the database); renamed to
+                .imported after the import
+        """
+        legacy_file = legacy_file or os.path.join(os.path.dirname(self.db_path), "metrics.json")
+        if os.path.exists(legacy_file):
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+            rows = [(datetime.fromisoformat(m['timestamp']).timestamp(), m['name'], float(m['value']))
+                    for m in legacy]
+            with self._write_lock, self.db.transaction() as cursor:
+                cursor.executemany('INSERT INTO metric_samples (ts, name, value) VALUES (?, ?, ?)', rows)
+            os.replace(legacy_file, legacy_file + ".imported")
+            logger.info(f"Imported {len(rows)} metrics from {legacy_file}")
+
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                SELECT name, value FROM metric_samples
+                WHERE id IN (SELECT MAX(id) FROM metric_samples GROUP BY name)
+            ''')
+            latest = dict(cursor.fetchall())
+        with self._lock:
+            self._latest = {**latest, **self._latest}
 
 
 # Global metrics collector instance
 _metrics_collector = None
+_metrics_collector_lock = threading.Lock()
 
 def get_metrics_collector() -> MetricsCollector:
     """Get or create metrics collector instance"""
     global _metrics_collector
     if _metrics_collector is None:
-        _metrics_collector = MetricsCollector()
-        _metrics_collector.load_metrics()
+        with _metrics_collector_lock:
+            if _metrics_collector is None:
+                collector = MetricsCollector()
+                collector.load_metrics()
+                atexit.register(collector.close)
+                _metrics_collector = collector
     return _metrics_collector
-
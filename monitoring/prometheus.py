@@ -0,0 +1,250 @@
+"""
+Prometheus metrics
+Counters and histograms kept in per-thread shards and rendered in the text
+exposition format
+"""
+
+import math
+import bisect
+import weakref
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Shards of finished threads are folded into one after this many new threads
+RETIRE_EVERY = 256
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        for value in values
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 metric_type: str, labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.type = metric_type
+        self.labelnames = tuple(labelnames)
+        self._local = registry._local
+
+
+class Counter(_Metric):
+    """Monotonic counter; inc() touches only the calling thread's shard"""
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        super().__init__(registry, name, help_text, "counter", labelnames)
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        try:
+            shard = self._local.values
+        except AttributeError:
+            shard = self.registry._shard()
+        key = (self.name, label_values)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Current total of one series across all threads"""
+        key = (self.name, label_values)
+        with self.registry._lock:
+            total = self.registry._retired.get(key, 0.0)
+            for _, shard in self.registry._shards:
+                total += shard.get(key, 0.0)
+        return total
+
+
+class Histogram(_Metric):
+    """
+    Histogram with fixed upper bounds
+
+    Each thread's row holds per-bucket (non-cumulative) counts, a +Inf
+    count and the sum; buckets are made cumulative when rendered.
+    """
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, "histogram", labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str):
+        try:
+            shard = self._local.values
+        except AttributeError:
+            shard = self.registry._shard()
+        key = (self.name, label_values)
+        row = shard.get(key)
+        if row is None:
+            row = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect.bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+
+class Callback(_Metric):
+    """Gauge or counter read from a function at scrape time"""
+
+    def __init__(self, registry, name, help_text, metric_type, labelnames,
+                 fn: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        super().__init__(registry, name, help_text, metric_type, labelnames)
+        self.fn = fn
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics with lock-free updates
+
+    Every thread writes to its own dict, so counters and histograms are
+    updated without a lock and without contention between request threads.
+    A scrape copies and sums the shards. Shards of finished threads (the
+    dev server starts one per request) are merged into a single retired
+    shard, so their counts are kept and the shard list stays bounded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[Tuple[weakref.ref, Dict]] = []
+        self._retired: Dict = {}
+        self._new_shards = 0
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _shard(self) -> Dict:
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+                self._new_shards += 1
+                if self._new_shards % RETIRE_EVERY == 0:
+                    self._retire_finished()
+        return shard
+
+    @staticmethod
+    def _merge(target: Dict, values: Dict):
+        for key, value in values.items():
+            current = target.get(key)
+            if current is None:
+                target[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    current[i] += item
+            else:
+                target[key] = current + value
+
+    def _retire_finished(self):
+        """Fold shards of finished threads into the retired shard (lock held)"""
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                self._merge(self._retired, shard)
+            else:
+                live.append((thread_ref, shard))
+        self._shards = live
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help_text: str, labelnames: Sequence[str],
+                       fn: Callable[[], Iterable[Tuple[LabelValues, float]]]) -> Callback:
+        return self._register(Callback(self, name, help_text, "gauge", labelnames, fn))
+
+    def counter_callback(self, name: str, help_text: str, labelnames: Sequence[str],
+                         fn: Callable[[], Iterable[Tuple[LabelValues, float]]]) -> Callback:
+        return self._register(Callback(self, name, help_text, "counter", labelnames, fn))
+
+    def collect(self) -> Dict:
+        """Sum of every shard: {(metric name, label values): value or histogram row}"""
+        with self._lock:
+            self._retire_finished()
+            totals: Dict = {}
+            self._merge(totals, self._retired)
+            for _, shard in self._shards:
+                # dict.copy() and list() are atomic under the GIL, so the
+                # owning thread can keep writing while we read
+                self._merge(totals, {
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in shard.copy().items()
+                })
+        return totals
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        totals = self.collect()
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        by_metric: Dict[str, List[Tuple[LabelValues, object]]] = {}
+        for (name, label_values), value in totals.items():
+            by_metric.setdefault(name, []).append((label_values, value))
+
+        lines = []
+        for metric in metrics:
+            if isinstance(metric, Callback):
+                try:
+                    series = [(tuple(str(v) for v in labels), value) for labels, value in metric.fn()]
+                except Exception as e:
+                    lines.append(f"# {metric.name} unavailable: {e}")
+                    continue
+            else:
+                series = by_metric.get(metric.name, [])
+
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for label_values, value in sorted(series, key=lambda item: item[0]):
+                labels = _format_labels(metric.labelnames, label_values)
+                if not isinstance(metric, Histogram):
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (math.inf,), value[:-1]):
+                    cumulative += count
+                    bucket_labels = _format_labels(metric.labelnames + ('le',),
+                                                   label_values + (_format_value(bound),))
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric.name}_sum{labels} {_format_value(value[-1])}")
+                lines.append(f"{metric.name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> MetricsRegistry:
+    """Get or create the process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
@@ -0,0 +1,131 @@
+"""
+Benchmark training epoch time for different batching, scheduled-sampling and speed settings
+Usage: python scripts/benchmark_training.py --data data/train_pairs_massive.json [--experiment sampling|speed]
+"""
+
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import torch
+
+from ml_pipeline.config import ModelConfig
+from ml_pipeline.datasets.isl_dataset import ISLTranslationDataset
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.models.translator import Seq2SeqTranslator
+from ml_pipeline.models.translation_trainer import TranslationTrainer
+from ml_pipeline.utils.vocab import Vocabulary
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+def build_vocabs(data_path: str):
+    """Build source/target vocabularies from a pairs file"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.build_vocab([item['english'] for item in data], min_freq=1)
+    tgt_vocab.build_vocab([item['isl'] for item in data], min_freq=1)
+    return src_vocab, tgt_vocab
+
+
+def time_epoch(config: ModelConfig, data_path: str, src_vocab, tgt_vocab, bucketed: bool) -> dict:
+    """Train one epoch from a fixed seed and report wall time and target tokens/sec"""
+    torch.manual_seed(0)
+    dataset = ISLTranslationDataset(data_path, src_vocab, tgt_vocab, config.MAX_LENGTH, pad=not bucketed)
+    loader = create_data_loader(dataset, batch_size=config.BATCH_SIZE, shuffle=True)
+    model = Seq2SeqTranslator(
+        src_vocab_size=src_vocab.size(),
+        tgt_vocab_size=tgt_vocab.size(),
+        embed_dim=config.EMBED_DIM,
+        hidden_dim=config.HIDDEN_DIM,
+        num_layers=config.NUM_LAYERS,
+        dropout=config.DROPOUT
+    )
+    trainer = TranslationTrainer(model, config)
+    
+    start = time.perf_counter()
+    loss = trainer.train_epoch(loader, epoch=1)
+    elapsed = time.perf_counter() - start
+    
+    # Predicted (non-padding) target tokens, excluding <sos>
+    tokens = sum(int((tgt != 0).sum()) - 1 for _, tgt in dataset)
+    
+    return {'seconds': elapsed, 'loss': loss, 'batches': len(loader), 'pairs': len(dataset),
+            'tokens_per_sec': tokens / elapsed}
+
+
+def override_config(**settings) -> ModelConfig:
+    """ModelConfig with the given attributes overridden"""
+    config = ModelConfig()
+    config.LOG_STEP_TIMINGS = False
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return config
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Benchmark training epoch time')
+    parser.add_argument('--data', type=str, default='data/train_pairs_massive.json')
+    parser.add_argument('--threads', type=int, default=None, help='torch.set_num_threads')
+    parser.add_argument('--experiment', choices=['batching', 'sampling', 'speed'], default='batching',
+                        help='Compare batching strategies, scheduled-sampling granularity, '
+                             'or precision/compile/accumulation settings')
+    args = parser.parse_args()
+    
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    
+    config = ModelConfig()
+    config.LOG_STEP_TIMINGS = False
+    src_vocab, tgt_vocab = build_vocabs(args.data)
+    
+    if args.experiment == 'batching':
+        results = {
+            f'fixed padding ({config.MAX_LENGTH})': time_epoch(config, args.data, src_vocab, tgt_vocab, bucketed=False),
+            'bucketed + dynamic padding': time_epoch(config, args.data, src_vocab, tgt_vocab, bucketed=True)
+        }
+    else:
+        if args.experiment == 'sampling':
+            settings = {
+                'per-token decisions (chunk=1)': {'SCHEDULED_SAMPLING_CHUNK': 1},
+                'chunk=4 decisions': {'SCHEDULED_SAMPLING_CHUNK': 4},
+                'per-sequence decisions': {'SCHEDULED_SAMPLING_CHUNK': 0},
+                'full teacher forcing': {'TEACHER_FORCING_RATIO': 1.0}
+            }
+        else:
+            settings = {
+                'fp32 eager': {},
+                'bf16 autocast': {'MIXED_PRECISION': 'bf16'},
+                'torch.compile': {'COMPILE_MODEL': True},
+                'bf16 + torch.compile': {'MIXED_PRECISION': 'bf16', 'COMPILE_MODEL': True},
+                f'batch {config.BATCH_SIZE // 4} x 4 grad accum': {
+                    'BATCH_SIZE': config.BATCH_SIZE // 4, 'GRAD_ACCUM_STEPS': 4
+                }
+            }
+        results = {
+            name: time_epoch(override_config(**overrides), args.data, src_vocab, tgt_vocab, config.BUCKET_BATCHES)
+            for name, overrides in settings.items()
+        }
+    
+    baseline = next(iter(results.values()))['seconds']
+    print("\n" + "=" * 86)
+    print(f"{'Setting':<34}{'Epoch (s)':>12}{'Speedup':>10}{'Tokens/s':>10}{'Loss':>10}{'Batches':>10}")
+    print("-" * 86)
+    for name, row in results.items():
+        print(f"{name:<34}{row['seconds']:>12.1f}{baseline / row['seconds']:>9.1f}x"
+              f"{row['tokens_per_sec']:>10.0f}{row['loss']:>10.4f}{row['batches']:>10}")
+    print("=" * 86)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Build the exact-match phrase table used ahead of the ML translator
+Compiles curated pair files (and verified DataCollector pairs) into models/phrase_table.json
+"""
+
+import sys
+import json
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.phrase_table import PhraseTable, DEFAULT_PAIR_FILES, PHRASE_TABLE_PATH
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def report_hit_rate(table: PhraseTable, eval_files):
+    """Print exact-match hit rate of the table over utterances in eval files"""
+    for eval_file in eval_files:
+        with open(eval_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        utterances = [item['english'] if isinstance(item, dict) else item for item in data]
+        hits = sum(1 for text in utterances if table.lookup(text) is not None)
+        rate = hits / len(utterances) if utterances else 0.0
+        print(f"  {eval_file}: {hits}/{len(utterances)} hits ({rate:.1%})")
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Build exact-match phrase table')
+    parser.add_argument('--pairs', type=str, nargs='*', default=DEFAULT_PAIR_FILES,
+                        help='Pair files, lowest priority first')
+    parser.add_argument('--db', type=str, default=None,
+                        help='Include verified pairs from this DataCollector database (highest priority)')
+    parser.add_argument('--output', type=str, default=str(PHRASE_TABLE_PATH))
+    parser.add_argument('--eval', type=str, nargs='*', default=[],
+                        help='JSON files of utterances (strings or {"english": ...}) to report hit rate on')
+    args = parser.parse_args()
+    
+    collector = None
+    if args.db:
+        from ml_pipeline.data_collector import DataCollector
+        collector = DataCollector(db_path=args.db)
+    
+    table = PhraseTable.build(args.pairs, collector=collector)
+    table.save(args.output)
+    
+    if args.eval:
+        print("Hit rate:")
+        report_hit_rate(table, args.eval)
+
+
+if __name__ == "__main__":
+    main()
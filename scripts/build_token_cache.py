@@ -0,0 +1,44 @@
+"""
+Pre-tokenize pairs files into memory-mapped token caches
+Usage: python scripts/build_token_cache.py data/train_pairs_massive.json data/val_pairs_massive.json
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.config import ModelConfig
+from ml_pipeline.datasets.token_cache import build_token_cache
+from ml_pipeline.utils.vocab import Vocabulary
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    import argparse
+    
+    config = ModelConfig()
+    
+    parser = argparse.ArgumentParser(description='Build token caches for training')
+    parser.add_argument('data', type=str, nargs='+', help='JSON or JSONL pairs files')
+    parser.add_argument('--src-vocab', type=str, default=config.VOCAB_SAVE_PATH.replace('.json', '_src.json'))
+    parser.add_argument('--tgt-vocab', type=str, default=config.VOCAB_SAVE_PATH.replace('.json', '_tgt.json'))
+    parser.add_argument('--cache-dir', type=str, default=config.TOKEN_CACHE_DIR)
+    args = parser.parse_args()
+    
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.load(args.src_vocab)
+    tgt_vocab.load(args.tgt_vocab)
+    
+    for data_path in args.data:
+        cache_dir = build_token_cache(data_path, src_vocab, tgt_vocab, args.cache_dir)
+        print(f"{data_path} -> {cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
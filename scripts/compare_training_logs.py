@@ -0,0 +1,102 @@
+"""
+Compare training speed across runs recorded in training JSON lines logs
+Usage: python scripts/compare_training_logs.py models/lstm_translator_train_log.jsonl [--threshold 0.1]
+
+Exits with status 1 when the latest run's tokens/sec is more than --threshold
+below the baseline run, so it can gate CI or nightly retraining.
+"""
+
+import sys
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.models.training_log import STEP_PHASES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_runs(paths) -> "OrderedDict[str, dict]":
+    """Group run headers and epoch records by run_id, in file order"""
+    runs = OrderedDict()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                run = runs.setdefault(record['run_id'], {'info': {}, 'epochs': []})
+                if record['type'] == 'run':
+                    run['info'] = record
+                elif record['type'] == 'epoch':
+                    run['epochs'].append(record)
+    return OrderedDict((run_id, run) for run_id, run in runs.items() if run['epochs'])
+
+
+def summarize_run(run: dict) -> dict:
+    """Mean step time, tokens/sec, phase shares and peak RSS over a run's epochs"""
+    epochs = run['epochs']
+    seconds = sum(e['seconds'] for e in epochs)
+    rss = [e['peak_rss_mb'] for e in epochs if e.get('peak_rss_mb') is not None]
+    return {
+        'epochs': len(epochs),
+        'step_ms': 1000 * sum(e['step_seconds'] * e['seconds'] for e in epochs) / seconds,
+        'tokens_per_sec': sum(e['tokens_per_sec'] * e['seconds'] for e in epochs) / seconds,
+        'phase_share': {
+            phase: sum(e['phase_seconds'][phase] for e in epochs) / seconds for phase in STEP_PHASES
+        },
+        'peak_rss_mb': max(rss) if rss else None
+    }
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Compare training speed across runs')
+    parser.add_argument('logs', nargs='+', help='Training JSON lines logs')
+    parser.add_argument('--baseline', type=str, default=None, help='Baseline run_id (default: first run)')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Allowed tokens/sec drop of the latest run vs the baseline')
+    args = parser.parse_args()
+    
+    runs = load_runs(args.logs)
+    if not runs:
+        print("No completed epochs found")
+        return
+    
+    summaries = OrderedDict((run_id, summarize_run(run)) for run_id, run in runs.items())
+    baseline_id = args.baseline or next(iter(summaries))
+    if baseline_id not in summaries:
+        parser.error(f"Unknown baseline run: {baseline_id}")
+    baseline = summaries[baseline_id]['tokens_per_sec']
+    
+    phase_header = "".join(f"{phase:>10}" for phase in STEP_PHASES)
+    print("\n" + "=" * (88 + 10 * len(STEP_PHASES)))
+    print(f"{'Run':<22}{'Setting':<24}{'Epochs':>7}{'ms/batch':>10}{'Tokens/s':>10}{'vs base':>9}"
+          f"{phase_header}{'RSS MB':>8}")
+    print("-" * (88 + 10 * len(STEP_PHASES)))
+    for run_id, summary in summaries.items():
+        info = runs[run_id]['info']
+        setting = (f"{info.get('precision', '?')}/{'compiled' if info.get('compiled') else 'eager'}"
+                   f"/x{info.get('world_size', 1)}")
+        shares = "".join(f"{summary['phase_share'][phase]:>10.0%}" for phase in STEP_PHASES)
+        rss = f"{summary['peak_rss_mb']:>8.0f}" if summary['peak_rss_mb'] is not None else f"{'-':>8}"
+        print(f"{run_id:<22}{setting:<24}{summary['epochs']:>7}{summary['step_ms']:>10.1f}"
+              f"{summary['tokens_per_sec']:>10.0f}{summary['tokens_per_sec'] / baseline - 1:>+9.0%}{shares}{rss}")
+    print("=" * (88 + 10 * len(STEP_PHASES)))
+    
+    latest_id = next(reversed(summaries))
+    drop = 1 - summaries[latest_id]['tokens_per_sec'] / baseline
+    if latest_id != baseline_id and drop > args.threshold:
+        print(f"❌ Regression: run {latest_id} is {drop:.0%} slower than baseline {baseline_id}")
+        sys.exit(1)
+    print(f"✅ Latest run {latest_id} is within {args.threshold:.0%} of baseline {baseline_id}")
+
+
+if __name__ == "__main__":
+    main()
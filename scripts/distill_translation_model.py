@@ -0,0 +1,175 @@
+"""
+Distill the LSTM translator into a small GRU student
+Generates teacher outputs, trains the student, exports it and reports latency/quality
+"""
+
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import torch
+
+from ml_pipeline.config import ModelConfig, StudentConfig, DATA_DIR, MODELS_DIR
+from ml_pipeline.datasets.isl_dataset import ISLTranslationDataset
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.evaluator import ModelEvaluator
+from ml_pipeline.models.distillation_trainer import DistillationTrainer, generate_teacher_corpus
+from ml_pipeline.models.inference_artifact import export_inference_artifact
+from ml_pipeline.models.translator import build_translator
+from ml_pipeline.utils.vocab import Vocabulary
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def load_model(config, checkpoint_path: str, src_vocab: Vocabulary, tgt_vocab: Vocabulary):
+    """Build a model for config and load weights from a checkpoint"""
+    model = build_translator(
+        config.ARCHITECTURE,
+        src_vocab_size=src_vocab.size(),
+        tgt_vocab_size=tgt_vocab.size(),
+        embed_dim=config.EMBED_DIM,
+        hidden_dim=config.HIDDEN_DIM,
+        num_layers=config.NUM_LAYERS,
+        dropout=config.DROPOUT
+    )
+    checkpoint = torch.load(checkpoint_path, map_location="cpu")
+    if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
+        checkpoint = checkpoint['model_state_dict']
+    model.load_state_dict(checkpoint)
+    model.eval()
+    return model
+
+
+def benchmark_model(model, pairs, src_vocab: Vocabulary, tgt_vocab: Vocabulary, max_length: int) -> dict:
+    """Single-sentence latency and translation quality on evaluation pairs"""
+    evaluator = ModelEvaluator()
+    sos_idx = tgt_vocab.word2idx.get('<sos>', 2)
+    eos_idx = tgt_vocab.word2idx.get('<eos>', 3)
+    
+    latencies = []
+    references = []
+    hypotheses = []
+    for item in pairs:
+        src_tensor = torch.tensor([src_vocab.encode(item['english'], add_special_tokens=True)], dtype=torch.long)
+        start = time.perf_counter()
+        indices = model.translate(src_tensor, max_length=max_length, sos_idx=sos_idx, eos_idx=eos_idx)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hypotheses.append(tgt_vocab.decode(indices))
+        references.append([tgt_vocab.decode(tgt_vocab.encode(item['isl']))])
+    
+    quality = evaluator.evaluate_translation(references, hypotheses)
+    exact = np.mean([ref[0] == hyp for ref, hyp in zip(references, hypotheses)])
+    params = sum(p.numel() for p in model.parameters())
+    
+    return {
+        'parameters': params,
+        'size_mb': params * 4 / (1024 * 1024),
+        'latency_ms_mean': float(np.mean(latencies)),
+        'latency_ms_p95': float(np.percentile(latencies, 95)),
+        'bleu': float(quality['bleu']),
+        'rouge_l': float(quality['rouge_l']),
+        'exact_match': float(exact)
+    }
+
+
+def main():
+    import argparse
+    
+    teacher_config = ModelConfig()
+    student_config = StudentConfig()
+    
+    parser = argparse.ArgumentParser(description='Distill the translator into a GRU student')
+    parser.add_argument('--teacher', type=str, default=teacher_config.MODEL_SAVE_PATH, help='Teacher checkpoint')
+    parser.add_argument('--train-data', type=str, nargs='+', default=[teacher_config.TRAIN_DATA_PATH],
+                        help='Training corpora to label with the teacher')
+    parser.add_argument('--val-data', type=str, default=teacher_config.VAL_DATA_PATH)
+    parser.add_argument('--hidden-dim', type=int, default=student_config.HIDDEN_DIM)
+    parser.add_argument('--embed-dim', type=int, default=student_config.EMBED_DIM)
+    parser.add_argument('--epochs', type=int, default=student_config.NUM_EPOCHS)
+    parser.add_argument('--benchmark-pairs', type=int, default=500, help='Validation pairs used for the report')
+    args = parser.parse_args()
+    
+    student_config.HIDDEN_DIM = args.hidden_dim
+    student_config.EMBED_DIM = args.embed_dim
+    student_config.NUM_EPOCHS = args.epochs
+    
+    # Student shares the teacher's vocabularies so soft targets line up
+    src_vocab_path = str(MODELS_DIR / "vocab_src.json")
+    tgt_vocab_path = str(MODELS_DIR / "vocab_tgt.json")
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.load(src_vocab_path)
+    tgt_vocab.load(tgt_vocab_path)
+    
+    logger.info("Loading teacher...")
+    teacher = load_model(teacher_config, args.teacher, src_vocab, tgt_vocab)
+    
+    # Sequence-level distillation data: teacher translations of the corpora
+    teacher_corpus_path = str(DATA_DIR / "teacher_pairs.json")
+    generate_teacher_corpus(teacher, src_vocab, tgt_vocab, args.train_data, teacher_corpus_path,
+                            max_length=teacher_config.MAX_LENGTH)
+    
+    pad = not student_config.BUCKET_BATCHES
+    train_dataset = ISLTranslationDataset(teacher_corpus_path, src_vocab, tgt_vocab, student_config.MAX_LENGTH, pad=pad)
+    val_dataset = ISLTranslationDataset(args.val_data, src_vocab, tgt_vocab, student_config.MAX_LENGTH, pad=pad)
+    train_loader = create_data_loader(train_dataset, batch_size=student_config.BATCH_SIZE, shuffle=True)
+    val_loader = create_data_loader(val_dataset, batch_size=student_config.BATCH_SIZE, shuffle=False)
+    
+    student = build_translator(
+        student_config.ARCHITECTURE,
+        src_vocab_size=src_vocab.size(),
+        tgt_vocab_size=tgt_vocab.size(),
+        embed_dim=student_config.EMBED_DIM,
+        hidden_dim=student_config.HIDDEN_DIM,
+        num_layers=student_config.NUM_LAYERS,
+        dropout=student_config.DROPOUT
+    )
+    
+    trainer = DistillationTrainer(student, teacher, student_config)
+    trainer.train(train_loader, val_loader)
+    
+    # Export best student as a drop-in inference artifact for TranslationService
+    export_inference_artifact(
+        student_config.MODEL_SAVE_PATH, src_vocab_path, tgt_vocab_path,
+        student_config.INFERENCE_MODEL_PATH, student_config
+    )
+    student = load_model(student_config, student_config.MODEL_SAVE_PATH, src_vocab, tgt_vocab)
+    
+    # Latency/quality trade-off on validation pairs
+    torch.set_num_threads(1)
+    with open(args.val_data, 'r', encoding='utf-8') as f:
+        eval_pairs = json.load(f)[:args.benchmark_pairs]
+    report = {
+        'teacher': benchmark_model(teacher, eval_pairs, src_vocab, tgt_vocab, teacher_config.MAX_LENGTH),
+        'student': benchmark_model(student, eval_pairs, src_vocab, tgt_vocab, student_config.MAX_LENGTH)
+    }
+    
+    report_path = DATA_DIR / "distillation_report.json"
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    
+    print("\n" + "=" * 96)
+    print(f"{'Model':<10}{'Params':>12}{'Size MB':>10}{'Mean ms':>10}{'p95 ms':>10}"
+          f"{'BLEU':>10}{'ROUGE-L':>10}{'Exact':>10}")
+    print("-" * 96)
+    for name, row in report.items():
+        print(f"{name:<10}{row['parameters']:>12,}{row['size_mb']:>10.2f}{row['latency_ms_mean']:>10.2f}"
+              f"{row['latency_ms_p95']:>10.2f}{row['bleu']:>10.4f}{row['rouge_l']:>10.4f}{row['exact_match']:>10.4f}")
+    print("=" * 96)
+    print(f"Report saved to {report_path}")
+    print(f"Student artifact: {student_config.INFERENCE_MODEL_PATH}")
+    print("To serve the student, copy it to models/lstm_translator.inference.pt")
+
+
+if __name__ == "__main__":
+    main()
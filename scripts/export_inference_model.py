@@ -0,0 +1,89 @@
+"""
+Export the trained translator to a slim inference artifact
+Drops optimizer state and loss histories, bundles vocabularies and config
+"""
+
+import sys
+import json
+import logging
+import subprocess
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.config import ModelConfig
+from ml_pipeline.models.inference_artifact import export_inference_artifact
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Runs in a fresh interpreter so cold-start time and RSS are not skewed by this process
+COLD_START_SNIPPET = r'''
+import json, sys, time, resource
+sys.path.insert(0, {base_dir!r})
+start = time.perf_counter()
+from services.translation_service import TranslationService
+service = TranslationService(use_inference_artifact={use_artifact!r})
+loaded = service.load_model_if_available()
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"loaded": loaded, "seconds": elapsed, "peak_rss_mb": rss_kb / 1024}}))
+'''
+
+
+def measure_cold_start(use_artifact: bool) -> dict:
+    """Load the translator in a fresh process and report load time and peak RSS"""
+    code = COLD_START_SNIPPET.format(base_dir=str(BASE_DIR), use_artifact=use_artifact)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    import argparse
+    
+    config = ModelConfig()
+    
+    parser = argparse.ArgumentParser(description='Export translator inference artifact')
+    parser.add_argument('--checkpoint', type=str, default=config.MODEL_SAVE_PATH, help='Training checkpoint')
+    parser.add_argument('--src-vocab', type=str, default=str(BASE_DIR / "models" / "vocab_src.json"))
+    parser.add_argument('--tgt-vocab', type=str, default=str(BASE_DIR / "models" / "vocab_tgt.json"))
+    parser.add_argument('--output', type=str, default=config.INFERENCE_MODEL_PATH, help='Artifact path')
+    parser.add_argument('--dtype', type=str, default='fp32', choices=['fp32', 'fp16', 'bf16'],
+                        help='Storage dtype for weights (upcast to fp32 at load)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare cold-start time and peak RSS against the training checkpoint')
+    args = parser.parse_args()
+    
+    content_hash = export_inference_artifact(
+        args.checkpoint, args.src_vocab, args.tgt_vocab, args.output, config, dtype=args.dtype
+    )
+    
+    checkpoint_mb = Path(args.checkpoint).stat().st_size / (1024 * 1024)
+    artifact_mb = Path(args.output).stat().st_size / (1024 * 1024)
+    logger.info(f"Content hash: {content_hash}")
+    logger.info(f"Size: checkpoint {checkpoint_mb:.1f} MB -> artifact {artifact_mb:.1f} MB")
+    
+    if args.benchmark:
+        if Path(args.output).resolve() != Path(config.INFERENCE_MODEL_PATH).resolve():
+            logger.warning("Benchmark measures the artifact at the default path that TranslationService loads")
+        before = measure_cold_start(use_artifact=False)
+        after = measure_cold_start(use_artifact=True)
+        
+        print("\n" + "=" * 60)
+        print(f"{'Format':<22}{'Load (s)':>12}{'Peak RSS (MB)':>16}")
+        print("-" * 60)
+        print(f"{'Training checkpoint':<22}{before['seconds']:>12.3f}{before['peak_rss_mb']:>16.1f}")
+        print(f"{'Inference artifact':<22}{after['seconds']:>12.3f}{after['peak_rss_mb']:>16.1f}")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
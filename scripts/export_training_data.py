@@ -0,0 +1,50 @@
+"""
+Export collected translation pairs for training
+Streams the database into a JSONL file or train/val JSONL shards without loading the table into memory
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.data_collector import DataCollector
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stream collected translation pairs to JSONL')
+    parser.add_argument('--db', type=str, default='data/training_data.db', help='Training data database')
+    parser.add_argument('--output', type=str, default='data/exports/pairs',
+                        help='Shard directory, or a .jsonl file with --single-file')
+    parser.add_argument('--single-file', action='store_true', help='Write one JSONL file without a split')
+    parser.add_argument('--shard-size', type=int, default=10000, help='Pairs per shard file')
+    parser.add_argument('--val-fraction', type=float, default=0.1,
+                        help='Share of distinct English sentences assigned to the val split')
+    parser.add_argument('--all', action='store_true', help='Include unverified pairs')
+    args = parser.parse_args()
+
+    collector = DataCollector(args.db)
+    if args.single_file:
+        collector.export_to_jsonl(args.output, verified_only=not args.all)
+        return
+
+    manifest = collector.export_shards(
+        args.output, shard_size=args.shard_size, val_fraction=args.val_fraction, verified_only=not args.all
+    )
+    for split, info in manifest['splits'].items():
+        print(f"{split:5s} {info['count']:8d} pairs in {len(info['shards'])} shards")
+    print(f"\nTrain with TRAIN_DATA_PATH = VAL_DATA_PATH = '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
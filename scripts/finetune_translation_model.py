@@ -0,0 +1,77 @@
+"""
+Incrementally fine-tune the translator on newly collected data
+Warm-starts from the deployed model, trains on new pairs and feedback corrections
+mixed with a replay sample of the original data, and publishes a new version
+"""
+
+import sys
+import json
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.config import FineTuneConfig
+from ml_pipeline.data_collector import DataCollector
+from ml_pipeline.models.fine_tuning import IncrementalFineTuner
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    import argparse
+
+    config = FineTuneConfig()
+
+    parser = argparse.ArgumentParser(description='Fine-tune the translator on newly collected pairs and feedback')
+    parser.add_argument('--db', type=str, default='data/training_data.db', help='Training data database')
+    parser.add_argument('--train-data', type=str, default=config.TRAIN_DATA_PATH,
+                        help='Original training data to sample replay pairs from')
+    parser.add_argument('--val-data', type=str, default=config.VAL_DATA_PATH,
+                        help='Validation pairs (JSON) used to accept or reject the new version')
+    parser.add_argument('--epochs', type=int, default=config.NUM_EPOCHS)
+    parser.add_argument('--lr', type=float, default=config.LEARNING_RATE)
+    parser.add_argument('--replay-ratio', type=float, default=config.REPLAY_RATIO,
+                        help='Original training pairs replayed per new example')
+    parser.add_argument('--min-new', type=int, default=config.MIN_NEW_EXAMPLES,
+                        help='Skip the run when fewer new examples were collected')
+    parser.add_argument('--verified-only', action='store_true', help='Only use verified translation pairs')
+    parser.add_argument('--no-publish', action='store_true',
+                        help='Keep the new version in the versions directory without serving it')
+    args = parser.parse_args()
+
+    config.TRAIN_DATA_PATH = args.train_data
+    config.VAL_DATA_PATH = args.val_data
+    config.NUM_EPOCHS = args.epochs
+    config.LEARNING_RATE = args.lr
+    config.REPLAY_RATIO = args.replay_ratio
+    config.MIN_NEW_EXAMPLES = args.min_new
+
+    tuner = IncrementalFineTuner(config, DataCollector(args.db))
+    report = tuner.run(publish=not args.no_publish, verified_only=args.verified_only)
+
+    print("\n" + "=" * 60)
+    print(f"Fine-tune {report['status']}: {report['new_examples']} new examples "
+          f"({report['watermarks']['new_pairs']} pairs, {report['watermarks']['new_feedback']} feedback)")
+    if report['status'] != 'skipped':
+        print(f"Version:           v{report['version']:04d} (parent: {report['parent'] or 'base model'})")
+        print(f"Replay examples:   {report['replay_examples']}")
+        print(f"New words:         {report['added_src_words']} source, {report['added_tgt_words']} target")
+        print(f"Val loss:          {report['val_loss_before']:.4f} -> {report['val_loss_after']:.4f}")
+        print(f"New exact match:   {report['new_exact_match_before']:.1%} -> {report['new_exact_match_after']:.1%}")
+        print(f"Time:              {report['seconds']:.1f}s")
+    if report['status'] == 'accepted':
+        target = config.INFERENCE_MODEL_PATH if report['published'] else config.VERSIONS_DIR
+        print(f"Written to:        {target} ({report['content_hash'][:12]})")
+    print("=" * 60)
+
+    logger.info(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
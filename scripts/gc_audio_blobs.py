@@ -0,0 +1,44 @@
+"""
+Garbage-collect the audio blob store
+Deletes stored audio that no audio sample in the database references
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml_pipeline.data_collector import DataCollector
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Delete unreferenced audio blobs')
+    parser.add_argument('--db', type=str, default='data/training_data.db', help='Training data database')
+    parser.add_argument('--audio-dir', type=str, default=None,
+                        help='Blob store directory (default: audio_blobs next to the database)')
+    parser.add_argument('--min-age', type=float, default=3600.0,
+                        help='Keep blobs written within this many seconds')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+    args = parser.parse_args()
+
+    collector = DataCollector(args.db, audio_dir=args.audio_dir)
+    stats = collector.gc_audio_blobs(min_age_seconds=args.min_age, dry_run=args.dry_run)
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"{verb} {stats['deleted']} blobs ({stats['freed_bytes'] / 1e6:.1f} MB)")
+    print(f"Kept {stats['kept']} referenced blobs ({stats['kept_bytes'] / 1e6:.1f} MB) "
+          f"and {stats['recent']} recent files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Hyperparameter sweep for the translation model
+Runs grid or random search trials concurrently, each limited to a fixed number of threads,
+prunes trials that fall clearly behind, and reports validation loss, BLEU, size and latency
+
+Usage:
+    python scripts/sweep_translation_model.py --search random --trials 16 --threads-per-trial 2
+    python scripts/sweep_translation_model.py --search grid --epochs 5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import torch
+
+from ml_pipeline.config import ModelConfig, DATA_DIR, TRAINING_CONFIG
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.models.translator import build_translator
+from ml_pipeline.models.translation_trainer import TranslationTrainer
+from ml_pipeline.utils.vocab import Vocabulary
+from scripts.train_translation_model import create_dataset
+from scripts.distill_translation_model import benchmark_model
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# ModelConfig attributes and the values searched for each
+SEARCH_SPACE = {
+    'EMBED_DIM': [64, 128, 256],
+    'HIDDEN_DIM': [128, 256, 512],
+    'NUM_LAYERS': [1, 2],
+    'DROPOUT': [0.1, 0.3],
+    'LEARNING_RATE': [0.001, 0.003]
+}
+
+
+def expand_search_space(space: dict, search: str, trials: int, seed: int) -> list:
+    """Grid: every combination. Random: `trials` distinct combinations."""
+    names = list(space)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+    if search == 'random':
+        rng = random.Random(seed)
+        combos = rng.sample(combos, min(trials, len(combos)))
+    return combos
+
+
+def _init_worker(threads: int):
+    """Pin each trial process to a fixed thread budget"""
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _should_prune(epoch: int, val_loss: float, best_by_epoch, lock,
+                  prune_margin: float, grace_epochs: int) -> bool:
+    """
+    Record this trial's loss and check it against the best loss any trial
+    reached at the same epoch
+    """
+    with lock:
+        best = best_by_epoch.get(epoch)
+        if best is None or val_loss < best:
+            best_by_epoch[epoch] = val_loss
+            best = val_loss
+    return epoch > grace_epochs and val_loss > best * (1 + prune_margin)
+
+
+def run_trial(trial_id: int, params: dict, base: dict, best_by_epoch, lock) -> dict:
+    """Train one configuration and save its best weights"""
+    config = ModelConfig()
+    for name, value in {**base['config'], **params}.items():
+        setattr(config, name, value)
+    config.ASYNC_CHECKPOINTS = False
+    config.MODEL_SAVE_PATH = os.path.join(base['output_dir'], f'trial_{trial_id:03d}.pth')
+
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.load(base['src_vocab_path'])
+    tgt_vocab.load(base['tgt_vocab_path'])
+
+    train_dataset = create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+    val_dataset = create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
+    train_loader = create_data_loader(train_dataset, batch_size=config.BATCH_SIZE, shuffle=True)
+    val_loader = create_data_loader(val_dataset, batch_size=config.BATCH_SIZE, shuffle=False)
+
+    torch.manual_seed(base['seed'])
+    model = build_translator(
+        config.ARCHITECTURE,
+        src_vocab_size=src_vocab.size(),
+        tgt_vocab_size=tgt_vocab.size(),
+        embed_dim=config.EMBED_DIM,
+        hidden_dim=config.HIDDEN_DIM,
+        num_layers=config.NUM_LAYERS,
+        dropout=config.DROPOUT
+    )
+    trainer = TranslationTrainer(model, config)
+
+    status = 'completed'
+    best_epoch = 0
+    start = time.perf_counter()
+    for epoch in range(1, config.NUM_EPOCHS + 1):
+        trainer.train_epoch(train_loader, epoch)
+        val_loss = trainer.validate(val_loader)
+        trainer.scheduler.step(val_loss)
+
+        if val_loss < trainer.best_val_loss:
+            trainer.best_val_loss = val_loss
+            trainer.patience_counter = 0
+            best_epoch = epoch
+            trainer.save_checkpoint(config.MODEL_SAVE_PATH, epoch, val_loss)
+        else:
+            trainer.patience_counter += 1
+
+        if _should_prune(epoch, val_loss, best_by_epoch, lock,
+                         base['prune_margin'], base['grace_epochs']):
+            status = 'pruned'
+            break
+        if trainer.patience_counter >= TRAINING_CONFIG["early_stopping_patience"]:
+            status = 'early_stopped'
+            break
+
+    return {
+        'trial': trial_id,
+        'params': params,
+        'status': status,
+        'epochs': epoch,
+        'best_epoch': best_epoch,
+        'val_loss': trainer.best_val_loss,
+        'train_seconds': time.perf_counter() - start,
+        'checkpoint': config.MODEL_SAVE_PATH
+    }
+
+
+def evaluate_trial(result: dict, base: dict, src_vocab: Vocabulary, tgt_vocab: Vocabulary, eval_pairs) -> dict:
+    """BLEU, size and single-sentence latency of a trial's best weights"""
+    params = result['params']
+    model = build_translator(
+        base['config']['ARCHITECTURE'],
+        src_vocab_size=src_vocab.size(),
+        tgt_vocab_size=tgt_vocab.size(),
+        embed_dim=params['EMBED_DIM'],
+        hidden_dim=params['HIDDEN_DIM'],
+        num_layers=params['NUM_LAYERS'],
+        dropout=params['DROPOUT']
+    )
+    checkpoint = torch.load(result['checkpoint'], map_location="cpu")
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    return benchmark_model(model, eval_pairs, src_vocab, tgt_vocab, base['config']['MAX_LENGTH'])
+
+
+def mark_frontier(results: list):
+    """Flag trials not beaten on both BLEU and latency by another trial"""
+    evaluated = [r for r in results if 'bleu' in r]
+    for r in evaluated:
+        r['frontier'] = not any(
+            o is not r and o['bleu'] >= r['bleu'] and o['latency_ms_mean'] <= r['latency_ms_mean']
+            and (o['bleu'] > r['bleu'] or o['latency_ms_mean'] < r['latency_ms_mean'])
+            for o in evaluated
+        )
+
+
+def main():
+    import argparse
+
+    config = ModelConfig()
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description='Hyperparameter sweep for the translation model')
+    parser.add_argument('--train-data', type=str, default=config.TRAIN_DATA_PATH)
+    parser.add_argument('--val-data', type=str, default=config.VAL_DATA_PATH)
+    parser.add_argument('--search', choices=['grid', 'random'], default='random')
+    parser.add_argument('--trials', type=int, default=12, help='Number of random-search trials')
+    parser.add_argument('--space', type=str, default=None,
+                        help='JSON file mapping ModelConfig attributes to candidate values')
+    parser.add_argument('--epochs', type=int, default=10, help='Maximum epochs per trial')
+    parser.add_argument('--threads-per-trial', type=int, default=1)
+    parser.add_argument('--parallel', type=int, default=None,
+                        help='Concurrent trials (default: cores / threads per trial)')
+    parser.add_argument('--prune-margin', type=float, default=0.15,
+                        help='Stop a trial whose val loss is this fraction above the best at the same epoch')
+    parser.add_argument('--grace-epochs', type=int, default=2, help='Epochs before pruning applies')
+    parser.add_argument('--benchmark-pairs', type=int, default=200, help='Validation pairs for BLEU/latency')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default=None, help='Sweep directory (default: data/sweeps/<time>)')
+    args = parser.parse_args()
+
+    space = SEARCH_SPACE
+    if args.space:
+        with open(args.space, 'r') as f:
+            space = {**SEARCH_SPACE, **json.load(f)}
+    trials = expand_search_space(space, args.search, args.trials, args.seed)
+    parallel = args.parallel or max(1, cpu_count // args.threads_per_trial)
+
+    output_dir = Path(args.output or DATA_DIR / "sweeps" / time.strftime('%Y%m%d_%H%M%S'))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Shared vocabularies and token caches, built once before trials start
+    config.TRAIN_DATA_PATH = args.train_data
+    config.VAL_DATA_PATH = args.val_data
+    with open(args.train_data, 'r', encoding='utf-8') as f:
+        train_data = json.load(f)
+    src_vocab = Vocabulary()
+    tgt_vocab = Vocabulary()
+    src_vocab.build_vocab([item['english'] for item in train_data], min_freq=config.MIN_FREQ)
+    tgt_vocab.build_vocab([item['isl'] for item in train_data], min_freq=config.MIN_FREQ)
+    src_vocab.save(str(output_dir / 'vocab_src.json'))
+    tgt_vocab.save(str(output_dir / 'vocab_tgt.json'))
+    create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+    create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
+
+    base = {
+        'config': {
+            'ARCHITECTURE': config.ARCHITECTURE,
+            'MAX_LENGTH': config.MAX_LENGTH,
+            'NUM_EPOCHS': args.epochs,
+            'TRAIN_DATA_PATH': args.train_data,
+            'VAL_DATA_PATH': args.val_data
+        },
+        'src_vocab_path': str(output_dir / 'vocab_src.json'),
+        'tgt_vocab_path': str(output_dir / 'vocab_tgt.json'),
+        'output_dir': str(output_dir),
+        'prune_margin': args.prune_margin,
+        'grace_epochs': args.grace_epochs,
+        'seed': args.seed
+    }
+
+    logger.info(f"Running {len(trials)} trials, {parallel} at a time x {args.threads_per_trial} threads")
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    with ctx.Manager() as manager:
+        best_by_epoch = manager.dict()
+        lock = manager.Lock()
+        with ProcessPoolExecutor(max_workers=parallel, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(args.threads_per_trial,)) as pool:
+            futures = [pool.submit(run_trial, i, params, base, best_by_epoch, lock)
+                       for i, params in enumerate(trials)]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                logger.info(f"Trial {result['trial']} {result['status']} after {result['epochs']} epochs: "
+                            f"val loss {result['val_loss']:.4f} {result['params']}")
+
+    # Quality and latency are measured serially on one thread so trials are comparable
+    torch.set_num_threads(1)
+    with open(args.val_data, 'r', encoding='utf-8') as f:
+        eval_pairs = json.load(f)[:args.benchmark_pairs]
+    for result in results:
+        if result['status'] != 'pruned' and os.path.exists(result['checkpoint']):
+            result.update(evaluate_trial(result, base, src_vocab, tgt_vocab, eval_pairs))
+    mark_frontier(results)
+    results.sort(key=lambda r: r['val_loss'])
+
+    results_path = output_dir / 'results.json'
+    with open(results_path, 'w') as f:
+        json.dump({'search': args.search, 'space': space, 'results': results}, f, indent=2)
+
+    print("\n" + "=" * 110)
+    print(f"{'Trial':>6}{'Embed':>7}{'Hidden':>8}{'Layers':>8}{'Drop':>6}{'LR':>8}{'Status':>15}"
+          f"{'Val loss':>10}{'BLEU':>8}{'Size MB':>9}{'Mean ms':>9}{'p95 ms':>8}{'Front':>7}")
+    print("-" * 110)
+    for r in results:
+        p = r['params']
+        evaluated = 'bleu' in r
+        print(f"{r['trial']:>6}{p['EMBED_DIM']:>7}{p['HIDDEN_DIM']:>8}{p['NUM_LAYERS']:>8}{p['DROPOUT']:>6}"
+              f"{p['LEARNING_RATE']:>8}{r['status']:>15}{r['val_loss']:>10.4f}"
+              + (f"{r['bleu']:>8.4f}{r['size_mb']:>9.2f}{r['latency_ms_mean']:>9.2f}{r['latency_ms_p95']:>8.2f}"
+                 f"{'*' if r['frontier'] else '':>7}" if evaluated else f"{'-':>8}{'-':>9}{'-':>9}{'-':>8}{'':>7}"))
+    print("=" * 110)
+    print("* = on the BLEU/latency frontier")
+    print(f"Results saved to {results_path}")
+
+
+if __name__ == "__main__":
+    main()
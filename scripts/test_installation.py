@@ -77,6 +77,97 @@ def test_imports():
     return errors
 
 
+def test_packed_encoder():
+    """Check packed (padded batch) encoding matches unpadded per-sentence results"""
+    print("\nTesting packed-sequence encoder...")
+    
+    try:
+        import torch
+        from ml_pipeline.models.translator import build_translator
+    except ImportError as e:
+        print("  ⚠️  Skipped (PyTorch not installed)")
+        return []
+    
+    errors = []
+    torch.manual_seed(0)
+    sentences = [[2, 5, 6, 7, 3], [2, 8, 3], [2, 9, 10, 11, 12, 13, 3], [2, 4, 3]]
+    batch = torch.zeros(len(sentences), 12, dtype=torch.long)
+    for i, sentence in enumerate(sentences):
+        batch[i, :len(sentence)] = torch.tensor(sentence)
+    
+    for architecture in ["lstm", "gru"]:
+        model = build_translator(architecture, 20, 20, embed_dim=16, hidden_dim=32,
+                                 num_layers=2 if architecture == "lstm" else 1, dropout=0.0)
+        model.eval()
+        with torch.no_grad():
+            batch_state = model.encoder(batch)
+            batch_output = model.translate_batch(batch, max_length=10)
+            for i, sentence in enumerate(sentences):
+                single = torch.tensor([sentence])
+                single_state = model.encoder(single)
+                states = zip(batch_state, single_state) if isinstance(batch_state, tuple) \
+                    else [(batch_state, single_state)]
+                if not all(torch.allclose(b[:, i], s[:, 0], atol=1e-5) for b, s in states):
+                    errors.append(f"{architecture} encoder state differs for sentence {i}")
+                if batch_output[i] != model.translate(single, max_length=10):
+                    errors.append(f"{architecture} translate_batch differs for sentence {i}")
+    
+    if errors:
+        for error in errors:
+            print(f"  ❌ {error}")
+    else:
+        print("  ✅ Packed batch encoding matches per-sentence encoding")
+    return errors
+
+
+def test_teacher_forced_decoder():
+    """Check single-call teacher-forced decoding matches token-by-token decoding"""
+    print("\nTesting teacher-forced decoder...")
+    
+    try:
+        import torch
+        from ml_pipeline.models.translator import build_translator
+    except ImportError as e:
+        print("  ⚠️  Skipped (PyTorch not installed)")
+        return []
+    
+    errors = []
+    torch.manual_seed(0)
+    src = torch.tensor([[2, 5, 6, 7, 3], [2, 8, 3, 0, 0]])
+    tgt = torch.tensor([[2, 9, 10, 11, 3], [2, 12, 3, 0, 0]])
+    
+    for architecture in ["lstm", "gru"]:
+        model = build_translator(architecture, 20, 20, embed_dim=16, hidden_dim=32,
+                                 num_layers=2 if architecture == "lstm" else 1, dropout=0.0)
+        model.train()
+        with torch.no_grad():
+            outputs = model(src, tgt, teacher_forcing_ratio=1.0)
+            
+            state = model.encoder(src)
+            for t in range(1, tgt.size(1)):
+                decoder_input = tgt[:, t - 1].unsqueeze(1)
+                if isinstance(state, tuple):
+                    step, hidden, cell = model.decoder(decoder_input, *state)
+                    state = (hidden, cell)
+                else:
+                    step, state = model.decoder(decoder_input, state)
+                if not torch.allclose(outputs[:, t], step, atol=1e-5):
+                    errors.append(f"{architecture} teacher-forced logits differ at position {t}")
+                    break
+            
+            # Chunked scheduled sampling keeps the (batch, tgt_len, vocab) layout
+            chunked = model(src, tgt, teacher_forcing_ratio=0.5, sampling_chunk=2)
+            if chunked.shape != outputs.shape:
+                errors.append(f"{architecture} chunked sampling output shape {tuple(chunked.shape)}")
+    
+    if errors:
+        for error in errors:
+            print(f"  ❌ {error}")
+    else:
+        print("  ✅ Single-call teacher forcing matches per-token decoding")
+    return errors
+
+
 def test_directories():
     """Test required directories exist"""
     print("\nTesting directory structure...")
@@ -143,6 +234,8 @@ def main():
     
     # Run tests
     import_errors = test_imports()
+    import_errors += test_packed_encoder()
+    import_errors += test_teacher_forced_decoder()
     missing_dirs = test_directories()
     missing_files = test_files()
     
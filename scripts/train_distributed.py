@@ -0,0 +1,191 @@
+"""
+Data-parallel CPU training for the translation model
+Spawns N local processes that train one model together over the gloo backend
+
+Usage:
+    python scripts/train_distributed.py --nproc 4
+    python scripts/train_distributed.py --scaling 1 2 4 8 --train-data data/train_pairs_massive.json
+"""
+
+import os
+import sys
+import json
+import socket
+import logging
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+from ml_pipeline.config import ModelConfig, DATA_DIR
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.models.translator import build_translator
+from ml_pipeline.models.translation_trainer import TranslationTrainer
+from ml_pipeline.utils.vocab import Vocabulary
+from scripts.train_translation_model import prepare_data, create_dataset
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def find_free_port() -> int:
+    """Pick an unused localhost port for the process group rendezvous"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_worker(rank: int, world_size: int, config: ModelConfig, port: int,
+               threads_per_process: int, result_path: str = None, resume: str = None):
+    """Train as one rank of the process group; rank 0 logs, saves and reports"""
+    if rank != 0:
+        logging.getLogger().setLevel(logging.WARNING)
+    torch.set_num_threads(threads_per_process)
+    
+    os.environ['MASTER_ADDR'] = '127.0.0.1'
+    os.environ['MASTER_PORT'] = str(port)
+    dist.init_process_group('gloo', rank=rank, world_size=world_size)
+    
+    try:
+        src_vocab = Vocabulary()
+        tgt_vocab = Vocabulary()
+        src_vocab.load(config.VOCAB_SAVE_PATH.replace('.json', '_src.json'))
+        tgt_vocab.load(config.VOCAB_SAVE_PATH.replace('.json', '_tgt.json'))
+        
+        # Each rank trains on its shard; every rank validates the full set
+        train_dataset = create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+        val_dataset = create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
+        train_loader = create_data_loader(train_dataset, batch_size=config.BATCH_SIZE, shuffle=True,
+                                          num_replicas=world_size, rank=rank)
+        val_loader = create_data_loader(val_dataset, batch_size=config.BATCH_SIZE, shuffle=False)
+        
+        # DDP broadcasts rank 0's initial weights to the other ranks
+        torch.manual_seed(0)
+        model = build_translator(
+            config.ARCHITECTURE,
+            src_vocab_size=src_vocab.size(),
+            tgt_vocab_size=tgt_vocab.size(),
+            embed_dim=config.EMBED_DIM,
+            hidden_dim=config.HIDDEN_DIM,
+            num_layers=config.NUM_LAYERS,
+            dropout=config.DROPOUT
+        )
+        trainer = TranslationTrainer(model, config)
+        resume_from = trainer.last_checkpoint_path if resume == 'last' else resume
+        trainer.train(train_loader, val_loader, resume_from=resume_from)
+        
+        if rank == 0 and result_path:
+            train_seconds = sum(stats['seconds'] for stats in trainer.throughput)
+            epochs = len(trainer.throughput)
+            result = {
+                'processes': world_size,
+                'threads_per_process': threads_per_process,
+                'epochs': epochs,
+                'train_seconds': train_seconds,
+                'samples_per_sec': len(train_dataset) * epochs / train_seconds,
+                'tokens_per_sec': sum(s['tokens_per_sec'] * s['seconds'] for s in trainer.throughput) / train_seconds,
+                'final_train_loss': trainer.train_losses[-1]
+            }
+            with open(result_path, 'w') as f:
+                json.dump(result, f)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch(config: ModelConfig, nproc: int, threads_per_process: int, result_path: str = None,
+           resume: str = None):
+    """Spawn nproc training processes and wait for them to finish"""
+    port = find_free_port()
+    logger.info(f"Launching {nproc} processes x {threads_per_process} threads (gloo, port {port})")
+    mp.spawn(run_worker, args=(nproc, config, port, threads_per_process, result_path, resume),
+             nprocs=nproc, join=True)
+
+
+def scaling_report(config: ModelConfig, process_counts, threads_per_process: int, work_dir: str) -> list:
+    """Train config.NUM_EPOCHS epochs at each process count and collect throughput"""
+    results = []
+    for nproc in process_counts:
+        result_path = os.path.join(work_dir, f'result_{nproc}.json')
+        launch(config, nproc, threads_per_process, result_path)
+        with open(result_path, 'r') as f:
+            results.append(json.load(f))
+    return results
+
+
+def main():
+    import argparse
+    
+    config = ModelConfig()
+    cpu_count = os.cpu_count() or 1
+    
+    parser = argparse.ArgumentParser(description='Data-parallel CPU training (gloo)')
+    parser.add_argument('--nproc', type=int, default=min(4, cpu_count), help='Number of training processes')
+    parser.add_argument('--threads-per-proc', type=int, default=None,
+                        help='torch threads per process (default: cores / processes)')
+    parser.add_argument('--train-data', type=str, default=config.TRAIN_DATA_PATH)
+    parser.add_argument('--val-data', type=str, default=config.VAL_DATA_PATH)
+    parser.add_argument('--epochs', type=int, default=config.NUM_EPOCHS)
+    parser.add_argument('--resume', nargs='?', const='last', default=None,
+                        help='Resume from a checkpoint (default: the last checkpoint of the previous run)')
+    parser.add_argument('--scaling', type=int, nargs='+', default=None,
+                        help='Instead of training, report samples/sec for each process count')
+    parser.add_argument('--scaling-epochs', type=int, default=1, help='Epochs per scaling run')
+    args = parser.parse_args()
+    
+    config.TRAIN_DATA_PATH = args.train_data
+    config.VAL_DATA_PATH = args.val_data
+    config.NUM_EPOCHS = args.epochs
+    
+    if not args.scaling:
+        # Vocabularies and token caches are built once, before the workers start
+        logger.info("Preparing data...")
+        src_vocab, tgt_vocab = prepare_data(config)
+        create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+        create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
+        
+        threads = args.threads_per_proc or max(1, cpu_count // args.nproc)
+        launch(config, args.nproc, threads, resume=args.resume)
+        logger.info(f"Training completed! Model saved to {config.MODEL_SAVE_PATH}")
+        return
+    
+    # Fixed thread budget per process, so added processes use added cores
+    threads = args.threads_per_proc or max(1, cpu_count // max(args.scaling))
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Scaling runs must not overwrite the real model or vocabularies
+        config.MODEL_SAVE_PATH = os.path.join(work_dir, 'scaling.pth')
+        config.VOCAB_SAVE_PATH = os.path.join(work_dir, 'vocab.json')
+        config.NUM_EPOCHS = args.scaling_epochs
+        
+        src_vocab, tgt_vocab = prepare_data(config)
+        create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+        create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
+        results = scaling_report(config, args.scaling, threads, work_dir)
+    
+    report_path = DATA_DIR / "ddp_scaling_report.json"
+    with open(report_path, 'w') as f:
+        json.dump({'cpu_count': cpu_count, 'train_data': args.train_data, 'results': results}, f, indent=2)
+    
+    baseline = results[0]['samples_per_sec'] / results[0]['processes']
+    print("\n" + "=" * 80)
+    print(f"{'Processes':>10}{'Threads/proc':>14}{'Train s':>10}{'Samples/s':>12}"
+          f"{'Tokens/s':>10}{'Speedup':>10}{'Efficiency':>12}")
+    print("-" * 80)
+    for row in results:
+        speedup = row['samples_per_sec'] / baseline
+        print(f"{row['processes']:>10}{row['threads_per_process']:>14}{row['train_seconds']:>10.1f}"
+              f"{row['samples_per_sec']:>12.1f}{row['tokens_per_sec']:>10.0f}{speedup:>9.2f}x"
+              f"{speedup / row['processes']:>11.0%}")
+    print("=" * 80)
+    print(f"Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from ml_pipeline.models.translator import Seq2SeqTranslator
 from ml_pipeline.models.translation_trainer import TranslationTrainer
 from ml_pipeline.datasets.isl_dataset import ISLTranslationDataset
+from ml_pipeline.datasets.bucketing import create_data_loader
+from ml_pipeline.datasets.token_cache import MemmapTranslationDataset, build_token_cache
+from ml_pipeline.datasets.jsonl_shards import iter_records
+from ml_pipeline.datasets.streaming import StreamingTranslationDataset
 from ml_pipeline.utils.vocab import Vocabulary
 from ml_pipeline.config import ModelConfig
-from torch.utils.data import DataLoader
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,17 +30,12 @@ logger = logging.getLogger(__name__)
 
 def prepare_data(config: ModelConfig):
     """Prepare and load vocabularies"""
-    # Load training data
-    with open(config.TRAIN_DATA_PATH, 'r', encoding='utf-8') as f:
-        import json
-        train_data = json.load(f)
-    
-    # Build vocabularies
+    # Build vocabularies (JSONL shards are streamed, one pass per vocabulary)
     src_vocab = Vocabulary()
     tgt_vocab = Vocabulary()
     
-    src_texts = [item['english'] for item in train_data]
-    tgt_texts = [item['isl'] for item in train_data]
+    src_texts = (item['english'] for item in iter_records(config.TRAIN_DATA_PATH))
+    tgt_texts = (item['isl'] for item in iter_records(config.TRAIN_DATA_PATH))
     
     src_vocab.build_vocab(src_texts, min_freq=config.MIN_FREQ)
     tgt_vocab.build_vocab(tgt_texts, min_freq=config.MIN_FREQ)
@@ -52,30 +50,53 @@ def prepare_data(config: ModelConfig):
     return src_vocab, tgt_vocab
 
 
+def create_dataset(config: ModelConfig, data_path: str, src_vocab, tgt_vocab, split: str = "train"):
+    """
+    Memory-mapped token cache dataset, or JSON dataset when the cache is disabled
+    
+    Shard directories from DataCollector.export_shards() (and JSONL files
+    when the cache is disabled) are streamed; split picks the directory's
+    train or val shards.
+    """
+    pad = not config.BUCKET_BATCHES
+    if os.path.isdir(data_path) or (data_path.endswith('.jsonl') and not config.USE_TOKEN_CACHE):
+        return StreamingTranslationDataset(
+            data_path, src_vocab, tgt_vocab, config.MAX_LENGTH, pad=pad, split=split,
+            shuffle_buffer=config.STREAM_SHUFFLE_BUFFER if split == "train" else 0
+        )
+    if config.USE_TOKEN_CACHE:
+        cache_dir = build_token_cache(data_path, src_vocab, tgt_vocab, config.TOKEN_CACHE_DIR)
+        return MemmapTranslationDataset(cache_dir, config.MAX_LENGTH, pad=pad)
+    return ISLTranslationDataset(data_path, src_vocab, tgt_vocab, config.MAX_LENGTH, pad=pad)
+
+
 def main():
     """Main training function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Train the translation model')
+    parser.add_argument('--resume', nargs='?', const='last', default=None,
+                        help='Resume from a checkpoint (default: the last checkpoint of the previous run)')
+    args = parser.parse_args()
+    
     config = ModelConfig()
     
     # Prepare data
     logger.info("Preparing data...")
     src_vocab, tgt_vocab = prepare_data(config)
     
-    # Create datasets
-    train_dataset = ISLTranslationDataset(
-        config.TRAIN_DATA_PATH, src_vocab, tgt_vocab, config.MAX_LENGTH
-    )
-    val_dataset = ISLTranslationDataset(
-        config.VAL_DATA_PATH, src_vocab, tgt_vocab, config.MAX_LENGTH
-    )
+    # Create datasets (unpadded when batches are length-bucketed)
+    train_dataset = create_dataset(config, config.TRAIN_DATA_PATH, src_vocab, tgt_vocab)
+    val_dataset = create_dataset(config, config.VAL_DATA_PATH, src_vocab, tgt_vocab, split="val")
     
     # Create data loaders
-    train_loader = DataLoader(
-        train_dataset, 
-        batch_size=config.BATCH_SIZE, 
+    train_loader = create_data_loader(
+        train_dataset,
+        batch_size=config.BATCH_SIZE,
         shuffle=True,
         num_workers=2
     )
-    val_loader = DataLoader(
+    val_loader = create_data_loader(
         val_dataset,
         batch_size=config.BATCH_SIZE,
         shuffle=False,
@@ -103,7 +124,8 @@ def main():
     trainer = TranslationTrainer(model, config)
     
     # Train
-    trainer.train(train_loader, val_loader)
+    resume_from = trainer.last_checkpoint_path if args.resume == 'last' else args.resume
+    trainer.train(train_loader, val_loader, resume_from=resume_from)
     
     logger.info("Training completed!")
 
@@ -1,4 +1,4 @@
-from flask import Flask, request, send_file, Response, jsonify
+from flask import Flask, request, send_file, Response, jsonify, g
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -45,6 +45,12 @@ except ImportError:
     ISL_MAPPER_AVAILABLE = False
     logging.warning("ISL mapper service not available.")
 
+from services.incremental_translation import get_incremental_translator, SEGMENT_LOOKUPS
+from services.model_status import get_model_status_registry
+from services.phrase_table import get_phrase_table
+from services.warmup import start_background_warmup
+from monitoring import prometheus
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,6 +61,28 @@ app = Flask(__name__, static_folder='.', static_url_path='')
 app.secret_key = os.urandom(24)
 CORS(app, supports_credentials=True)
 
+# Prometheus metrics (served at /metrics). The request timer is registered
+# before the rate limiter's hook so rejected (429) requests are counted too.
+metrics_registry = prometheus.get_registry()
+HTTP_REQUEST_SECONDS = metrics_registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route, method and status',
+    ['route', 'method', 'status'])
+TRANSLATION_SECONDS = metrics_registry.histogram(
+    'translation_duration_seconds', 'English to ISL translation latency by path', ['path'])
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        # Route template, not the raw path, so label values stay bounded
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route, request.method, str(response.status_code))
+    return response
+
 # Rate limiting
 limiter = Limiter(
     app=app,
@@ -330,9 +358,29 @@ def check_java_available():
 
 def convert_eng_to_isl(input_string):
     """
-    Convert English to ISL using ML model (if available) or Stanford Parser (fallback)
+    Convert English to ISL using the phrase table (exact match), ML model (if available)
+    or Stanford Parser (fallback)
     """
-    # Try ML model first if available
+    start = time.perf_counter()
+    path = 'error'
+    try:
+        path, tokens = _convert_eng_to_isl(input_string)
+        return tokens
+    finally:
+        TRANSLATION_SECONDS.observe(time.perf_counter() - start, path)
+
+def _convert_eng_to_isl(input_string):
+    """Translate and report which path produced the result (phrase_table, ml, stanford or fallback)"""
+    # Known utterances: one hash lookup, skips both the model and the parser
+    try:
+        phrase_glosses = get_phrase_table().lookup(input_string)
+        if phrase_glosses:
+            logger.info("Using phrase table (exact match)")
+            return "phrase_table", phrase_glosses
+    except Exception as e:
+        logger.warning(f"Phrase table lookup failed: {e}")
+    
+    # Try ML model next if available
     if ML_TRANSLATION_AVAILABLE:
         try:
             translation_service = get_translation_service()
@@ -340,7 +388,7 @@ def convert_eng_to_isl(input_string):
                 logger.info("Using ML translation model")
                 isl_tokens = translation_service.translate_ml(input_string)
                 if _is_ml_translation_confident(isl_tokens, input_string):
-                    return isl_tokens
+                    return "ml", isl_tokens
                 logger.info("ML translation deemed low confidence, using Stanford Parser fallback")
         except Exception as e:
             logger.warning(f"ML translation failed: {e}, falling back to Stanford Parser")
@@ -355,13 +403,13 @@ def convert_eng_to_isl(input_string):
         logger.warning("Java is not installed. Stanford Parser requires Java.")
         logger.warning("Please install Java (JDK 8 or later) to enable full parsing functionality.")
         # Return simple tokenized input as fallback
-        return input_string.split()
+        return "fallback", input_string.split()
     
     # get all required packages
     download_required_packages()
 
     if len(list(input_string.split(' '))) == 1:
-        return list(input_string.split(' '))
+        return "fallback", list(input_string.split(' '))
 
     try:
         # Initializing stanford parser
@@ -380,12 +428,63 @@ def convert_eng_to_isl(input_string):
         modified_parse_tree = modify_tree_structure(parent_tree)
 
         parsed_sent = modified_parse_tree.leaves()
-        return parsed_sent
+        return "stanford", parsed_sent
     except OSError as e:
         # If Java fails, provide a fallback
         logger.error(f"Stanford Parser failed - {str(e)}")
         logger.warning("Falling back to simple tokenization. Please install Java to enable full parsing.")
-        return input_string.split()
+        return "fallback", input_string.split()
+
+
+def translate_to_isl_glosses(input_string):
+    """
+    Run the full English -> ISL gloss pipeline on one sentence or segment:
+    translation, stop word removal, lemmatization and gloss mapping
+    """
+    try:
+        isl_parsed_token_list = convert_eng_to_isl(input_string)
+    except Exception as e:
+        logger.error(f"Error in convert_eng_to_isl: {e}")
+        # Fallback to simple tokenization
+        isl_parsed_token_list = input_string.split()
+
+    # print("isl_parsed_token_list: " + ' '.join(isl_parsed_token_list))
+
+    # Remove stop words FIRST (before lemmatization to reduce work)
+    try:
+        filtered_tokens = filter_stop_words(isl_parsed_token_list)
+        logger.info(f"After stop word removal: {filtered_tokens}")
+    except Exception as e:
+        logger.error(f"Error in filter_stop_words: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        filtered_tokens = isl_parsed_token_list
+
+    # Lemmatize tokens (convert "learning" -> "learn", "students" -> "student")
+    try:
+        lemmatized_tokens = lemmatize_tokens(filtered_tokens)
+        logger.info(f"After lemmatization: {lemmatized_tokens}")
+    except Exception as e:
+        logger.error(f"Error in lemmatize_tokens: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        # Fallback: just lowercase tokens
+        lemmatized_tokens = [t.lower() for t in filtered_tokens]
+
+    # Map English tokens to ISL glosses (AFTER lemmatization)
+    isl_glosses = lemmatized_tokens
+    if ISL_MAPPER_AVAILABLE:
+        try:
+            isl_mapper = get_isl_mapper()
+            isl_glosses = isl_mapper.map_tokens_to_isl(lemmatized_tokens)
+            logger.info(f"Mapped tokens: {lemmatized_tokens} -> {isl_glosses}")
+        except Exception as e:
+            logger.warning(f"ISL mapping failed: {e}, using original tokens")
+            import traceback
+            logger.warning(traceback.format_exc())
+            isl_glosses = lemmatized_tokens
+
+    return isl_glosses
 
 
 def pre_process(sentence):
@@ -419,6 +518,21 @@ def pre_process(sentence):
     
     return final_string
 
+def collect_audio_sample(filename, audio_bytes, result):
+    """Keep transcribed audio in the data collector when COLLECT_AUDIO=1 (never fails the request)"""
+    if os.getenv("COLLECT_AUDIO", "0") != "1":
+        return
+    try:
+        from ml_pipeline.data_collector import get_data_collector
+        get_data_collector().add_audio_sample(
+            filename, result['text'],
+            language=result.get('language', 'en'),
+            metadata={'source': 'asr_transcription'},
+            audio_data=audio_bytes
+        )
+    except Exception as e:
+        logger.warning(f"Failed to collect audio sample: {e}")
+
 @app.route('/api/transcribe', methods=['POST'])
 @limiter.limit("10 per minute")
 def transcribe_audio():
@@ -479,6 +593,8 @@ def transcribe_audio():
                 try:
                     asr_service = get_asr_service(model_size="base")
                     result = asr_service.transcribe(temp_path)
+                    with open(temp_path, 'rb') as f:
+                        collect_audio_sample(filename, f.read(), result)
                     
                     return json.dumps({
                         'text': result['text'],
@@ -515,6 +631,7 @@ def transcribe_audio():
             # Transcribe
             asr_service = get_asr_service(model_size="base")
             result = asr_service.transcribe_bytes(audio_bytes)
+            collect_audio_sample('audio_data', audio_bytes, result)
             
             return json.dumps({
                 'text': result['text'],
@@ -535,39 +652,45 @@ def transcribe_audio():
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    whisper_status = WHISPER_AVAILABLE
-    if WHISPER_AVAILABLE:
-        try:
-            asr_service = get_asr_service()
-            whisper_status = asr_service.is_available()
-        except:
-            whisper_status = False
-    
-    # Check ML translation model
-    ml_translation_status = False
-    if ML_TRANSLATION_AVAILABLE:
-        try:
-            ml_translation_status = is_ml_model_available()
-        except:
-            ml_translation_status = False
+    """Health check endpoint (reads model status only, never loads models)"""
+    registry = get_model_status_registry()
     
     return json.dumps({
         'status': 'healthy',
-        'whisper_available': whisper_status,
-        'ml_translation_available': ml_translation_status
+        'ready': registry.is_ready(),
+        'whisper_available': WHISPER_AVAILABLE and registry.is_model_ready('whisper'),
+        'ml_translation_available': ML_TRANSLATION_AVAILABLE and registry.is_model_ready('translator'),
+        **registry.snapshot()
     }), 200, {'Content-Type': 'application/json'}
 
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return json.dumps({'status': 'alive'}), 200, {'Content-Type': 'application/json'}
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: startup warmup has finished and no model is mid-load"""
+    registry = get_model_status_registry()
+    ready = registry.is_ready()
+    
+    return json.dumps({
+        'status': 'ready' if ready else 'warming_up',
+        **registry.snapshot()
+    }), 200 if ready else 503, {'Content-Type': 'application/json'}
+
+
 @app.route('/api/annotations', methods=['POST'])
 @limiter.limit("20 per minute")
 def add_annotation():
     """Add translation pair annotation"""
     try:
-        from ml_pipeline.data_collector import DataCollector
+        from ml_pipeline.data_collector import get_data_collector
         
         data = request.get_json()
-        collector = DataCollector()
+        collector = get_data_collector()
         
         pair_id = collector.add_translation_pair(
             english_text=data.get('english_text'),
@@ -591,15 +714,87 @@ def add_annotation():
         }), 500, {'Content-Type': 'application/json'}
 
 
+@app.route('/api/annotations/bulk', methods=['POST'])
+@limiter.limit("10 per minute")
+def add_annotations_bulk():
+    """Import a JSONL or CSV batch of translation pairs with a per-row result summary"""
+    try:
+        from ml_pipeline.data_collector import get_data_collector
+        from ml_pipeline.utils.bulk_import import detect_format, iter_rows, import_pairs
+
+        fmt = detect_format(request.content_type, request.args.get('format'))
+        # Read the body as a stream so large uploads are never buffered whole
+        rows = iter_rows(request.stream, fmt)
+        summary = import_pairs(get_data_collector(), rows)
+        logger.info(f"Bulk import: {summary['inserted']}/{summary['total']} rows inserted")
+
+        return json.dumps({
+            **summary,
+            'format': fmt,
+            'success': True
+        }), 200, {'Content-Type': 'application/json'}
+
+    except ValueError as e:
+        return json.dumps({
+            'error': str(e),
+            'success': False
+        }), 400, {'Content-Type': 'application/json'}
+    except Exception as e:
+        logger.error(f"Bulk annotation error: {str(e)}")
+        return json.dumps({
+            'error': str(e),
+            'success': False
+        }), 500, {'Content-Type': 'application/json'}
+
+
+@app.route('/api/annotations', methods=['GET'])
+@limiter.limit("120 per minute")
+def list_annotations():
+    """Browse translation pairs, newest first, one keyset-paginated page at a time"""
+    try:
+        from ml_pipeline.data_collector import get_data_collector, DEFAULT_PAGE_SIZE
+
+        verified = request.args.get('verified')
+        if verified is not None:
+            verified = verified.lower() in ('1', 'true', 'yes')
+        cursor = request.args.get('cursor')
+
+        page = get_data_collector().query_translation_pairs(
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+            cursor_id=int(cursor) if cursor else None,
+            source=request.args.get('source'),
+            verified=verified,
+            created_after=request.args.get('since'),
+            created_before=request.args.get('until')
+        )
+
+        return json.dumps({
+            **page,
+            'success': True
+        }), 200, {'Content-Type': 'application/json'}
+
+    except ValueError as e:
+        return json.dumps({
+            'error': f'Invalid query parameter: {e}',
+            'success': False
+        }), 400, {'Content-Type': 'application/json'}
+    except Exception as e:
+        logger.error(f"Annotation listing error: {str(e)}")
+        return json.dumps({
+            'error': str(e),
+            'success': False
+        }), 500, {'Content-Type': 'application/json'}
+
+
 @app.route('/api/feedback', methods=['POST'])
 @limiter.limit("30 per minute")
 def add_feedback():
     """Add user feedback on translation"""
     try:
-        from ml_pipeline.data_collector import DataCollector
+        from ml_pipeline.data_collector import get_data_collector
         
         data = request.get_json()
-        collector = DataCollector()
+        collector = get_data_collector()
         
         feedback_id = collector.add_feedback(
             translation_pair_id=data.get('translation_pair_id'),
@@ -650,6 +845,16 @@ def get_evaluation_metrics():
         return json.dumps({'error': str(e)}), 500, {'Content-Type': 'application/json'}
 
 
+@app.route('/api/phrase-table/stats', methods=['GET'])
+def phrase_table_stats():
+    """Phrase table size and exact-match hit rate since startup"""
+    try:
+        return json.dumps(get_phrase_table().stats()), 200, {'Content-Type': 'application/json'}
+    except Exception as e:
+        logger.error(f"Phrase table stats error: {str(e)}")
+        return json.dumps({'error': str(e)}), 500, {'Content-Type': 'application/json'}
+
+
 @app.route('/evaluation-dashboard', methods=['GET'])
 def evaluation_dashboard():
     """Serve evaluation dashboard HTML"""
@@ -659,9 +864,57 @@ def evaluation_dashboard():
     return "Evaluation dashboard not found", 404
 
 
+def _cache_hit_ratios():
+    stats = get_phrase_table().stats()
+    yield ('phrase_table',), stats['hit_rate']
+    hits = SEGMENT_LOOKUPS.value('hit')
+    misses = SEGMENT_LOOKUPS.value('miss')
+    yield ('incremental_segments',), hits / (hits + misses) if hits + misses else 0.0
+
+def _phrase_table_lookups():
+    stats = get_phrase_table().stats()
+    yield ('hit',), stats['hits']
+    yield ('miss',), stats['misses']
+
+def _queue_depths():
+    if os.getenv("DATA_WRITE_BEHIND", "0") == "1":
+        from ml_pipeline.data_collector import get_data_collector
+        writer = get_data_collector().writer
+        if writer is not None:
+            yield ('write_behind',), writer.pending()
+
+def _incremental_sessions():
+    yield (), get_incremental_translator(translate_incremental_segment).active_sessions()
+
+def _model_load_seconds():
+    for name, entry in get_model_status_registry().snapshot()['models'].items():
+        if entry['load_seconds'] is not None:
+            yield (name,), entry['load_seconds']
+
+def _model_states():
+    for name, entry in get_model_status_registry().snapshot()['models'].items():
+        yield (name, entry['state']), 1
+
+metrics_registry.gauge_callback('cache_hit_ratio', 'Cache hit ratio since startup', ['cache'], _cache_hit_ratios)
+metrics_registry.counter_callback('phrase_table_lookups_total', 'Phrase table lookups by result (hit/miss)',
+                                  ['result'], _phrase_table_lookups)
+metrics_registry.gauge_callback('queue_depth', 'Items waiting in internal queues', ['queue'], _queue_depths)
+metrics_registry.gauge_callback('incremental_sessions_active', 'Incremental translation sessions held in memory',
+                                [], _incremental_sessions)
+metrics_registry.gauge_callback('model_load_seconds', 'Time taken to load each model', ['model'], _model_load_seconds)
+metrics_registry.gauge_callback('model_state', 'Model load state (1 for the current state)',
+                                ['model', 'state'], _model_states)
+
+@app.route('/metrics', methods=['GET'])
+@limiter.exempt
+def prometheus_metrics():
+    """Prometheus text exposition of request, translation, ASR, cache, queue and model metrics"""
+    return metrics_registry.render(), 200, {'Content-Type': prometheus.CONTENT_TYPE}
+
+
 @app.route('/api/system/health', methods=['GET'])
 def system_health():
-    """Get detailed system health metrics"""
+    """Get detailed system health metrics (from the background sampler, returns immediately)"""
     try:
         from monitoring.health_check import get_system_health, check_service_health
         
@@ -700,48 +953,7 @@ def parseit():
         input_string = input_string.capitalize()
         # input_string = input_string.lower()
         
-        try:
-            isl_parsed_token_list = convert_eng_to_isl(input_string)
-        except Exception as e:
-            logger.error(f"Error in convert_eng_to_isl: {e}")
-            # Fallback to simple tokenization
-            isl_parsed_token_list = input_string.split()
-        
-        # print("isl_parsed_token_list: " + ' '.join(isl_parsed_token_list))
-
-        # Remove stop words FIRST (before lemmatization to reduce work)
-        try:
-            filtered_tokens = filter_stop_words(isl_parsed_token_list)
-            logger.info(f"After stop word removal: {filtered_tokens}")
-        except Exception as e:
-            logger.error(f"Error in filter_stop_words: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            filtered_tokens = isl_parsed_token_list
-
-        # Lemmatize tokens (convert "learning" -> "learn", "students" -> "student")
-        try:
-            lemmatized_tokens = lemmatize_tokens(filtered_tokens)
-            logger.info(f"After lemmatization: {lemmatized_tokens}")
-        except Exception as e:
-            logger.error(f"Error in lemmatize_tokens: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            # Fallback: just lowercase tokens
-            lemmatized_tokens = [t.lower() for t in filtered_tokens]
-
-        # Map English tokens to ISL glosses (AFTER lemmatization)
-        isl_glosses = lemmatized_tokens
-        if ISL_MAPPER_AVAILABLE:
-            try:
-                isl_mapper = get_isl_mapper()
-                isl_glosses = isl_mapper.map_tokens_to_isl(lemmatized_tokens)
-                logger.info(f"Mapped tokens: {lemmatized_tokens} -> {isl_glosses}")
-            except Exception as e:
-                logger.warning(f"ISL mapping failed: {e}, using original tokens")
-                import traceback
-                logger.warning(traceback.format_exc())
-                isl_glosses = lemmatized_tokens
+        isl_glosses = translate_to_isl_glosses(input_string)
 
         isl_text_string = ""
 
@@ -791,6 +1003,59 @@ def parseit():
         }), 500, {'Content-Type': 'application/json'}
 
 
+def translate_incremental_segment(segment):
+    """Translate one clause of an incremental transcript"""
+    return translate_to_isl_glosses(segment.capitalize())
+
+@app.route('/api/translate/incremental', methods=['POST'])
+def translate_incremental():
+    """
+    Incremental translation for streaming partial transcripts.
+    Returns a stable gloss prefix the avatar can start signing right away
+    and a provisional tail that may still change.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        session_id = str(data.get('session_id', '')).strip()
+        transcript = data.get('transcript', '')
+        final = bool(data.get('final', False))
+
+        if not session_id:
+            return json.dumps({'error': 'session_id is required'}), 400, {'Content-Type': 'application/json'}
+
+        translator = get_incremental_translator(translate_incremental_segment)
+        result = translator.update(session_id, transcript, final=final)
+
+        stable_text = ' '.join(result['stable_glosses']).lower().strip()
+        provisional_text = ' '.join(result['provisional_glosses']).lower().strip()
+
+        try:
+            stable_pre_processed = pre_process(stable_text) if stable_text else ''
+            provisional_pre_processed = pre_process(provisional_text) if provisional_text else ''
+        except Exception as e:
+            logger.error(f"Error in pre_process: {e}")
+            stable_pre_processed = stable_text
+            provisional_pre_processed = provisional_text
+
+        return json.dumps({
+            'session_id': session_id,
+            'stable_isl_text': stable_text,
+            'stable_pre_process_string': stable_pre_processed,
+            'provisional_isl_text': provisional_text,
+            'provisional_pre_process_string': provisional_pre_processed,
+            'stable_segments': result['stable_segments'],
+            'cached_segments': result['cached_segments'],
+            'final': result['final']
+        }), 200, {'Content-Type': 'application/json'}
+
+    except Exception as e:
+        logger.error(f"Incremental translation error: {str(e)}")
+        return json.dumps({
+            'error': f'Incremental translation failed: {str(e)}',
+            'success': False
+        }), 500, {'Content-Type': 'application/json'}
+
+
 @app.route('/')
 def index():
     return app.send_static_file('index.html')
@@ -1071,8 +1336,21 @@ def serve_h2s_xsl():
     except Exception as e:
         return Response(f'Error: {str(e)}', status=500, mimetype='text/plain')
 
+def exit_on_sigterm(signum, frame):
+    """
+    Turn SIGTERM into a normal interpreter exit
+
+    Python's default SIGTERM action kills the process without running
+    atexit handlers, which drain the write-behind queue and the metrics
+    writer. As PID 1 in a container the signal is ignored instead, until
+    the runtime escalates to SIGKILL.
+    """
+    logger.info("Received SIGTERM, shutting down")
+    sys.exit(0)
+
 if __name__ == "__main__":
     import argparse
+    import signal
     
     parser = argparse.ArgumentParser(description='Audio-to-Sign-Language Converter Server')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Host to bind to')
@@ -1086,4 +1364,14 @@ if __name__ == "__main__":
     logger.info(f"Starting server on {args.host}:{args.port}")
     logger.info(f"Debug mode: {args.debug}")
     
+    # The debug reloader installs the same handler in its own processes
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
+    
+    # With the debug reloader, only warm models in the serving child process
+    if not args.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_warmup()
+        # Start sampling now so /api/system/health has full windows sooner
+        from monitoring.health_check import get_health_sampler
+        get_health_sampler()
+    
     app.run(host=args.host, port=args.port, debug=args.debug)
@@ -6,12 +6,25 @@ Uses OpenAI Whisper base model for accurate speech-to-text conversion
 import whisper
 import torch
 import os
+import time
 import logging
+import threading
 from typing import Optional, Dict
 import tempfile
 
+from services.model_status import get_model_status_registry
+from monitoring.prometheus import get_registry
+
 logger = logging.getLogger(__name__)
 
+ASR_AUDIO_SECONDS = get_registry().counter(
+    'asr_audio_seconds_total', 'Seconds of audio transcribed')
+ASR_PROCESSING_SECONDS = get_registry().counter(
+    'asr_processing_seconds_total', 'Seconds spent transcribing audio')
+ASR_REAL_TIME_FACTOR = get_registry().histogram(
+    'asr_real_time_factor', 'Transcription time divided by audio duration',
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0))
+
 class ASRService:
     """Automatic Speech Recognition service using Whisper"""
     
@@ -28,19 +41,38 @@ class ASRService:
         self.model = None
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self._model_loaded = False
+        self._load_lock = threading.Lock()
         
     def load_model(self):
-        """Lazy load model to reduce startup time"""
-        if not self._model_loaded:
+        """Lazy load model to reduce startup time (safe to call from concurrent requests)"""
+        if self._model_loaded:
+            return
+        with self._load_lock:
+            if self._model_loaded:
+                return
+            registry = get_model_status_registry()
+            registry.mark_loading('whisper')
+            start = time.perf_counter()
             try:
                 logger.info(f"Loading Whisper {self.model_size} model on {self.device}...")
                 self.model = whisper.load_model(self.model_size, device=self.device)
                 self._model_loaded = True
+                registry.mark_ready('whisper', time.perf_counter() - start)
                 logger.info(f"Whisper model loaded successfully on {self.device}")
             except Exception as e:
+                registry.mark_failed('whisper', str(e))
                 logger.error(f"Failed to load Whisper model: {str(e)}")
                 raise
     
+    def warm_up(self):
+        """Run one transcription on a second of silence so first real requests are fast"""
+        import numpy as np
+        
+        self.load_model()
+        silence = np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32)
+        self.model.transcribe(silence, language="en", fp16=False, verbose=None)
+        logger.info("Whisper model warmed up")
+    
     def transcribe(self, audio_file_path: str, language: str = "en") -> Dict[str, any]:
         """
         Transcribe audio file to text
@@ -54,7 +86,8 @@ class ASRService:
             {
                 'text': str,  # Transcribed text
                 'language': str,  # Detected language
-                'segments': list  # Timestamped segments
+                'segments': list,  # Timestamped segments
+                'duration': float  # Audio length in seconds
             }
         """
         if not self._model_loaded:
@@ -67,20 +100,32 @@ class ASRService:
             if not os.path.exists(audio_file_path):
                 raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
             
-            # Try to load and transcribe
+            # Decode once up front so the audio duration is known for the
+            # real-time factor; transcribe() accepts the decoded samples
+            start = time.perf_counter()
+            audio = whisper.load_audio(audio_file_path)
+            duration = len(audio) / whisper.audio.SAMPLE_RATE
+            
             # Use fp16=False for CPU compatibility and better error handling
             result = self.model.transcribe(
-                audio_file_path,
+                audio,
                 language=language,
                 task="transcribe",
                 fp16=False,  # Use FP32 for CPU compatibility
                 verbose=False  # Reduce output
             )
             
+            elapsed = time.perf_counter() - start
+            ASR_PROCESSING_SECONDS.inc(amount=elapsed)
+            if duration > 0:
+                ASR_AUDIO_SECONDS.inc(amount=duration)
+                ASR_REAL_TIME_FACTOR.observe(elapsed / duration)
+            
             return {
                 'text': result['text'].strip(),
                 'language': result.get('language', language),
-                'segments': result.get('segments', [])
+                'segments': result.get('segments', []),
+                'duration': duration
             }
         except FileNotFoundError as e:
             logger.error(f"File not found: {str(e)}")
@@ -140,7 +185,7 @@ class ASRService:
                     pass
     
     def is_available(self) -> bool:
-        """Check if Whisper service is available"""
+        """Check if Whisper service is available (loads the model if needed)"""
         try:
             if not self._model_loaded:
                 self.load_model()
@@ -151,11 +196,14 @@ class ASRService:
 
 # Global instance (singleton pattern)
 _asr_service_instance = None
+_asr_service_lock = threading.Lock()
 
 def get_asr_service(model_size: str = "base", device: Optional[str] = None) -> ASRService:
     """Get or create ASR service instance (singleton)"""
     global _asr_service_instance
     if _asr_service_instance is None:
-        _asr_service_instance = ASRService(model_size=model_size, device=device)
+        with _asr_service_lock:
+            if _asr_service_instance is None:
+                _asr_service_instance = ASRService(model_size=model_size, device=device)
     return _asr_service_instance
 
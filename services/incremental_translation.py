@@ -0,0 +1,207 @@
+"""
+Incremental Translation Service
+Retranslates growing partial transcripts from continuous listening sessions
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from monitoring.prometheus import get_registry
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_LOOKUPS = get_registry().counter(
+    'incremental_segment_lookups_total',
+    'Incremental translation segment cache lookups by result (hit/miss)', ['result'])
+
+# Clause boundaries: punctuation, or a conjunction that starts a new clause
+CLAUSE_PUNCTUATION = re.compile(r'(?<=[,.;:!?])\s+')
+CLAUSE_CONJUNCTIONS = {
+    'and', 'but', 'because', 'so', 'or', 'then', 'while', 'when',
+    'after', 'before', 'although', 'though', 'if', 'unless'
+}
+MIN_CLAUSE_WORDS = 2
+
+
+def split_clauses(text: str) -> List[str]:
+    """
+    Split transcript into clause segments
+
+    A conjunction only starts a new clause when the clause before it has at
+    least MIN_CLAUSE_WORDS words, so "bread and butter" stays together.
+
+    Args:
+        text: Partial or complete transcript
+
+    Returns:
+        List of clause strings (whitespace normalized)
+    """
+    text = re.sub(r'\s+', ' ', text).strip()
+    if not text:
+        return []
+
+    segments = []
+    for chunk in CLAUSE_PUNCTUATION.split(text):
+        current = []
+        for word in chunk.split(' '):
+            if (word.lower() in CLAUSE_CONJUNCTIONS
+                    and len(current) >= MIN_CLAUSE_WORDS):
+                segments.append(' '.join(current))
+                current = []
+            current.append(word)
+        if current:
+            segments.append(' '.join(current))
+    return segments
+
+
+class IncrementalSession:
+    """Per-session cache of translated clause segments"""
+
+    def __init__(self):
+        self.segments: List[Tuple[str, List[str]]] = []
+        self.tail: Optional[Tuple[str, List[str]]] = None
+        self.last_seen = time.time()
+
+
+class IncrementalTranslator:
+    """Translate partial transcripts, reusing results for stable clauses"""
+
+    def __init__(self, translate_fn: Callable[[str], List[str]],
+                 max_sessions: int = 1000, session_ttl: float = 300.0):
+        """
+        Initialize incremental translator
+
+        Args:
+            translate_fn: Function mapping an English segment to ISL glosses
+            max_sessions: Maximum number of concurrent sessions kept in memory
+            session_ttl: Seconds of inactivity before a session is dropped
+        """
+        self.translate_fn = translate_fn
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self._sessions: "OrderedDict[str, IncrementalSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_session(self, session_id: str) -> IncrementalSession:
+        """Get or create a session, evicting expired or excess sessions"""
+        now = time.time()
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                session = IncrementalSession()
+
+            # Oldest sessions are at the front
+            while self._sessions:
+                oldest_id, oldest = next(iter(self._sessions.items()))
+                if (now - oldest.last_seen > self.session_ttl
+                        or len(self._sessions) >= self.max_sessions):
+                    del self._sessions[oldest_id]
+                else:
+                    break
+
+            session.last_seen = now
+            self._sessions[session_id] = session
+            return session
+
+    def _translate_segment(self, segment: str) -> List[str]:
+        """Translate one segment, falling back to its words on error"""
+        try:
+            return list(self.translate_fn(segment))
+        except Exception as e:
+            logger.warning(f"Incremental segment translation failed: {e}")
+            return segment.lower().split()
+
+    def _cached_tail(self, session: IncrementalSession, text: str) -> List[str]:
+        """Reuse the previous tail translation if the segment text is unchanged"""
+        if session.tail is not None and session.tail[0] == text:
+            SEGMENT_LOOKUPS.inc('hit')
+            return session.tail[1]
+        SEGMENT_LOOKUPS.inc('miss')
+        return self._translate_segment(text)
+
+    def update(self, session_id: str, transcript: str, final: bool = False) -> Dict:
+        """
+        Translate the latest partial transcript for a session
+
+        Every clause except the last is treated as stable and is translated
+        once; the trailing clause is retranslated whenever its text changes
+        until the transcript is marked final.
+
+        Args:
+            session_id: Client session identifier
+            transcript: Full partial transcript received so far
+            final: True when the transcript is complete
+
+        Returns:
+            Dictionary with stable and provisional gloss lists
+        """
+        session = self._get_session(session_id)
+        segments = split_clauses(transcript)
+        stable_count = len(segments) if final else max(len(segments) - 1, 0)
+
+        # Reuse cached translations for the unchanged stable prefix
+        reused = 0
+        for (cached_text, _), text in zip(session.segments, segments[:stable_count]):
+            if cached_text != text:
+                break
+            reused += 1
+        if reused:
+            SEGMENT_LOOKUPS.inc('hit', amount=reused)
+
+        stable = session.segments[:reused]
+        for text in segments[reused:stable_count]:
+            stable.append((text, self._cached_tail(session, text)))
+
+        provisional: List[str] = []
+        if stable_count < len(segments):
+            provisional = self._cached_tail(session, segments[-1])
+            session.tail = (segments[-1], provisional)
+
+        if final:
+            self.end_session(session_id)
+        else:
+            session.segments = stable
+
+        stable_glosses = [gloss for _, glosses in stable for gloss in glosses]
+        logger.debug(
+            f"Incremental session {session_id}: {reused} cached, "
+            f"{len(stable) - reused} translated, tail={'yes' if provisional else 'no'}"
+        )
+
+        return {
+            'stable_glosses': stable_glosses,
+            'provisional_glosses': provisional,
+            'stable_segments': len(stable),
+            'cached_segments': reused,
+            'final': final
+        }
+
+    def end_session(self, session_id: str):
+        """Drop cached state for a session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def active_sessions(self) -> int:
+        """Number of sessions currently cached"""
+        with self._lock:
+            return len(self._sessions)
+
+
+# Global instance
+_incremental_translator = None
+_incremental_translator_lock = threading.Lock()
+
+def get_incremental_translator(translate_fn: Optional[Callable[[str], List[str]]] = None) -> IncrementalTranslator:
+    """Get or create incremental translator instance"""
+    global _incremental_translator
+    if _incremental_translator is None:
+        with _incremental_translator_lock:
+            if _incremental_translator is None:
+                if translate_fn is None:
+                    raise ValueError("translate_fn is required to create the incremental translator")
+                _incremental_translator = IncrementalTranslator(translate_fn)
+    return _incremental_translator
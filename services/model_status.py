@@ -0,0 +1,114 @@
+"""
+Model Status Registry
+Tracks model load state so health probes can report readiness without loading models
+"""
+
+import time
+import threading
+from typing import Dict, Optional
+
+# Model states
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+UNAVAILABLE = "unavailable"
+
+# Warmup states
+WARMUP_DISABLED = "disabled"
+WARMUP_RUNNING = "running"
+WARMUP_COMPLETE = "complete"
+
+
+class ModelStatusRegistry:
+    """Thread-safe registry of model load states"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict] = {}
+        self._warmup_state = WARMUP_DISABLED
+        self._warmup_started_at: Optional[float] = None
+        self._warmup_finished_at: Optional[float] = None
+
+    def _update(self, name: str, **fields):
+        """Update fields of a model entry, creating it if needed"""
+        with self._lock:
+            entry = self._models.setdefault(name, {
+                'state': NOT_LOADED,
+                'load_seconds': None,
+                'error': None,
+                'updated_at': None
+            })
+            entry.update(fields)
+            entry['updated_at'] = time.time()
+
+    def mark_loading(self, name: str):
+        """Record that a model load has started"""
+        self._update(name, state=LOADING, error=None)
+
+    def mark_ready(self, name: str, load_seconds: Optional[float] = None):
+        """Record that a model is loaded and usable"""
+        self._update(name, state=READY, load_seconds=load_seconds, error=None)
+
+    def mark_failed(self, name: str, error: str):
+        """Record that a model load failed"""
+        self._update(name, state=FAILED, error=error)
+
+    def mark_unavailable(self, name: str, reason: str):
+        """Record that a model is not installed/trained (fallback will be used)"""
+        self._update(name, state=UNAVAILABLE, error=reason)
+
+    def get_state(self, name: str) -> str:
+        """Get current state of a model"""
+        with self._lock:
+            entry = self._models.get(name)
+            return entry['state'] if entry else NOT_LOADED
+
+    def is_model_ready(self, name: str) -> bool:
+        """Check if a model is loaded"""
+        return self.get_state(name) == READY
+
+    def mark_warmup_running(self):
+        """Record that background warmup has started"""
+        with self._lock:
+            self._warmup_state = WARMUP_RUNNING
+            self._warmup_started_at = time.time()
+
+    def mark_warmup_complete(self):
+        """Record that background warmup has finished"""
+        with self._lock:
+            self._warmup_state = WARMUP_COMPLETE
+            self._warmup_finished_at = time.time()
+
+    def is_ready(self) -> bool:
+        """
+        Readiness: no warmup is in progress and no model is mid-load.
+        Models that failed or are unavailable do not block readiness because
+        the server falls back to rule-based translation and browser ASR.
+        """
+        with self._lock:
+            if self._warmup_state == WARMUP_RUNNING:
+                return False
+            return all(entry['state'] != LOADING for entry in self._models.values())
+
+    def snapshot(self) -> Dict:
+        """Get a copy of all model states"""
+        with self._lock:
+            warmup_seconds = None
+            if self._warmup_started_at and self._warmup_finished_at:
+                warmup_seconds = self._warmup_finished_at - self._warmup_started_at
+            return {
+                'models': {name: dict(entry) for name, entry in self._models.items()},
+                'warmup': {
+                    'state': self._warmup_state,
+                    'seconds': warmup_seconds
+                }
+            }
+
+
+# Global instance
+_model_status_registry = ModelStatusRegistry()
+
+def get_model_status_registry() -> ModelStatusRegistry:
+    """Get the process-wide model status registry"""
+    return _model_status_registry
@@ -0,0 +1,154 @@
+"""
+Phrase Table Service
+Exact-match English -> ISL gloss lookup compiled from curated translation pairs
+"""
+
+import re
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent.parent
+PHRASE_TABLE_PATH = BASE_DIR / "models" / "phrase_table.json"
+
+# Curated pair files, lowest priority first (later files override earlier ones)
+DEFAULT_PAIR_FILES = [
+    "data/all_pairs.json",
+    "data/train_pairs_massive.json",
+    "data/val_pairs_massive.json",
+    "data/train_pairs_enhanced.json",
+    "data/val_pairs_enhanced.json",
+    "data/train_pairs_enhanced_v2.json",
+    "data/val_pairs_enhanced_v2.json",
+    "data/train_pairs_perfect.json",
+    "data/val_pairs_perfect.json"
+]
+
+SPECIAL_TOKENS = {'<sos>', '<eos>', '<pad>', '<unk>'}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for phrase table keys: lowercase, drop special tokens
+    and punctuation, collapse whitespace
+    """
+    words = [w for w in text.lower().split() if w not in SPECIAL_TOKENS]
+    text = re.sub(r"[^\w\s']", ' ', ' '.join(words))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class PhraseTable:
+    """Exact-match phrase table with hit-rate tracking"""
+    
+    def __init__(self, entries: Optional[Dict[str, str]] = None):
+        self.entries: Dict[str, str] = entries or {}
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+    
+    def lookup(self, text: str) -> Optional[List[str]]:
+        """
+        Look up an utterance
+        
+        Args:
+            text: English utterance (any casing/punctuation)
+            
+        Returns:
+            ISL gloss tokens, or None if the utterance is not in the table
+        """
+        gloss = self.entries.get(normalize_text(text))
+        with self._stats_lock:
+            if gloss is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return gloss.split() if gloss is not None else None
+    
+    def add_pair(self, english: str, isl: str):
+        """Add or override a pair (both sides are normalized)"""
+        key = normalize_text(english)
+        value = normalize_text(isl)
+        if key and value:
+            self.entries[key] = value
+    
+    def stats(self) -> Dict:
+        """Lookup statistics since process start"""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+    
+    def save(self, filepath: str):
+        """Save compiled table"""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        logger.info(f"Saved phrase table with {len(self.entries)} entries to {filepath}")
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'PhraseTable':
+        """Load compiled table"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        logger.info(f"Loaded phrase table with {len(entries)} entries from {filepath}")
+        return cls(entries)
+    
+    @classmethod
+    def build(cls, pair_files: Optional[List[str]] = None, collector=None) -> 'PhraseTable':
+        """
+        Compile table from curated pair files and, optionally, verified pairs
+        from a DataCollector (which take highest priority)
+        
+        Args:
+            pair_files: JSON files with {'english', 'isl'} items, lowest priority first
+            collector: Optional DataCollector
+        """
+        table = cls()
+        for pair_file in pair_files if pair_files is not None else DEFAULT_PAIR_FILES:
+            path = Path(pair_file)
+            if not path.is_absolute():
+                path = BASE_DIR / path
+            if not path.exists():
+                logger.warning(f"Phrase table source not found: {path}")
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    table.add_pair(item['english'], item['isl'])
+        
+        if collector is not None:
+            for _, english, isl, _, _ in collector.get_translation_pairs(verified_only=True):
+                table.add_pair(english, isl)
+        
+        logger.info(f"Built phrase table with {len(table.entries)} entries")
+        return table
+
+
+# Global instance
+_phrase_table = None
+_phrase_table_lock = threading.Lock()
+
+def get_phrase_table() -> PhraseTable:
+    """Get or create phrase table (compiled file if present, else built from pair files)"""
+    global _phrase_table
+    if _phrase_table is None:
+        with _phrase_table_lock:
+            if _phrase_table is None:
+                if PHRASE_TABLE_PATH.exists():
+                    _phrase_table = PhraseTable.load(str(PHRASE_TABLE_PATH))
+                else:
+                    _phrase_table = PhraseTable.build()
+    return _phrase_table
+
+def reload_phrase_table() -> PhraseTable:
+    """Reload the phrase table from disk (after scripts/build_phrase_table.py)"""
+    global _phrase_table
+    with _phrase_table_lock:
+        _phrase_table = None
+    return get_phrase_table()
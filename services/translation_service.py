@@ -5,18 +5,25 @@ Handles English-to-ISL translation using ML model or fallback to rule-based
 
 import os
 import re
+import time
 import torch
 import logging
+import threading
 from typing import List, Optional
 from pathlib import Path
 
+from services.model_status import get_model_status_registry
+
 logger = logging.getLogger(__name__)
 
 # Try to import ML model components
 try:
-    from ml_pipeline.models.translator import Seq2SeqTranslator
+    from ml_pipeline.models.translator import build_translator
     from ml_pipeline.utils.vocab import Vocabulary
     from ml_pipeline.config import ModelConfig
+    from ml_pipeline.models.inference_artifact import (
+        CONFIG_FIELDS, artifact_vocabularies, load_inference_artifact, stale_artifact_reason
+    )
     ML_MODEL_AVAILABLE = True
 except ImportError:
     ML_MODEL_AVAILABLE = False
@@ -26,7 +33,13 @@ except ImportError:
 class TranslationService:
     """Service for English-to-ISL translation"""
     
-    def __init__(self):
+    def __init__(self, use_inference_artifact: bool = True):
+        """
+        Args:
+            use_inference_artifact: Prefer models/lstm_translator.inference.pt
+                                    over the training checkpoint when present
+        """
+        self.use_inference_artifact = use_inference_artifact
         self.model = None
         self.src_vocab = None
         self.tgt_vocab = None
@@ -42,79 +55,124 @@ class TranslationService:
         Returns:
             True if model loaded successfully, False otherwise
         """
+        registry = get_model_status_registry()
         if not ML_MODEL_AVAILABLE:
             logger.info("ML model components not available")
+            registry.mark_unavailable('translator', "ML model components not available")
             return False
         
+        start = time.perf_counter()
         try:
             # Check if model files exist
             base_dir = Path(__file__).parent.parent
+            artifact_path = base_dir / "models" / "lstm_translator.inference.pt"
             model_path = base_dir / "models" / "lstm_translator.pth"
             vocab_src_path = base_dir / "models" / "vocab_src.json"
             vocab_tgt_path = base_dir / "models" / "vocab_tgt.json"
             
-            if not model_path.exists():
-                logger.info(f"Model file not found: {model_path}")
-                logger.info("ML translation model not trained yet. Using rule-based translation.")
-                return False
-            
-            if not vocab_src_path.exists() or not vocab_tgt_path.exists():
-                logger.warning("Vocabulary files not found. Cannot load ML model.")
-                return False
-            
-            # Load configuration
             self.config = ModelConfig()
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
             
-            # Load vocabularies
-            logger.info("Loading vocabularies...")
-            self.src_vocab = Vocabulary()
-            self.tgt_vocab = Vocabulary()
-            self.src_vocab.load(str(vocab_src_path))
-            self.tgt_vocab.load(str(vocab_tgt_path))
-            
-            logger.info(f"Source vocab size: {self.src_vocab.size()}")
-            logger.info(f"Target vocab size: {self.tgt_vocab.size()}")
-            
-            # Load model
-            logger.info("Loading translation model...")
-            self.model = Seq2SeqTranslator(
-                src_vocab_size=self.src_vocab.size(),
-                tgt_vocab_size=self.tgt_vocab.size(),
-                embed_dim=self.config.EMBED_DIM,
-                hidden_dim=self.config.HIDDEN_DIM,
-                num_layers=self.config.NUM_LAYERS,
-                dropout=self.config.DROPOUT
-            )
-            
-            # Load weights
-            checkpoint = torch.load(str(model_path), map_location=self.device)
-            if isinstance(checkpoint, dict):
-                if 'model_state_dict' in checkpoint:
-                    self.model.load_state_dict(checkpoint['model_state_dict'])
-                elif 'state_dict' in checkpoint:
-                    self.model.load_state_dict(checkpoint['state_dict'])
-                else:
-                    # Try loading as state dict directly
-                    self.model.load_state_dict(checkpoint)
+            use_artifact = self.use_inference_artifact and artifact_path.exists()
+            if use_artifact:
+                stale = stale_artifact_reason(str(artifact_path), [str(model_path), str(vocab_src_path),
+                                                                   str(vocab_tgt_path)])
+                if stale:
+                    logger.warning(f"Ignoring stale {artifact_path.name} ({stale}); loading the checkpoint. "
+                                   f"Re-run scripts/export_inference_model.py to refresh it.")
+                    use_artifact = False
+            
+            if use_artifact:
+                # Slim weights-only export (see scripts/export_inference_model.py)
+                registry.mark_loading('translator')
+                self._load_from_artifact(artifact_path)
             else:
-                # Assume it's a state dict
-                self.model.load_state_dict(checkpoint)
+                if not model_path.exists():
+                    logger.info(f"Model file not found: {model_path}")
+                    logger.info("ML translation model not trained yet. Using rule-based translation.")
+                    registry.mark_unavailable('translator', f"Model file not found: {model_path}")
+                    return False
+                
+                if not vocab_src_path.exists() or not vocab_tgt_path.exists():
+                    logger.warning("Vocabulary files not found. Cannot load ML model.")
+                    registry.mark_unavailable('translator', "Vocabulary files not found")
+                    return False
+                
+                registry.mark_loading('translator')
+                self._load_from_checkpoint(model_path, vocab_src_path, vocab_tgt_path)
             
             self.model.to(self.device)
             self.model.eval()
             
             self._model_loaded = True
             self.use_ml_model = True
+            registry.mark_ready('translator', time.perf_counter() - start)
             
             logger.info(f"✅ ML translation model loaded successfully on {self.device}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to load ML model: {e}")
+            registry.mark_failed('translator', str(e))
             logger.info("Falling back to rule-based translation")
             return False
     
+    def _build_model(self):
+        """Create the Seq2Seq model for the loaded vocabularies and config"""
+        logger.info(f"Source vocab size: {self.src_vocab.size()}")
+        logger.info(f"Target vocab size: {self.tgt_vocab.size()}")
+        
+        logger.info(f"Loading translation model ({self.config.ARCHITECTURE})...")
+        self.model = build_translator(
+            self.config.ARCHITECTURE,
+            src_vocab_size=self.src_vocab.size(),
+            tgt_vocab_size=self.tgt_vocab.size(),
+            embed_dim=self.config.EMBED_DIM,
+            hidden_dim=self.config.HIDDEN_DIM,
+            num_layers=self.config.NUM_LAYERS,
+            dropout=self.config.DROPOUT
+        )
+    
+    def _load_from_artifact(self, artifact_path: Path):
+        """Load model, vocabularies and config from a single inference artifact"""
+        logger.info(f"Loading inference artifact {artifact_path}...")
+        artifact = load_inference_artifact(str(artifact_path))
+        
+        # Architecture comes from the artifact, not the current ModelConfig defaults
+        for field in CONFIG_FIELDS:
+            setattr(self.config, field, artifact['config'].get(field.lower(), getattr(self.config, field)))
+        
+        self.src_vocab, self.tgt_vocab = artifact_vocabularies(artifact)
+        self._build_model()
+        # load_state_dict copies (and upcasts fp16/bf16) into the fp32 parameters
+        self.model.load_state_dict(artifact['state_dict'])
+        logger.info(f"Inference artifact hash: {artifact['content_hash'][:12]} ({artifact['storage_dtype']})")
+    
+    def _load_from_checkpoint(self, model_path: Path, vocab_src_path: Path, vocab_tgt_path: Path):
+        """Load model from a training checkpoint and JSON vocabularies"""
+        # Load vocabularies
+        logger.info("Loading vocabularies...")
+        self.src_vocab = Vocabulary()
+        self.tgt_vocab = Vocabulary()
+        self.src_vocab.load(str(vocab_src_path))
+        self.tgt_vocab.load(str(vocab_tgt_path))
+        
+        self._build_model()
+        
+        # Load weights
+        checkpoint = torch.load(str(model_path), map_location=self.device)
+        if isinstance(checkpoint, dict):
+            if 'model_state_dict' in checkpoint:
+                self.model.load_state_dict(checkpoint['model_state_dict'])
+            elif 'state_dict' in checkpoint:
+                self.model.load_state_dict(checkpoint['state_dict'])
+            else:
+                # Try loading as state dict directly
+                self.model.load_state_dict(checkpoint)
+        else:
+            # Assume it's a state dict
+            self.model.load_state_dict(checkpoint)
+    
     def translate_ml(self, english_text: str) -> List[str]:
         """
         Translate English text to ISL using ML model
@@ -164,18 +222,30 @@ class TranslationService:
             import traceback
             traceback.print_exc()
             raise
+    
+    def warm_up(self, sentences: List[str]):
+        """Translate representative sentences so first real requests are fast"""
+        if not self._model_loaded:
+            return
+        for sentence in sentences:
+            self.translate_ml(sentence)
+        logger.info(f"Translation model warmed up with {len(sentences)} sentences")
 
 
 # Global instance
 _translation_service = None
+_translation_service_lock = threading.Lock()
 
 def get_translation_service() -> TranslationService:
-    """Get or create translation service instance"""
+    """Get or create translation service instance (loads the model once, even under concurrent requests)"""
     global _translation_service
     if _translation_service is None:
-        _translation_service = TranslationService()
-        # Try to load ML model
-        _translation_service.load_model_if_available()
+        with _translation_service_lock:
+            if _translation_service is None:
+                service = TranslationService()
+                # Try to load ML model
+                service.load_model_if_available()
+                _translation_service = service
     return _translation_service
 
 def is_ml_model_available() -> bool:
@@ -0,0 +1,84 @@
+"""
+Model Warmup
+Loads and warms models in a background thread at startup so health probes never block
+"""
+
+import os
+import logging
+import threading
+from typing import Optional
+
+from services.model_status import get_model_status_registry
+
+logger = logging.getLogger(__name__)
+
+# Representative classroom utterances used to warm the translator
+WARMUP_SENTENCES = [
+    "hello how are you",
+    "what is your name",
+    "today we will learn mathematics",
+    "please open your books",
+    "do you have any questions"
+]
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+def warm_up_models(whisper_model_size: str = "base"):
+    """
+    Load and warm the translation and Whisper models
+
+    Failures are recorded in the model status registry; the server keeps
+    running with rule-based translation and browser ASR as fallbacks.
+    """
+    registry = get_model_status_registry()
+    registry.mark_warmup_running()
+    try:
+        try:
+            from services.translation_service import get_translation_service
+            service = get_translation_service()
+            service.warm_up(WARMUP_SENTENCES)
+        except Exception as e:
+            logger.warning(f"Translation model warmup failed: {e}")
+
+        try:
+            from services.asr_service import get_asr_service
+        except ImportError:
+            registry.mark_unavailable('whisper', "Whisper not installed")
+        else:
+            try:
+                get_asr_service(model_size=whisper_model_size).warm_up()
+            except Exception as e:
+                logger.warning(f"Whisper warmup failed: {e}")
+    finally:
+        registry.mark_warmup_complete()
+        logger.info("Model warmup complete")
+
+
+def start_background_warmup(whisper_model_size: str = "base") -> Optional[threading.Thread]:
+    """
+    Start model warmup in a daemon thread (once per process)
+
+    Set MODEL_WARMUP=0 to disable and load models lazily on first use.
+
+    Returns:
+        Warmup thread, or None if warmup is disabled
+    """
+    global _warmup_thread
+    if os.getenv("MODEL_WARMUP", "1") == "0":
+        logger.info("Model warmup disabled (MODEL_WARMUP=0)")
+        return None
+
+    with _warmup_lock:
+        if _warmup_thread is None:
+            # Mark running before the thread starts so readiness is false immediately
+            get_model_status_registry().mark_warmup_running()
+            _warmup_thread = threading.Thread(
+                target=warm_up_models,
+                args=(whisper_model_size,),
+                name="model-warmup",
+                daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread